@@ -0,0 +1,176 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Sync Benchmark - time and peak memory of each sync stage per input size
+# Runs the serial sync pipeline on synthetic CSVs (generate_kaggle_data.py)
+# ═══════════════════════════════════════════════════════════════
+#
+#   python scripts/benchmark_sync.py --sizes 1000,100000,1000000
+#   python scripts/benchmark_sync.py --save-baseline        # record this machine's numbers
+#   python scripts/benchmark_sync.py                        # exit 1 if a stage regressed
+#
+# Each size runs in its own process so peak RSS is that size's alone.
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import fetch_kaggle_data as sync
+import generate_kaggle_data
+
+
+BASELINE_FILE    = Path(__file__).parent / 'benchmark_baseline.json'
+BASELINE_FORMAT  = 'stih-benchmark'
+BASELINE_VERSION = 1
+DEFAULT_SIZES    = [1000, 10000, 100000]
+THRESHOLD        = 0.25   # a stage regresses when it is 25% slower / larger than the baseline
+MIN_MS           = 50     # ... and slower by at least this much (short stages are mostly noise)
+MIN_MB           = 10     # ... or larger by at least this much
+
+
+# ═══════════════════════════════════════════════════════════════
+# One run - child process, prints fetch_kaggle_data's SYNC_METRICS line
+# ═══════════════════════════════════════════════════════════════
+def run_one(csv_path, work_dir):
+    from kaggle_schema import load_csv
+
+    # Keep the benchmark's writes (and generation links) away from src/data
+    sync.DATA_DIR = Path(work_dir)
+    sync.RAW_DIR = sync.DATA_DIR / 'raw'
+    out_dir = sync.DATA_DIR / 'out'
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with sync.stage('parse') as m:
+        df, _ = load_csv(csv_path)
+        m['rows'] = len(df)
+    with sync.stage('fingerprint', rows=len(df)):
+        keys, _ = sync.fingerprint_rows(df)
+    # main()'s own normalize ... write stages
+    norm, _, _ = sync.normalize_and_validate(df, keys)
+    sync.serial_sync(df, norm, out_dir)
+    sync.log_metrics(sum(s['wallMs'] for s in sync.STAGE_METRICS) / 1000)
+
+def measure(csv_path, work_dir):
+    """Run one size in a fresh process; returns {stage: metrics}."""
+    result = subprocess.run([sys.executable, __file__, '--run-one', str(csv_path), '--work-dir', str(work_dir)],
+                            capture_output=True, text=True, cwd=Path(__file__).parent)
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(sync.METRICS_MARKER):
+            return {m['stage']: m for m in json.loads(line[len(sync.METRICS_MARKER):])['stages']}
+    raise RuntimeError(f'benchmark run failed on {csv_path}:\n{result.stderr or result.stdout}')
+
+
+# ═══════════════════════════════════════════════════════════════
+# Baseline
+# ═══════════════════════════════════════════════════════════════
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if baseline.get('format') != BASELINE_FORMAT or baseline.get('version') != BASELINE_VERSION:
+        return None
+    return baseline
+
+def save_baseline(path, results):
+    baseline = {'format': BASELINE_FORMAT, 'version': BASELINE_VERSION, 'sizes': {
+        str(size): {name: {'wallMs': m['wallMs'], 'peakRssMb': m['peakRssMb']} for name, m in stages.items()}
+        for size, stages in results.items()}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+def regressions(results, baseline, threshold=THRESHOLD, min_ms=MIN_MS, min_mb=MIN_MB):
+    """[(size, stage, metric, baseline value, current value)] past the threshold."""
+    found = []
+    for size, stages in results.items():
+        base_stages = baseline['sizes'].get(str(size), {})
+        for name, m in stages.items():
+            base = base_stages.get(name)
+            if base is None:
+                continue
+            for key, floor in (('wallMs', min_ms), ('peakRssMb', min_mb)):
+                old, new = base.get(key), m.get(key)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + threshold) and new - old >= floor:
+                    found.append((size, name, key, old, new))
+    return found
+
+
+# ═══════════════════════════════════════════════════════════════
+# Report
+# ═══════════════════════════════════════════════════════════════
+def change(old, new):
+    return '-' if not old or new is None else f'{(new - old) / old:+.0%}'
+
+def print_results(results, baseline):
+    print(f"{'rows':>9}  {'stage':<12}{'wall ms':>10}{'rows/s':>11}{'peak MB':>9}{'wall chg':>10}{'peak chg':>10}")
+    for size, stages in results.items():
+        base_stages = (baseline or {}).get('sizes', {}).get(str(size), {})
+        for name, m in stages.items():
+            base = base_stages.get(name, {})
+            cells = [m['wallMs'], m['rowsPerSec'], m['peakRssMb']]
+            print(f'{size:>9}  {name:<12}' + ''.join(f"{'-' if v is None else v:>{w}}" for v, w in zip(cells, (10, 11, 9)))
+                  + f"{change(base.get('wallMs'), m['wallMs']):>10}{change(base.get('peakRssMb'), m['peakRssMb']):>10}")
+
+def main(sizes, repeat=1, baseline_path=BASELINE_FILE, save=False, threshold=THRESHOLD, data_dir=None, seed=0):
+    data_dir = Path(data_dir or Path(tempfile.gettempdir()) / 'stih-benchmark')
+    results = {}
+    for size in sizes:
+        csv_path = data_dir / f'synthetic_{size}_{seed}.csv'
+        if not csv_path.exists():
+            generate_kaggle_data.write_csv(csv_path, size, seed)
+            print(f'[OK] Generated {size} rows: {csv_path}')
+        # Best of `repeat` runs per stage: the least disturbed by the rest of the machine
+        best = None
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(prefix='stih-benchmark-') as work_dir:
+                run = measure(csv_path, work_dir)
+            best = run if best is None else {name: min(best[name], m, key=lambda x: x['wallMs']) for name, m in run.items()}
+        results[size] = best
+        print(f"[OK] {size} rows: {sum(m['wallMs'] for m in best.values()):.0f} ms, "
+              f"peak {max(m['peakRssMb'] or 0 for m in best.values())} MB")
+
+    if save:
+        save_baseline(baseline_path, results)
+        print_results(results, None)
+        print(f'[SUCCESS] Baseline saved to {baseline_path}')
+        return True
+
+    baseline = load_baseline(baseline_path)
+    print_results(results, baseline)
+    if baseline is None:
+        print(f'[WARN] No baseline at {baseline_path}; run with --save-baseline to record one')
+        return True
+    found = regressions(results, baseline, threshold)
+    for size, name, key, old, new in found:
+        print(f'[ERROR] {size} rows, {name}: {key} {old} -> {new} ({change(old, new)})')
+    if found:
+        print(f'[ERROR] {len(found)} stage regression(s) past {threshold:.0%} of the baseline')
+        return False
+    print(f'[SUCCESS] No stage regressed past {threshold:.0%} of the baseline')
+    return True
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the sync stages on synthetic Kaggle CSVs')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated row counts (default %(default)s)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per size; the fastest counts (default 1)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic data')
+    parser.add_argument('--baseline', default=BASELINE_FILE, type=Path, help='baseline JSON (default %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true', help='record this run as the baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='allowed slowdown / memory growth per stage, as a fraction (default %(default)s)')
+    parser.add_argument('--data-dir', help='where generated CSVs are cached (default: <tmp>/stih-benchmark)')
+    parser.add_argument('--run-one', metavar='CSV', help=argparse.SUPPRESS)
+    parser.add_argument('--work-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run_one:
+        run_one(args.run_one, args.work_dir)
+        sys.exit(0)
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    sys.exit(0 if main(sizes, args.repeat, args.baseline, args.save_baseline, args.threshold, args.data_dir, args.seed) else 1)
@@ -4,10 +4,22 @@
 # Uses correct CSV column names from: thirumani/shark-tank-india
 # ═══════════════════════════════════════════════════════════════
 
+import argparse
+import contextlib
+import hashlib
+import io
 import json
 import os
 import sys
-import math
+import itertools
+import multiprocessing
+import multiprocessing.forkserver
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -19,65 +31,108 @@ try:
 except ImportError:
     pass
 
+# Loaded on first use, so `test` and the worker start without pandas
 try:
-    import kagglehub
-    import pandas as pd
+    from kaggle_schema import (CORE_SHARKS, coerce_frame, lazy_import, merge_reports, read_options,
+                               report_problems, shark_fields)
+    kagglehub = lazy_import('kagglehub')
+    np = lazy_import('numpy')
+    pd = lazy_import('pandas')
 except ImportError:
     print("ERROR: Required packages not installed. Run: pip install kagglehub pandas python-dotenv")
     sys.exit(1)
 
+try:
+    import resource
+except ImportError:   # Windows: no peak RSS in the stage metrics
+    resource = None
+
+import investors
+import raw_snapshots
+import serializer
 
-# ═══════════════════════════════════════════════════════════════
-# Shark metadata — hardcoded (not in CSV)
-# ═══════════════════════════════════════════════════════════════
-SHARK_META = {
-    'Namita':  {'full': 'Namita Thapar',   'title': 'Executive Director, Emcure Pharma',     'emoji': '💊', 'color': '#8B5CF6'},
-    'Vineeta': {'full': 'Vineeta Singh',   'title': 'CEO & Co-founder, SUGAR Cosmetics',     'emoji': '💄', 'color': '#EC4899'},
-    'Anupam':  {'full': 'Anupam Mittal',   'title': 'Founder & CEO, Shaadi.com',             'emoji': '💍', 'color': '#3B82F6'},
-    'Aman':    {'full': 'Aman Gupta',      'title': 'Co-founder & CMO, boAt',                'emoji': '🎧', 'color': '#F97316'},
-    'Peyush':  {'full': 'Peyush Bansal',   'title': 'Co-founder & CEO, Lenskart',            'emoji': '👓', 'color': '#10B981'},
-    'Ritesh':  {'full': 'Ritesh Agarwal',  'title': 'Founder & CEO, OYO Rooms',              'emoji': '🏨', 'color': '#F59E0B'},
-    'Amit':    {'full': 'Amit Jain',       'title': 'Co-founder & CEO, CarDekho',            'emoji': '🚗', 'color': '#6366F1'},
-    'Ashneer': {'full': 'Ashneer Grover',  'title': 'Co-founder, BharatPe (S1-S2)',          'emoji': '💸', 'color': '#EF4444'},
-    'Ashneer Grover': {'full': 'Ashneer Grover', 'title': 'Co-founder, BharatPe (S1-S2)',     'emoji': '💸', 'color': '#EF4444'},
-    'Kunal Bahl':  {'full': 'Kunal Bahl',    'title': 'Co-founder & CEO, Snapdeal',           'emoji': '🛒', 'color': '#06B6D4'},
-}
 
-CORE_SHARKS = ['Namita', 'Vineeta', 'Anupam', 'Aman', 'Peyush', 'Ritesh', 'Amit']
 SEASON_YEARS = {1: '2021-22', 2: '2023', 3: '2024', 4: '2025', 5: '2026'}
 
+KAGGLE_DATASET = 'thirumani/shark-tank-india'
+DATA_DIR = Path(__file__).parent.parent / 'src' / 'data'
+RAW_DIR  = DATA_DIR / 'raw'
+OUTPUT_FILES = ['pitches.json', 'pitches.columnar.json', 'pitches.facets.json', 'pitches.search.json',
+                'pitches.lookup.json', 'sharks.json', 'seasons.json', 'industries.json', 'analytics.cube.json',
+                'analytics.network.json', 'analytics.timeseries.json']
+PRETTY_JSON = False   # --pretty / SYNC_PRETTY_JSON: indent the human-readable outputs (see json_text)
+
 
 # ═══════════════════════════════════════════════════════════════
-# Helpers
+# Stage metrics - wall/CPU time, throughput, peak RSS, output bytes
 # ═══════════════════════════════════════════════════════════════
-def safe_float(val, default=None):
-    try:
-        if val is None or (isinstance(val, float) and math.isnan(val)):
-            return default
-        return float(val)
-    except (TypeError, ValueError):
-        return default
-
-def safe_int(val, default=None):
-    f = safe_float(val)
-    return int(f) if f is not None else default
-
-def safe_bool(val):
-    f = safe_float(val)
-    return bool(f) if f is not None else False
-
-def safe_str(val, default=''):
-    if val is None or (isinstance(val, float) and math.isnan(val)):
-        return default
-    s = str(val).strip()
-    return s if s and s.lower() != 'nan' else default
-
-def fmt_currency(amt_lakhs):
-    if amt_lakhs is None:
+METRICS_MARKER = 'SYNC_METRICS '   # stdout line prefix parsed by kaggleSync.js
+STAGE_METRICS = []                 # entries of the running sync, in stage order
+PROFILE_DIR = None                 # set by --profile: one cProfile dump per stage
+
+def peak_rss_mb():
+    """High-water RSS so far of this process or its largest worker, in MB (None on Windows)."""
+    if resource is None:
         return None
-    if amt_lakhs >= 100:
-        return f"Rs{amt_lakhs / 100:.1f}Cr"
-    return f"Rs{int(amt_lakhs)}L"
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+def cpu_seconds():
+    """User + system time of this process and its finished workers."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+def dir_bytes(path):
+    return sum(p.stat().st_size for p in Path(path).iterdir() if p.is_file())
+
+def dump_profile(profiler, name):
+    """Write <n>-<stage>.prof and a text summary (top 30 by cumulative time); returns the .prof path."""
+    import pstats
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILE_DIR / f'{len(STAGE_METRICS) + 1:02d}-{name}.prof'
+    profiler.dump_stats(path)
+    with open(path.with_suffix('.txt'), 'w', encoding='utf-8') as f:
+        pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(30)
+    return str(path)
+
+@contextlib.contextmanager
+def stage(name, rows=None):
+    """Measure a block of the sync and append its metrics to STAGE_METRICS.
+
+    The block may set 'rows' (for rowsPerSec) and 'outputBytes' on the yielded dict.
+    CPU time includes pool workers once they have exited; with PROFILE_DIR set the
+    block also runs under cProfile (this process only).
+    """
+    entry = {'rows': rows, 'outputBytes': None}
+    profiler = None
+    if PROFILE_DIR is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    wall, cpu = time.perf_counter(), cpu_seconds()
+    try:
+        yield entry
+    finally:
+        wall, cpu = time.perf_counter() - wall, cpu_seconds() - cpu
+        metrics = {'stage': name, 'wallMs': round(wall * 1000, 1), 'cpuMs': round(cpu * 1000, 1),
+                   'rows': entry['rows'], 'rowsPerSec': round(entry['rows'] / wall) if entry['rows'] and wall > 0 else None,
+                   'peakRssMb': peak_rss_mb(), 'outputBytes': entry['outputBytes']}
+        if profiler is not None:
+            profiler.disable()
+            metrics['profile'] = dump_profile(profiler, name)
+        STAGE_METRICS.append(metrics)
+
+def log_metrics(total_seconds):
+    """Print the stage table and the machine-readable SYNC_METRICS line; returns the log entry."""
+    print(f"{'stage':<14}{'wall ms':>10}{'cpu ms':>10}{'rows/s':>10}{'peak MB':>9}{'out bytes':>12}")
+    for m in STAGE_METRICS:
+        cells = [m['wallMs'], m['cpuMs'], m['rowsPerSec'], m['peakRssMb'], m['outputBytes']]
+        print(f"{m['stage']:<14}" + ''.join(f"{'-' if v is None else v:>{w}}" for v, w in zip(cells, (10, 10, 10, 9, 12))))
+    if PROFILE_DIR is not None:
+        print(f"[OK] Stage profiles written to {PROFILE_DIR}")
+    metrics = {'totalMs': round(total_seconds * 1000, 1), 'stages': list(STAGE_METRICS)}
+    print(METRICS_MARKER + json.dumps(metrics))
+    return metrics
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -98,13 +153,34 @@ def setup_kaggle_credentials():
     print("ERROR: Kaggle credentials not found!")
     return False
 
+def fetch_dataset_version():
+    """Current upstream version number from one metadata request - nothing is downloaded.
+
+    Returns None when the installed kagglehub predates the kagglesdk client.
+    """
+    try:
+        from kagglehub.clients import build_kaggle_client
+        from kagglesdk.datasets.types.dataset_api_service import ApiGetDatasetRequest
+    except ImportError:
+        return None
+    owner, slug = KAGGLE_DATASET.split('/')
+    r = ApiGetDatasetRequest()
+    r.owner_slug = owner
+    r.dataset_slug = slug
+    with build_kaggle_client() as client:
+        return client.datasets.dataset_api_client.get_dataset(r).current_version_number
+
 def test_kaggle_connection():
     try:
         if not setup_kaggle_credentials():
             return False
         print("Testing Kaggle API connection...")
-        kagglehub.dataset_download("thirumani/shark-tank-india")
-        print("[OK] Kaggle API is ONLINE and accessible")
+        version = fetch_dataset_version()
+        if version is None:
+            kagglehub.dataset_download(KAGGLE_DATASET)
+            print("[OK] Kaggle API is ONLINE and accessible")
+        else:
+            print(f"[OK] Kaggle API is ONLINE and accessible (dataset version {version})")
         return True
     except Exception as e:
         error_msg = str(e)
@@ -116,216 +192,681 @@ def test_kaggle_connection():
 
 
 # ═══════════════════════════════════════════════════════════════
-# Load CSV
+# Load CSV - cached by dataset version and content hash
 # ═══════════════════════════════════════════════════════════════
-def load_kaggle_data():
+DATASET_CACHE_FILE = 'dataset_cache.json'
+KEEP_WARM = False      # set by the worker: keep the last parsed dataset for its next job
+WARM_DATASET = None    # {sha256, df, coercion}
+
+def find_csv(path):
+    path = Path(path)
+    if path.is_file():
+        return path
+    csv_files = sorted(path.glob('**/*.csv'))
+    return csv_files[0] if csv_files else None
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_dataset_cache():
     try:
-        print("Fetching data from Kaggle...")
-        dataset_path = kagglehub.dataset_download("thirumani/shark-tank-india")
-        print(f"[OK] Downloaded dataset to: {dataset_path}")
-        import glob
-        csv_files = glob.glob(f"{dataset_path}/**/*.csv", recursive=True)
-        if not csv_files:
+        with open(RAW_DIR / DATASET_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_dataset_cache(dataset):
+    try:
+        RAW_DIR.mkdir(parents=True, exist_ok=True)
+        entry = {k: dataset.get(k) for k in ('source', 'version', 'sha256', 'path')}
+        with open(RAW_DIR / DATASET_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        return True
+    except Exception as e:
+        print(f"[ERROR] Failed to save {DATASET_CACHE_FILE}: {str(e)}")
+        return False
+
+def load_kaggle_data(source=None, full=False, chunksize=None):
+    """Load the dataset CSV from Kaggle, or from a local file/directory when source is set.
+
+    Returns (df, dataset). df is None on failure, or when the upstream version or
+    CSV content matches the last successful sync (dataset['unchanged'] is True);
+    full=True ignores the cache. df is coerced by kaggle_schema and
+    dataset['coercion'] holds the per-column report. With chunksize, df is an
+    iterator of raw DataFrame chunks (see read_csv_chunks) instead.
+    """
+    global WARM_DATASET
+    dataset = {'source': str(Path(source).resolve()) if source else KAGGLE_DATASET, 'version': None}
+    try:
+        cache = {} if full else load_dataset_cache()
+        outputs_ready = all((output_dir() / name).exists() for name in OUTPUT_FILES)
+
+        if source:
+            print(f"Loading local dataset: {source}")
+            csv_path = find_csv(source)
+        else:
+            with stage('version'):
+                dataset['version'] = fetch_dataset_version()
+            if (outputs_ready and dataset['version'] is not None and cache.get('source') == KAGGLE_DATASET
+                    and cache.get('version') == dataset['version']):
+                print(f"[OK] Dataset version {dataset['version']} unchanged since last sync - skipping download")
+                return None, dict(cache, unchanged=True)
+            print("Fetching data from Kaggle...")
+            handle = KAGGLE_DATASET if dataset['version'] is None else f"{KAGGLE_DATASET}/versions/{dataset['version']}"
+            with stage('download'):
+                dataset_path = kagglehub.dataset_download(handle)
+            print(f"[OK] Downloaded dataset to: {dataset_path}")
+            csv_path = find_csv(dataset_path)
+
+        if csv_path is None:
             print("[WARN] No CSV files found in dataset")
-            return None
-        print(f"[OK] Loading: {csv_files[0]}")
-        df = pd.read_csv(csv_files[0])
+            return None, dataset
+        dataset['path'] = str(csv_path)
+        with stage('hash'):
+            dataset['sha256'] = file_sha256(csv_path)
+        if outputs_ready and cache.get('sha256') == dataset['sha256']:
+            print(f"[OK] Dataset content unchanged ({dataset['sha256'][:12]}) - skipping parse")
+            return None, dict(dataset, unchanged=True)
+
+        if chunksize:
+            print(f"[OK] Streaming: {csv_path} ({chunksize} rows per chunk)")
+            return read_csv_chunks(csv_path, chunksize), dataset
+        print(f"[OK] Loading: {csv_path}")
+        with stage('parse') as m:
+            if WARM_DATASET is not None and WARM_DATASET['sha256'] == dataset['sha256']:
+                df, dataset['coercion'] = WARM_DATASET['df'], WARM_DATASET['coercion']
+                print('[OK] Reusing the dataset parsed by the previous job')
+            else:
+                df, dataset['coercion'] = coerce_frame(pd.read_csv(csv_path, **read_options()))
+            m['rows'] = len(df)
+        if KEEP_WARM:
+            WARM_DATASET = {'sha256': dataset['sha256'], 'df': df, 'coercion': dataset['coercion']}
         print(f"[OK] Loaded {len(df)} records, {len(df.columns)} columns")
-        return df
+        return df, dataset
     except Exception as e:
         print(f"[ERROR] Failed to load Kaggle data: {str(e)}")
         import traceback
         traceback.print_exc()
-        return None
+        return None, dataset
+
+
+# ═══════════════════════════════════════════════════════════════
+# Column helpers - read fields of a frame coerced by kaggle_schema.coerce_frame
+# ═══════════════════════════════════════════════════════════════
+def col_float(df, name):
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[name].to_numpy(dtype=float, na_value=np.nan)
+
+def col_bool(df, name):
+    vals = col_float(df, name)
+    return (vals != 0) & ~np.isnan(vals)
+
+def col_int(df, name, default=None):
+    vals = col_float(df, name)
+    mask = ~np.isnan(vals)
+    ints = np.where(mask, vals, 0).astype(np.int64).astype(object)
+    return np.where(mask, ints, default)
+
+def col_int_array(df, name, default=None):
+    """col_int without a Python int per cell: int64 array, or nullable Int64 (<NA> where
+    missing) when default is None."""
+    vals = col_float(df, name)
+    missing = np.isnan(vals)
+    ints = np.where(missing, default or 0, vals).astype(np.int64)
+    return ints if default is not None else pd.arrays.IntegerArray(ints, missing)
+
+def col_str(df, name, default=''):
+    if name not in df.columns:
+        return np.full(len(df), default, dtype=object)
+    out = np.array(df[name].to_numpy(dtype=object), dtype=object)
+    if default != '':
+        out[out == ''] = default
+    return out
+
+def col_masked(vals, mask):
+    """float array with NaN (null in a pitch table column) where mask is False."""
+    return np.where(mask, vals, np.nan)
+
+def col_round(vals, ndigits, mask):
+    # Python's round(), not np.round: numpy rounds half-way cases differently
+    out = np.full(len(vals), None, dtype=object)
+    idx = np.flatnonzero(mask)
+    out[idx] = [round(v, ndigits) for v in vals[idx].tolist()]
+    return out
+
+def col_currency(amt_lakhs, mask):
+    out = np.full(len(amt_lakhs), None, dtype=object)
+    crore = mask & (amt_lakhs >= 100)
+    lakh  = mask & ~(amt_lakhs >= 100)
+    out[crore] = [f"Rs{v:.1f}Cr" for v in (amt_lakhs[crore] / 100).tolist()]
+    out[lakh]  = [f"Rs{v}L" for v in amt_lakhs[lakh].astype(np.int64).tolist()]
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════
+# Normalize - coerce the shared columns once for every stage
+# ═══════════════════════════════════════════════════════════════
+def build_investments(df):
+    """One row per (pitch, investor): core sharks first, then guests, in CSV order.
+
+    Columns: row, investor, name, core, amt, eq, debt, split. investor is the
+    canonical ID from the investors registry and name its name in the JSON, however
+    the CSV spells it. Guest amounts are already split equally across comma-joined
+    co-investors (split = number of names). Each investor has one row per pitch
+    (see merge_repeat_investors).
+    """
+    # Wide -> long: one (row, shark) hit per positive investment, row-major so
+    # each pitch keeps CORE_SHARKS order
+    fields = [shark_fields(s) for s in CORE_SHARKS]
+    amt  = np.column_stack([col_float(df, f[0]) for f in fields])
+    eq   = np.column_stack([col_float(df, f[1]) for f in fields])
+    debt = np.column_stack([col_float(df, f[2]) for f in fields])
+    rows, cols = np.nonzero(amt > 0)
+    core_names = np.array([investors.INVESTORS[id_]['name'] for id_ in investors.CORE_IDS], dtype=object)
+    core = pd.DataFrame({
+        'row': rows, 'investor': np.array(investors.CORE_IDS, dtype=object)[cols], 'name': core_names[cols], 'core': True,
+        'amt': amt[rows, cols], 'eq': np.nan_to_num(eq[rows, cols], nan=0.0),
+        'debt': debt[rows, cols], 'split': 1,
+    })
+
+    # Guests: the CSV sometimes has comma-joined names e.g. "Kunal Bahl,Mohit Yadav"
+    # Split them and distribute the investment amount equally among co-investors
+    guest_amt = col_float(df, 'guestAmt')
+    guest_eq  = np.nan_to_num(col_float(df, 'guestEq'), nan=0.0)
+    names = col_str(df, 'guestNames')
+    guest_rows = np.flatnonzero((guest_amt > 0) & (names != ''))
+    exploded = pd.Series(names[guest_rows], index=guest_rows, dtype=object).str.split(',').explode().str.strip()
+    exploded = exploded[exploded != '']
+    g_rows = exploded.index.to_numpy(dtype=np.int64)
+    split = exploded.groupby(level=0).transform('size').to_numpy(dtype=np.int64)
+    multi = split > 1
+    guest_ids, guest_names = investors.resolve_names(exploded.to_numpy(dtype=object))
+    guests = pd.DataFrame({
+        'row': g_rows, 'investor': guest_ids, 'name': guest_names, 'core': np.isin(guest_ids, investors.CORE_IDS),
+        'amt': col_round(guest_amt[g_rows] / split, 2, np.ones(len(g_rows), dtype=bool)).astype(float),
+        'eq': np.where(multi, col_round(guest_eq[g_rows] / split, 2, multi), guest_eq[g_rows]).astype(float),
+        'debt': np.nan, 'split': split,
+    })
+
+    investments = pd.concat([core, guests], ignore_index=True)
+    investments = investments.sort_values('row', kind='stable').reset_index(drop=True)
+    return merge_repeat_investors(investments, guest_rows)
+
+def merge_repeat_investors(investments, rows):
+    """Fold repeated (row, investor) pairs into the first one, amounts summed.
+
+    A core shark also named in the guest column, or a guest named twice, would
+    otherwise count twice. Only rows (the pitches with guests) can have repeats.
+    """
+    candidates = investments[np.isin(investments['row'].to_numpy(), rows)]
+    repeats = candidates[candidates.duplicated(['row', 'investor'], keep=False)]
+    if repeats.empty:
+        return investments
+    groups = repeats.groupby(['row', 'investor'], sort=False)
+    # Rounded off float noise only (100 + 33.3), the CSV's own precision is kept
+    investments.loc[repeats.index, 'amt'] = groups['amt'].transform('sum').round(6)
+    investments.loc[repeats.index, 'eq'] = groups['eq'].transform('sum').round(6)
+    investments.loc[repeats.index, 'debt'] = groups['debt'].transform('sum').where(groups['debt'].transform('count') > 0)
+    investments.loc[repeats.index, 'split'] = groups['split'].transform('max')
+    later = repeats.index[repeats.duplicated(['row', 'investor'])]
+    return investments.drop(index=later).reset_index(drop=True)
+
+def delta_vals(df):
+    """deltaVal per row: % change from the asked to the deal valuation, rounded to 1
+    decimal; NaN unless both are set and the ask is positive."""
+    ask_val, deal_val = col_float(df, 'askVal'), col_float(df, 'dealVal')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta_raw = ((deal_val - ask_val) / ask_val) * 100
+    has_both = (deal_val != 0) & ~np.isnan(deal_val) & (ask_val > 0)
+    return col_round(delta_raw, 1, has_both).astype(float)
+
+def normalize_frame(df):
+    """Derive the per-pitch columns the aggregate stages share, once.
+
+    df is a coerced frame (kaggle_schema.coerce_frame). Returns (frame, investments):
+    frame has one row per pitch, investments is the long (pitch, investor) table
+    from build_investments().
+    """
+    if df is None:
+        df = coerce_frame(None)[0]
+    df = df.reset_index(drop=True)
+    frame = pd.DataFrame({
+        'season': col_float(df, 'season'),
+        'seasonInt': col_int(df, 'season', 0).astype(np.int64),
+        'episode': col_float(df, 'ep'),
+        'pitch': col_float(df, 'pitch'),
+        'industry': col_str(df, 'industry'),
+        'funded': col_bool(df, 'funded'),
+        'dealAmt': np.nan_to_num(col_float(df, 'dealAmt'), nan=0.0),
+        'deltaVal': delta_vals(df),
+        'seasonStart': col_str(df, 'seasonStart'),
+        'seasonEnd': col_str(df, 'seasonEnd'),
+    }, index=df.index)
+    return frame, build_investments(df)
+
+def unresolved_investors(investments):
+    """{name: investments} for investors missing from the investors registry."""
+    names = investments.loc[~investments['investor'].isin(investors.INVESTORS), 'name']
+    return {name: int(n) for name, n in names.value_counts(sort=False).items()}
+
+def log_investors(unresolved):
+    """Warn about names the registry does not know; returns the sync-log.json entry."""
+    for name, count in sorted(unresolved.items()):
+        print(f"[WARN] Investor '{name}' not in the investors registry ({count} investments)")
+    return {'unresolved': unresolved}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Validation - cross-field checks on the coerced frame, whole columns at a time
+# ═══════════════════════════════════════════════════════════════
+# rule -> what a violating row looks like
+VALIDATION_RULES = {
+    'dealAmountSum': 'investor amounts add up to neither Total Deal Amount nor it less Total Deal Debt',
+    'sharkCount': 'Number of Sharks in Deal differs from the investors in sharkBreakdown',
+    'guestEquity': 'guest co-investors left out of the equity split',
+    'fundedNoAmount': 'funded without a Total Deal Amount',
+}
+VALIDATION_SAMPLES = 5
+VALIDATION_RTOL    = 0.01   # amounts within 1% (or 0.05 lakhs, for the rounded guest splits) agree
+VALIDATION_ATOL    = 0.05
+VALIDATION_ABORT   = 0.5    # default SYNC_VALIDATION_ABORT: half the rows failing one rule means a broken CSV
+
+def validate_frame(df, investments, keys=None):
+    """Run every VALIDATION_RULES check over a coerced frame.
+
+    investments is build_investments(df). Returns {'rows', 'rules': {rule: {'violations',
+    'samples'}}}; samples are the season-episode-pitch keys (see row_keys) of the first
+    violating rows, taken from keys when given.
+    """
+    df = df.reset_index(drop=True)
+    n = len(df)
+    funded = col_bool(df, 'funded')
+    deal_amt, deal_eq = col_float(df, 'dealAmt'), col_float(df, 'dealEq')
+    # Kaggle's Total Deal Amount leaves the debt out, other exports (and the
+    # synthetic generator) fold it in; per-investor amounts are equity either way
+    equity_amt = deal_amt - np.nan_to_num(col_float(df, 'totalDebt'), nan=0.0)
+    rows = investments['row'].to_numpy()
+    invested = np.bincount(rows, weights=investments['amt'].to_numpy(), minlength=n)
+    # sharkBreakdown keeps one entry per investor (see build_shark_breakdown)
+    entries = np.bincount(investments.drop_duplicates(['row', 'investor'])['row'].to_numpy(), minlength=n)
+    num_sharks = col_float(df, 'numSharks')
+    core_eq = np.nansum(np.column_stack([col_float(df, shark_fields(s)[1]) for s in CORE_SHARKS]), axis=1) \
+        if n else np.zeros(0)
+    guest_eq = np.nan_to_num(col_float(df, 'guestEq'), nan=0.0)
+    has_guest = (col_float(df, 'guestAmt') > 0) & (col_str(df, 'guestNames') != '')
+
+    with np.errstate(invalid='ignore'):
+        violations = {
+            'dealAmountSum': funded & (deal_amt > 0)
+                             & ~np.isclose(invested, deal_amt, rtol=VALIDATION_RTOL, atol=VALIDATION_ATOL)
+                             & ~np.isclose(invested, equity_amt, rtol=VALIDATION_RTOL, atol=VALIDATION_ATOL),
+            'sharkCount': funded & ~np.isnan(num_sharks) & (num_sharks != entries),
+            # Either no guest share at all, or a total that only covers the core sharks
+            'guestEquity': funded & has_guest & (deal_eq > 0)
+                           & ((guest_eq <= 0) | np.isclose(core_eq, deal_eq, rtol=VALIDATION_RTOL, atol=VALIDATION_ATOL)),
+            'fundedNoAmount': funded & ~(deal_amt > 0),
+        }
+
+    report = {'rows': n, 'rules': {}}
+    for rule, mask in violations.items():
+        positions = np.flatnonzero(mask)
+        sample = positions[:VALIDATION_SAMPLES]
+        if keys is None:
+            rows_df = df.iloc[sample]
+            samples = row_keys(col_int(rows_df, 'season', 1), col_int(rows_df, 'ep'), col_int(rows_df, 'pitch'))
+        else:
+            samples = [keys[i] for i in sample.tolist()]
+        report['rules'][rule] = {'violations': len(positions), 'samples': samples}
+    return report
+
+def merge_validation(a, b):
+    """Combine the validation reports of two chunks."""
+    if a is None:
+        return b
+    return {'rows': a['rows'] + b['rows'], 'rules': {
+        rule: {'violations': a['rules'][rule]['violations'] + entry['violations'],
+               'samples': (a['rules'][rule]['samples'] + entry['samples'])[:VALIDATION_SAMPLES]}
+        for rule, entry in b['rules'].items()
+    }}
+
+def resolve_thresholds(name, default=None):
+    """SYNC_VALIDATION_<name> -> {rule: max violating fraction of rows}.
+
+    Either one fraction for every rule ('0.1') or per-rule ones ('sharkCount=0.05,guestEquity=0.2');
+    unset or empty means `default` for every rule, None for no limit.
+    """
+    value = (os.getenv(f'SYNC_VALIDATION_{name}') or '').strip()
+    if not value:
+        return {rule: default for rule in VALIDATION_RULES} if default is not None else {}
+    if '=' not in value:
+        return {rule: float(value) for rule in VALIDATION_RULES}
+    limits = {}
+    for part in value.split(','):
+        rule, _, limit = part.partition('=')
+        if rule.strip() not in VALIDATION_RULES:
+            raise ValueError(f'SYNC_VALIDATION_{name}: unknown rule {rule.strip()!r}')
+        limits[rule.strip()] = float(limit)
+    return limits
+
+def check_validation(report):
+    """Compare a validation report with SYNC_VALIDATION_PARTIAL / SYNC_VALIDATION_ABORT.
+
+    Prints a [WARN] line per violated rule. Returns (sync-log.json entry, verdict), verdict
+    being 'aborted', 'partial' or None; either of the first two keeps the generation unpublished.
+    """
+    limits = {'abort': resolve_thresholds('ABORT', VALIDATION_ABORT), 'partial': resolve_thresholds('PARTIAL')}
+    rows = report['rows'] if report else 0
+    entry = {'rows': rows, 'rules': report['rules'] if report else {}, 'exceeded': {}}
+    for rule, result in entry['rules'].items():
+        if not result['violations']:
+            continue
+        rate = result['violations'] / rows
+        print(f"[WARN] Validation '{rule}': {result['violations']} rows, {VALIDATION_RULES[rule]}, e.g. {result['samples']}")
+        for level in ('abort', 'partial'):
+            if limits[level].get(rule) is not None and rate > limits[level][rule]:
+                entry['exceeded'][rule] = level
+                print(f"[ERROR] Validation '{rule}': {rate:.1%} of rows, over the {level} threshold of {limits[level][rule]:.1%}")
+                break
+    levels = set(entry['exceeded'].values())
+    verdict = 'aborted' if 'abort' in levels else 'partial' if levels else None
+    return entry, verdict
+
+
+# ═══════════════════════════════════════════════════════════════
+# Pitch table - one array per field; record dicts only exist while serializing
+# ═══════════════════════════════════════════════════════════════
+# {'count': n, 'columns': {field: column}} in pitches.json key order. A column is a
+# float64 array (NaN = null), an int64 / nullable Int64 array, a bool array, an
+# object array or a list; sharks and sharkBreakdown hold the tuples of
+# build_shark_breakdown(), turned into a list / dict per record by RECORD_DECODERS.
+PITCH_CHUNK = 10000   # records built (and serialized) at a time
+
+def breakdown_record(entries):
+    return {name: {'amt': a, 'eq': e} if d is None else {'amt': a, 'eq': e, 'debt': d} for name, a, e, d in entries}
+
+RECORD_DECODERS = {'sharks': list, 'sharkBreakdown': breakdown_record}
+
+def pitch_table(columns, count):
+    return {'count': count, 'columns': columns}
+
+def column_values(column, start=0, stop=None):
+    """Python values of column[start:stop], None where NaN / <NA>."""
+    part = column[start:stop]
+    if isinstance(part, list):
+        return part
+    if isinstance(part, np.ndarray) and part.dtype == float:
+        return np.where(np.isnan(part), None, part.astype(object)).tolist()
+    if isinstance(part, np.ndarray):
+        return part.tolist()
+    return part.to_numpy(dtype=object, na_value=None).tolist()
+
+def pitch_column(pitches, field):
+    """Python values of one field for every pitch (sharks / sharkBreakdown as tuples)."""
+    column = pitches['columns'].get(field)
+    return [] if column is None else column_values(column)
+
+def pitch_records(pitches, start=0, stop=None):
+    """Record dicts of rows start..stop, as they appear in pitches.json."""
+    columns = pitches['columns']
+    values = []
+    for field, column in columns.items():
+        vals = column_values(column, start, stop)
+        decode = RECORD_DECODERS.get(field)
+        values.append([decode(v) for v in vals] if decode else vals)
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+def iter_pitch_records(pitches):
+    """Every record dict, built PITCH_CHUNK at a time."""
+    for start in range(0, pitches['count'], PITCH_CHUNK):
+        yield from pitch_records(pitches, start, start + PITCH_CHUNK)
+
+def pitches_json(pitches, pretty=None):
+    """(pitches.json text, byte length of each record in it).
+
+    The text is json_text() of every record, indented when pretty (default
+    PRETTY_JSON); records are built and serialized PITCH_CHUNK at a time.
+    """
+    pretty = PRETTY_JSON if pretty is None else pretty
+    head, sep, tail = (b'[\n  ', b',\n  ', b'\n]') if pretty else (b'[', b',', b']')
+    parts, lengths = [], np.zeros(pitches['count'], dtype=np.int64)
+    for start in range(0, pitches['count'], PITCH_CHUNK):
+        if pretty:
+            chunk = [serializer.dumpb(p, indent=True).replace(b'\n', b'\n  ') for p in pitch_records(pitches, start, start + PITCH_CHUNK)]
+        else:
+            chunk = [serializer.dumpb(p) for p in pitch_records(pitches, start, start + PITCH_CHUNK)]
+        lengths[start:start + len(chunk)] = [len(b) for b in chunk]
+        parts.append(sep.join(chunk))
+    text = head + sep.join(parts) + tail if parts else b'[]'
+    return text.decode('utf-8'), lengths
 
 
 # ═══════════════════════════════════════════════════════════════
 # Process pitches - full schema matching data-schema.md
 # ═══════════════════════════════════════════════════════════════
-def process_pitches(df):
-    pitches = []
+def build_shark_breakdown(n, investments):
+    """Per-pitch (sharks, sharkBreakdown) tuples from the long investments table.
+
+    sharks holds the names in investment order, sharkBreakdown one (name, amt, eq,
+    debt or None) entry per investor (build_investments already merged repeats).
+    Pitches without investments share the empty tuple.
+    """
+    sharks_lists, breakdowns = [()] * n, [()] * n
+    rows = zip(investments['row'].tolist(), investments['name'].tolist(), investments['amt'].tolist(),
+               investments['eq'].tolist(), investments['debt'].tolist(), investments['split'].tolist())
+    for r, group in itertools.groupby(rows, key=lambda x: x[0]):   # investments are sorted by row
+        entries = tuple((name, a, e if e or split > 1 else 0, d if d > 0 else None) for _, name, a, e, d, split in group)
+        sharks_lists[r], breakdowns[r] = tuple(entry[0] for entry in entries), entries
+    return sharks_lists, breakdowns
+
+def pitch_names(df, row_numbers=None):
+    """Startup names; unnamed pitches are 'Pitch <row number>' (1-based, defaults to position)."""
+    names = col_str(df, 'name')
+    unnamed = names == ''
+    row_numbers = np.arange(1, len(df) + 1) if row_numbers is None else np.asarray(row_numbers)
+    names[unnamed] = [f"Pitch {i}" for i in row_numbers[unnamed]]
+    return names
+
+def pitch_ids(names, seasons, eps, taken=None):
+    """Unique pitch IDs: the name's slug, and slug-s<season>e<ep> (then -2, -3, ...) on a repeat.
+
+    The first pitch of a name in CSV order keeps the bare slug, so an ID only moves
+    when an earlier pitch of the same name appears upstream. Slugs have no '-', so a
+    suffixed ID never clashes with a bare one. taken: IDs already handed out (earlier
+    chunks of a streaming sync); updated in place.
+    """
+    slugs = pd.Series(names, dtype=object).str.lower().str.replace(' ', '', regex=False) \
+        .str.replace('-', '', regex=False).str.replace("'", '', regex=False)
+    taken = set() if taken is None else taken
+    repeats = (slugs.duplicated() | slugs.isin(taken)).to_numpy()
+    ids = slugs.to_numpy(dtype=object, copy=True)
+    taken.update(ids[~repeats])
+    for i in np.flatnonzero(repeats).tolist():
+        base = f"{ids[i]}-s{seasons[i]}" + ('' if eps[i] is None else f"e{eps[i]}")
+        id_, n = base, 2
+        while id_ in taken:
+            id_, n = f"{base}-{n}", n + 1
+        ids[i] = id_
+        taken.add(id_)
+    return ids
+
+def process_pitches(df, norm=None, row_numbers=None, taken=None):
+    """Build the pitch table. row_numbers (1-based) name unnamed pitches; defaults to position.
+    taken: IDs of earlier chunks, see pitch_ids."""
     if df is None or df.empty:
         print("[WARN] No pitch data to process")
-        return pitches
-
-    for _, row in df.iterrows():
-        name = safe_str(row.get('Startup Name'), f"Pitch {len(pitches)+1}")
-        pitch_id = name.lower().replace(' ', '').replace('-', '').replace("'", "")
-
-        ask_amt = safe_float(row.get('Original Ask Amount'))
-        ask_eq  = safe_float(row.get('Original Offered Equity'))
-        val_req = safe_float(row.get('Valuation Requested'))
-        ask_val = (val_req / 100) if val_req else None
-
-        funded        = safe_bool(row.get('Accepted Offer'))
-        recv_offer    = safe_bool(row.get('Received Offer'))
-        deal_amt      = safe_float(row.get('Total Deal Amount'))
-        deal_eq       = safe_float(row.get('Total Deal Equity'))
-        deal_val_raw  = safe_float(row.get('Deal Valuation'))
-        deal_val      = (deal_val_raw / 100) if deal_val_raw else None
-        total_debt    = safe_float(row.get('Total Deal Debt'))
-        debt_interest = safe_float(row.get('Debt Interest'))
-        royalty_pct   = safe_float(row.get('Royalty Percentage'))
-        has_cond      = safe_bool(row.get('Deal Has Conditions'))
-
-        delta_val = None
-        if deal_val and ask_val and ask_val > 0:
-            delta_val = round(((deal_val - ask_val) / ask_val) * 100, 1)
-
-        if royalty_pct and royalty_pct > 0:
-            deal_type = 'royalty'
-        elif total_debt and total_debt > 0:
-            deal_type = 'mixed'
-        else:
-            deal_type = 'equity'
-
-        shark_breakdown = {}
-        sharks_list = []
-        for shark in CORE_SHARKS:
-            amt  = safe_float(row.get(f'{shark} Investment Amount'))
-            eq   = safe_float(row.get(f'{shark} Investment Equity'))
-            debt = safe_float(row.get(f'{shark} Debt Amount'))
-            if amt and amt > 0:
-                entry = {'amt': amt, 'eq': eq or 0}
-                if debt and debt > 0:
-                    entry['debt'] = debt
-                shark_breakdown[shark] = entry
-                sharks_list.append(shark)
-
-        guest_name_raw = safe_str(row.get('Invested Guest Name'))
-        if guest_name_raw:
-            # The CSV sometimes has comma-joined names e.g. "Kunal Bahl,Mohit Yadav"
-            # Split them and distribute the investment amount equally among co-investors
-            guest_names = [n.strip() for n in guest_name_raw.split(',') if n.strip()]
-            guest_amt = safe_float(row.get('Guest Investment Amount'))
-            guest_eq  = safe_float(row.get('Guest Investment Equity'))
-            if guest_amt and guest_amt > 0 and guest_names:
-                split_amt = round(guest_amt / len(guest_names), 2)
-                split_eq  = round((guest_eq or 0) / len(guest_names), 2) if len(guest_names) > 1 else (guest_eq or 0)
-                for gn in guest_names:
-                    sharks_list.append(gn)
-                    shark_breakdown[gn] = {'amt': split_amt, 'eq': split_eq}
-
-        pitch = {
-            'id': pitch_id, 'name': name,
-            'season': safe_int(row.get('Season Number'), 1),
-            'ep': safe_int(row.get('Episode Number')),
-            'pitch': safe_int(row.get('Pitch Number')),
-            'industry': safe_str(row.get('Industry')),
-            'type': safe_str(row.get('Business Description')),
-            'summary': safe_str(row.get('Business Description')),
-            'city': safe_str(row.get('Pitchers City')),
-            'state': safe_str(row.get('Pitchers State')),
-            'website': safe_str(row.get('Company Website')),
-            'startedIn': safe_str(row.get('Started in')),
-            'funded': funded, 'receivedOffer': recv_offer, 'dealType': deal_type,
-            'ask': fmt_currency(ask_amt) if ask_amt else None,
-            'askAmt': ask_amt, 'askEq': ask_eq,
-            'askVal': round(ask_val, 2) if ask_val else None,
-            'deal': fmt_currency(deal_amt) if funded and deal_amt else None,
-            'dealAmt': deal_amt if funded else None,
-            'dealEq': deal_eq if funded else None,
-            'dealVal': round(deal_val, 2) if funded and deal_val else None,
-            'finalVal': round(deal_val, 2) if funded and deal_val else None,
-            'deltaVal': delta_val,
-            'totalDebt': total_debt if funded else None,
-            'debtInterest': debt_interest if funded else None,
-            'royaltyPct': royalty_pct if funded else None,
-            'hasConditions': has_cond,
-            'sharks': sharks_list,
-            'numSharks': safe_int(row.get('Number of Sharks in Deal'), 0) if funded else 0,
-            'sharkBreakdown': shark_breakdown,
-            'numPresenters': safe_int(row.get('Number of Presenters')),
-            'malePresenters': safe_int(row.get('Male Presenters')),
-            'femalePresenters': safe_int(row.get('Female Presenters')),
-            'couplePresenters': safe_bool(row.get('Couple Presenters')),
-            'pitchersAge': safe_str(row.get('Pitchers Average Age')),
-            'revenue': safe_float(row.get('Yearly Revenue')),
-            'margin': safe_float(row.get('Gross Margin')),
-            'ebitda': safe_float(row.get('EBITDA')),
-            'cashBurn': safe_str(row.get('Cash Burn')),
-            'skus': safe_int(row.get('SKUs')),
-            'hasPatents': safe_bool(row.get('Has Patents')),
-            'bootstrapped': safe_str(row.get('Bootstrapped')),
-        }
-        pitches.append(pitch)
+        return pitch_table({}, 0)
+
+    df = df.reset_index(drop=True)
+    frame, investments = norm if norm is not None else normalize_frame(df)
+
+    names = pitch_names(df, row_numbers)
+    seasons, eps = col_int(df, 'season', 1), col_int(df, 'ep')
+    ids = pitch_ids(names, seasons, eps, taken)
+
+    ask_amt  = col_float(df, 'askAmt')
+    ask_eq   = col_float(df, 'askEq')
+    ask_val  = col_float(df, 'askVal')
+    has_ask_val = (ask_val != 0) & ~np.isnan(ask_val)
+
+    funded        = col_bool(df, 'funded')
+    recv_offer    = col_bool(df, 'receivedOffer')
+    deal_amt      = col_float(df, 'dealAmt')
+    deal_eq       = col_float(df, 'dealEq')
+    deal_val      = col_float(df, 'dealVal')
+    has_deal_val  = (deal_val != 0) & ~np.isnan(deal_val)
+    total_debt    = col_float(df, 'totalDebt')
+    debt_interest = col_float(df, 'debtInterest')
+    royalty_pct   = col_float(df, 'royaltyPct')
+
+    deal_type = np.where(royalty_pct > 0, 'royalty', np.where(total_debt > 0, 'mixed', 'equity')).astype(object)
+
+    has_ask  = (ask_amt != 0) & ~np.isnan(ask_amt)
+    has_deal = funded & (deal_amt != 0) & ~np.isnan(deal_amt)
+    deal_val_out = col_round(deal_val, 2, funded & has_deal_val).astype(float)
 
-    print(f"[OK] Processed {len(pitches)} pitches")
+    sharks_lists, breakdowns = build_shark_breakdown(len(df), investments)
+    num_sharks = np.where(funded, col_int_array(df, 'numSharks', 0), 0)
+    summary = col_str(df, 'summary')
+
+    columns = {
+        'id': ids, 'name': names,
+        'season': col_int_array(df, 'season', 1),
+        'ep': col_int_array(df, 'ep'),
+        'pitch': col_int_array(df, 'pitch'),
+        'industry': col_str(df, 'industry'),
+        'type': summary,
+        'summary': summary,
+        'city': col_str(df, 'city'),
+        'state': col_str(df, 'state'),
+        'website': col_str(df, 'website'),
+        'startedIn': col_str(df, 'startedIn'),
+        'funded': funded, 'receivedOffer': recv_offer, 'dealType': deal_type,
+        'ask': col_currency(ask_amt, has_ask),
+        'askAmt': ask_amt, 'askEq': ask_eq,
+        'askVal': col_round(ask_val, 2, has_ask_val).astype(float),
+        'deal': col_currency(deal_amt, has_deal),
+        'dealAmt': col_masked(deal_amt, funded),
+        'dealEq': col_masked(deal_eq, funded),
+        'dealVal': deal_val_out,
+        'finalVal': deal_val_out,
+        'deltaVal': frame['deltaVal'].to_numpy(),
+        'totalDebt': col_masked(total_debt, funded),
+        'debtInterest': col_masked(debt_interest, funded),
+        'royaltyPct': col_masked(royalty_pct, funded),
+        'hasConditions': col_bool(df, 'hasConditions'),
+        'sharks': sharks_lists,
+        'numSharks': num_sharks,
+        'sharkBreakdown': breakdowns,
+        'numPresenters': col_int_array(df, 'numPresenters'),
+        'malePresenters': col_int_array(df, 'malePresenters'),
+        'femalePresenters': col_int_array(df, 'femalePresenters'),
+        'couplePresenters': col_bool(df, 'couplePresenters'),
+        'pitchersAge': col_str(df, 'pitchersAge'),
+        'revenue': col_float(df, 'revenue'),
+        'margin': col_float(df, 'margin'),
+        'ebitda': col_float(df, 'ebitda'),
+        'cashBurn': col_str(df, 'cashBurn'),
+        'skus': col_int_array(df, 'skus'),
+        'hasPatents': col_bool(df, 'hasPatents'),
+        'bootstrapped': col_str(df, 'bootstrapped'),
+    }
+    pitches = pitch_table(columns, len(df))
+
+    print(f"[OK] Processed {pitches['count']} pitches")
     return pitches
 
 
 # ═══════════════════════════════════════════════════════════════
 # Process sharks
 # ═══════════════════════════════════════════════════════════════
-def process_sharks(df):
-    shark_stats = {s: {'deals': 0, 'invested_lakhs': 0.0, 'seasons': set(), 'industries': {}} for s in CORE_SHARKS}
-
-    if df is not None and not df.empty:
-        for _, row in df.iterrows():
-            if not safe_bool(row.get('Accepted Offer')):
-                continue
-            season   = safe_int(row.get('Season Number'), 0)
-            industry = safe_str(row.get('Industry'))
-            for shark in CORE_SHARKS:
-                amt = safe_float(row.get(f'{shark} Investment Amount'))
-                if amt and amt > 0:
-                    shark_stats[shark]['deals'] += 1
-                    shark_stats[shark]['invested_lakhs'] += amt
-                    if season: shark_stats[shark]['seasons'].add(season)
-                    if industry: shark_stats[shark]['industries'][industry] = shark_stats[shark]['industries'].get(industry, 0) + 1
+INVESTOR_KEYS = ['investor']
+
+def investor_rollup(frame, investments, seq_offset=0):
+    """Mergeable per-investor partials over funded pitches: (totals, seasons, industries).
+
+    seq is the investment's position in the whole dataset (seq_offset + row in
+    investments), so first appearances still order correctly across chunks.
+    """
+    funded = investments[frame['funded'].to_numpy()[investments['row'].to_numpy()]]
+    funded = funded.assign(
+        seq=funded.index + seq_offset,
+        seasonInt=frame['seasonInt'].to_numpy()[funded['row'].to_numpy()],
+        industry=frame['industry'].to_numpy()[funded['row'].to_numpy()],
+    )
+    keys = INVESTOR_KEYS
+    totals = funded.groupby(keys, sort=False).agg(name=('name', 'first'), deals=('amt', 'size'), invested=('amt', 'sum'),
+                                                  first=('seq', 'min'))
+    seasons = funded.loc[funded['seasonInt'] != 0, keys + ['seasonInt']].drop_duplicates()
+    industries = funded[funded['industry'] != ''].groupby(keys + ['industry'], sort=False) \
+        .agg(count=('seq', 'size'), first=('seq', 'min')).reset_index()
+    return totals, seasons, industries
+
+def merge_investor_rollups(a, b):
+    keys = INVESTOR_KEYS
+    totals = pd.concat([a[0], b[0]]).groupby(level=keys, sort=False) \
+        .agg(name=('name', 'first'), deals=('deals', 'sum'), invested=('invested', 'sum'), first=('first', 'min'))
+    seasons = pd.concat([a[1], b[1]], ignore_index=True).drop_duplicates()
+    industries = pd.concat([a[2], b[2]], ignore_index=True).groupby(keys + ['industry'], sort=False) \
+        .agg(count=('count', 'sum'), first=('first', 'min')).reset_index()
+    return totals, seasons, industries
+
+def investor_stats(rollup):
+    """Per-investor rollups over funded pitches, keyed by canonical investor ID.
+
+    Returns {investor: {name, deals, invested_lakhs, seasons, topIndustries, first}}
+    where first is the investor's first appearance, for stable ordering.
+    """
+    totals, seasons, industries = rollup
+    keys = INVESTOR_KEYS
+    seasons = seasons.groupby(keys, sort=False)['seasonInt'].unique()
+    industries = industries.sort_values(['count', 'first'], ascending=[False, True], kind='stable') \
+        .groupby(keys, sort=False)['industry'].agg(lambda s: s.head(3).tolist())
+
+    stats = {}
+    for key, name, deals, invested, first in zip(totals.index, totals['name'].tolist(), totals['deals'].tolist(),
+                                                 totals['invested'].tolist(), totals['first'].tolist()):
+        stats[key] = {
+            'name': name, 'deals': deals, 'invested_lakhs': invested, 'first': first,
+            'seasons': sorted(int(s) for s in seasons.get(key, [])),
+            'topIndustries': industries.get(key, []),
+        }
+    return stats
+
+def shark_record(id_, investor, name, meta, stats):
+    return {
+        'id': id_, 'investorId': investor, 'name': name, 'fullName': meta.get('full', name),
+        'title': meta.get('title', 'Guest Shark'),
+        'emoji': meta.get('emoji', '🦈'),
+        'color': meta.get('color', '#888888'),
+        'deals': stats['deals'],
+        'investedCr': round(stats['invested_lakhs'] / 100, 1),
+        'topIndustries': stats['topIndustries'],
+        'seasons': stats['seasons'],
+    }
+
+def process_sharks(df, norm=None, rollup=None):
+    """rollup: investor_rollup() partials, already merged across chunks (streaming sync)."""
+    if rollup is None:
+        rollup = investor_rollup(*(norm if norm is not None else normalize_frame(df)))
+    stats = investor_stats(rollup)
+    empty = {'deals': 0, 'invested_lakhs': 0.0, 'seasons': [], 'topIndustries': []}
 
     sharks = []
-    for i, shark in enumerate(CORE_SHARKS):
-        meta  = SHARK_META[shark]
-        stats = shark_stats[shark]
-        top_ind = sorted(stats['industries'].items(), key=lambda x: -x[1])
-        sharks.append({
-            'id': i+1, 'name': shark, 'fullName': meta['full'],
-            'title': meta['title'], 'emoji': meta['emoji'], 'color': meta['color'],
-            'deals': stats['deals'],
-            'investedCr': round(stats['invested_lakhs'] / 100, 1),
-            'topIndustries': [ind for ind, _ in top_ind[:3]],
-            'seasons': sorted(stats['seasons']),
-        })
+    for i, investor in enumerate(investors.CORE_IDS):
+        meta = investors.INVESTORS[investor]
+        sharks.append(shark_record(i+1, investor, meta['name'], meta, stats.get(investor, empty)))
 
-    # Guest sharks — dynamically tally all non-core investors from 'Invested Guest Name'
-    guest_stats = {}  # name -> {deals, invested_lakhs, seasons, industries}
-    if df is not None and not df.empty:
-        for _, row in df.iterrows():
-            if not safe_bool(row.get('Accepted Offer')):
-                continue
-            guest_name_raw = safe_str(row.get('Invested Guest Name'))
-            if not guest_name_raw:
-                continue
-            guest_names = [n.strip() for n in guest_name_raw.split(',') if n.strip()]
-            guest_amt_total = safe_float(row.get('Guest Investment Amount'))
-            if not (guest_amt_total and guest_amt_total > 0):
-                continue
-            split_amt = round(guest_amt_total / len(guest_names), 2)
-            season   = safe_int(row.get('Season Number'), 0)
-            industry = safe_str(row.get('Industry'))
-            for gn in guest_names:
-                if gn not in guest_stats:
-                    guest_stats[gn] = {'deals': 0, 'invested_lakhs': 0.0, 'seasons': set(), 'industries': {}}
-                guest_stats[gn]['deals'] += 1
-                guest_stats[gn]['invested_lakhs'] += split_amt
-                if season: guest_stats[gn]['seasons'].add(season)
-                if industry: guest_stats[gn]['industries'][industry] = guest_stats[gn]['industries'].get(industry, 0) + 1
-
-    for i, (gn, gstats) in enumerate(sorted(guest_stats.items(), key=lambda x: -x[1]['deals'])):
-        meta = SHARK_META.get(gn) or SHARK_META.get(gn.split()[0]) or {'full': gn, 'title': 'Guest Shark', 'emoji': '🦈', 'color': '#888888'}
-        top_ind = sorted(gstats['industries'].items(), key=lambda x: -x[1])
-        sharks.append({
-            'id': len(CORE_SHARKS) + 1 + i,
-            'name': gn, 'fullName': meta.get('full', gn),
-            'title': meta.get('title', 'Guest Shark'),
-            'emoji': meta.get('emoji', '🦈'),
-            'color': meta.get('color', '#888888'),
-            'deals': gstats['deals'],
-            'investedCr': round(gstats['invested_lakhs'] / 100, 1),
-            'topIndustries': [ind for ind, _ in top_ind[:3]],
-            'seasons': sorted(gstats['seasons']),
-        })
+    # Guest sharks — every other investor from 'Invested Guest Name', most deals first
+    guests = sorted(((investor, s) for investor, s in stats.items() if investor not in investors.CORE_IDS),
+                    key=lambda x: (-x[1]['deals'], x[1]['first']))
+    for i, (investor, gstats) in enumerate(guests):
+        meta = investors.profile(investor, gstats['name'])
+        sharks.append(shark_record(len(CORE_SHARKS) + 1 + i, investor, gstats['name'], meta, gstats))
 
     print(f"[OK] Processed {len(sharks)} sharks")
     return sharks
@@ -334,20 +875,35 @@ def process_sharks(df):
 # ═══════════════════════════════════════════════════════════════
 # Process seasons
 # ═══════════════════════════════════════════════════════════════
-def process_seasons(df):
+def season_rollup(frame):
+    return frame.groupby('season').agg(
+        total=('season', 'size'), funded=('funded', 'sum'), invested=('dealAmt', 'sum'),
+        episodes=('episode', 'max'), startDate=('seasonStart', 'first'), endDate=('seasonEnd', 'first'),
+    )
+
+def merge_season_rollups(a, b):
+    return pd.concat([a, b]).groupby(level=0).agg(
+        total=('total', 'sum'), funded=('funded', 'sum'), invested=('invested', 'sum'),
+        episodes=('episodes', 'max'), startDate=('startDate', 'first'), endDate=('endDate', 'first'),
+    )
+
+def process_seasons(df, norm=None, rollup=None):
+    if rollup is None:
+        frame, _ = norm if norm is not None else normalize_frame(df)
+        rollup = season_rollup(frame)
+    by_season = rollup
+
     seasons = []
     for num in range(1, 6):
         year = SEASON_YEARS.get(num, str(num))
-        if df is not None and not df.empty and 'Season Number' in df.columns:
-            s_df = df[df['Season Number'] == num]
-            total     = len(s_df)
-            funded    = int(s_df['Accepted Offer'].apply(safe_bool).sum())
-            deal_rate = round(funded / total * 100) if total > 0 else 0
-            invested_lakhs = s_df['Total Deal Amount'].apply(lambda v: safe_float(v, 0)).sum()
-            invested_cr = round(invested_lakhs / 100, 1)
-            episodes  = int(s_df['Episode Number'].max()) if total > 0 else 0
-            start_date = safe_str(s_df['Season Start'].iloc[0]) if total > 0 else ''
-            end_date   = safe_str(s_df['Season End'].iloc[0]) if total > 0 else ''
+        if num in by_season.index:
+            s = by_season.loc[num]
+            total     = int(s['total'])
+            funded    = int(s['funded'])
+            deal_rate = round(funded / total * 100)
+            invested_cr = float(round(np.float64(s['invested']) / 100, 1))
+            episodes  = int(s['episodes']) if s['episodes'] == s['episodes'] else 0
+            start_date, end_date = s['startDate'], s['endDate']
         else:
             total = funded = deal_rate = episodes = 0
             invested_cr = 0.0
@@ -367,18 +923,26 @@ def process_seasons(df):
 # ═══════════════════════════════════════════════════════════════
 # Process industries
 # ═══════════════════════════════════════════════════════════════
-def process_industries(df):
+def industry_rollup(frame):
+    return frame[frame['industry'] != ''].groupby('industry').agg(
+        total=('funded', 'size'), funded=('funded', 'sum'), invested=('dealAmt', 'sum'))
+
+def merge_industry_rollups(a, b):
+    return pd.concat([a, b]).groupby(level=0).sum()
+
+def process_industries(df, norm=None, rollup=None):
     industries = []
-    if df is None or df.empty or 'Industry' not in df.columns:
-        return industries
-    for ind, group in df.groupby('Industry'):
-        total  = len(group)
-        funded = int(group['Accepted Offer'].apply(safe_bool).sum())
-        deal_rate = round(funded / total * 100) if total > 0 else 0
-        invested_lakhs = group['Total Deal Amount'].apply(lambda v: safe_float(v, 0)).sum()
+    if rollup is None:
+        if df is None or df.empty:
+            return industries
+        frame, _ = norm if norm is not None else normalize_frame(df)
+        rollup = industry_rollup(frame)
+    by_industry = rollup
+    for ind, total, funded, invested in zip(by_industry.index, by_industry['total'].tolist(),
+                                            by_industry['funded'].tolist(), by_industry['invested'].to_numpy()):
         industries.append({
-            'name': str(ind), 'total': total, 'funded': funded,
-            'dealRate': deal_rate, 'investedCr': round(invested_lakhs / 100, 1),
+            'name': str(ind), 'total': int(total), 'funded': int(funded),
+            'dealRate': round(funded / total * 100), 'investedCr': float(round(invested / 100, 1)),
         })
     industries.sort(key=lambda x: -x['total'])
     print(f"[OK] Processed {len(industries)} industries")
@@ -386,20 +950,506 @@ def process_industries(df):
 
 
 # ═══════════════════════════════════════════════════════════════
-# Save raw CSV
+# Facet index - facet value -> sorted pitch positions
+# ═══════════════════════════════════════════════════════════════
+FACETS_FORMAT  = 'stih-facets'
+FACETS_VERSION = 1
+FACET_FIELDS = ['season', 'industry', 'state', 'funded', 'receivedOffer', 'dealType']
+
+def facet_key(value):
+    if isinstance(value, (bool, np.bool_)):
+        return 'true' if value else 'false'
+    return str(value)
+
+def facet_rollup(pitches, offset=0):
+    """Mergeable posting lists: {field: {value: [positions array, ...]}} plus the pitch count.
+
+    offset is added to every position (the chunk's first row in a streaming sync).
+    """
+    facets = {}
+    for field in FACET_FIELDS:
+        values = pd.Series(pitch_column(pitches, field), dtype=object)
+        facets[field] = {v: [positions + offset] for v, positions in values.groupby(values, sort=True).indices.items()}
+
+    investors = pd.Series(pitch_column(pitches, 'sharks'), dtype=object).explode().dropna()
+    pairs = pd.DataFrame({'pos': investors.index, 'name': investors.to_numpy()}).drop_duplicates()
+    facets['shark'] = {name: [positions.to_numpy() + offset] for name, positions in pairs.groupby('name', sort=True)['pos']}
+    return {'count': pitches['count'], 'facets': facets}
+
+def merge_facet_rollups(a, b):
+    """b's postings follow a's; a is extended in place."""
+    for field, values in b['facets'].items():
+        merged = a['facets'].setdefault(field, {})
+        for value, parts in values.items():
+            merged.setdefault(value, []).extend(parts)
+    a['count'] += b['count']
+    return a
+
+def build_facet_index(pitches, rollup=None):
+    """Posting lists over pitches.json positions, for each FACET_FIELDS value and each
+    investor in 'sharks', so filters can intersect lists instead of scanning.
+    rollup: facet_rollup() partials, already merged across chunks (streaming sync)."""
+    if rollup is None:
+        rollup = facet_rollup(pitches)
+    facets = {field: {facet_key(v): np.concatenate(parts).tolist() for v, parts in sorted(values.items())}
+              for field, values in rollup['facets'].items()}
+    return {'format': FACETS_FORMAT, 'version': FACETS_VERSION, 'count': rollup['count'], 'facets': facets}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Search index - tokens -> (position, tf) postings, trigrams -> tokens
+# ═══════════════════════════════════════════════════════════════
+SEARCH_FORMAT  = 'stih-search'
+SEARCH_VERSION = 1
+SEARCH_FIELDS  = ['name', 'type', 'summary', 'city', 'state', 'industry']
+SEARCH_TOKEN   = r'[^\W_]+'   # letters/digits; keep in sync with dataService._tokenize()
+SEARCH_GRAM    = 3
+
+def search_rollup(pitches, offset=0):
+    """Mergeable postings: {term: [flattened pos/tf array, ...]} plus the pitch count.
+
+    offset is added to every position (the chunk's first row in a streaming sync).
+    """
+    fields = [pitch_column(pitches, f) for f in SEARCH_FIELDS]
+    text = pd.Series([' '.join(v or '' for v in values) for values in zip(*fields)], dtype=object)
+    tokens = text.str.lower().str.findall(SEARCH_TOKEN).explode().dropna()
+    tf = pd.DataFrame({'pos': tokens.index, 'term': tokens.to_numpy(dtype=object)}) \
+        .groupby(['term', 'pos'], sort=True).size().reset_index(name='tf')
+
+    postings = {}
+    if len(tf):
+        term_col = tf['term'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, term_col[1:] != term_col[:-1]])
+        pairs = np.column_stack([tf['pos'].to_numpy() + offset, tf['tf'].to_numpy()])
+        postings = {term: [chunk.ravel()] for term, chunk in zip(term_col[starts].tolist(), np.split(pairs, starts[1:]))}
+    return {'count': pitches['count'], 'postings': postings}
+
+def merge_search_rollups(a, b):
+    """b's postings follow a's; a is extended in place."""
+    for term, parts in b['postings'].items():
+        a['postings'].setdefault(term, []).extend(parts)
+    a['count'] += b['count']
+    return a
+
+def build_search_index(pitches, rollup=None):
+    """Inverted index over SEARCH_FIELDS.
+
+    terms[i] is a lowercase token and postings[i] its flattened [pos, tf, pos, tf, ...]
+    list. grams maps each trigram to the ids of the terms containing it, so a query
+    token can match anywhere inside a term without scanning the pitches.
+    rollup: search_rollup() partials, already merged across chunks (streaming sync).
+    """
+    if rollup is None:
+        rollup = search_rollup(pitches)
+    terms = sorted(rollup['postings'])
+    postings = [np.concatenate(rollup['postings'][term]).tolist() for term in terms]
+
+    grams = {}
+    for term_id, term in enumerate(terms):
+        for gram in sorted({term[i:i + SEARCH_GRAM] for i in range(len(term) - SEARCH_GRAM + 1)}):
+            grams.setdefault(gram, []).append(term_id)
+
+    return {
+        'format': SEARCH_FORMAT, 'version': SEARCH_VERSION, 'count': rollup['count'],
+        'fields': SEARCH_FIELDS, 'gram': SEARCH_GRAM, 'terms': terms, 'postings': postings, 'grams': grams,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+# Pitch lookup - ID / season-ep-pitch key -> position and byte span in pitches.json
+# ═══════════════════════════════════════════════════════════════
+LOOKUP_FORMAT  = 'stih-lookup'
+LOOKUP_VERSION = 1
+LOOKUP_FIELDS  = ['id', 'season', 'ep', 'pitch']   # the pitch fields build_pitch_lookup reads
+
+def build_pitch_lookup(pitches, pretty=None, lengths=None):
+    """Random access into pitches.json without parsing it.
+
+    ids and keys (season-ep-pitch, #n on repeats) map to positions; record i is
+    bytes offsets[i] .. offsets[i] + lengths[i] of pitches.json, which pitches_json
+    lays out as the records joined by ',' ('[\\n  ' / ',\\n  ' when pretty, default
+    PRETTY_JSON). bytes is the file's size, so a stale lookup can be told apart.
+    lengths: the record lengths pitches_json() returned, when it already ran.
+    """
+    pretty = PRETTY_JSON if pretty is None else pretty
+    if lengths is None:
+        lengths = pitches_json(pitches, pretty)[1]
+    head, sep, tail = (4, 4, 2) if pretty else (1, 1, 1)
+    offsets = head + np.concatenate([[0], np.cumsum(lengths + sep)[:-1]]).astype(np.int64)
+    size = int(offsets[-1] + lengths[-1] + tail) if pitches['count'] else 2
+
+    keys = row_keys(pitch_column(pitches, 'season'), pitch_column(pitches, 'ep'), pitch_column(pitches, 'pitch'))
+    return {
+        'format': LOOKUP_FORMAT, 'version': LOOKUP_VERSION, 'count': pitches['count'], 'bytes': size,
+        'ids': {id_: i for i, id_ in enumerate(pitch_column(pitches, 'id'))}, 'keys': {k: i for i, k in enumerate(keys)},
+        'offsets': offsets.tolist(), 'lengths': lengths.tolist(),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+# Analytics cube - season x industry x shark x dealType rollups
+# ═══════════════════════════════════════════════════════════════
+CUBE_FORMAT     = 'stih-cube'
+CUBE_VERSION    = 1
+CUBE_DIMENSIONS = ['season', 'industry', 'shark', 'dealType']
+CUBE_MEASURES   = ['count', 'funded', 'invested', 'valuation', 'avgDeltaVal']
+CUBE_ALL        = '*'
+
+def cube_measures(frame):
+    """count/funded/invested plus the sums needed for equity-weighted valuation and avg deltaVal."""
+    has_val = frame['val'].notna() & (frame['eq'] > 0)
+    return frame.assign(
+        w=frame['eq'].where(has_val, 0.0),
+        wv=(frame['val'] * frame['eq']).where(has_val, 0.0),
+    )
+
+
+def cube_rollup(pitches):
+    """Mergeable cube sums: {dimensions used: count/funded/invested/w/wv/deltaSum/deltaCount
+    per cell}, one frame per combination of CUBE_DIMENSIONS, plus the pitch count."""
+    base = cube_measures(pd.DataFrame({
+        'season':   [str(v) for v in pitch_column(pitches, 'season')],
+        'industry': [v or '' for v in pitch_column(pitches, 'industry')],
+        'dealType': [v or '' for v in pitch_column(pitches, 'dealType')],
+        'funded':   [bool(v) for v in pitch_column(pitches, 'funded')],
+        'amt':      [v or 0.0 for v in pitch_column(pitches, 'dealAmt')],
+        'eq':       [v or 0.0 for v in pitch_column(pitches, 'dealEq')],
+        'val':      [np.nan if v is None else v for v in pitch_column(pitches, 'dealVal')],
+        'delta':    [np.nan if v is None else v for v in pitch_column(pitches, 'deltaVal')],
+    }))
+
+    stakes = [(pos, name, a or 0.0, e or 0.0)
+              for pos, entries in enumerate(pitch_column(pitches, 'sharkBreakdown')) for name, a, e, _ in entries]
+    pos, shark, amt, eq = (list(c) for c in zip(*stakes)) if stakes else ([], [], [], [])
+    by_shark = cube_measures(base.drop(columns=['amt', 'eq', 'w', 'wv']).iloc[pos].assign(
+        shark=shark, amt=np.array(amt, dtype=float), eq=np.array(eq, dtype=float)))
+
+    sums = {}
+    for used in itertools.product([True, False], repeat=len(CUBE_DIMENSIONS)):
+        frame = by_shark if used[2] else base
+        if frame.empty:
+            continue
+        keys = [frame[dim] if use else pd.Series(CUBE_ALL, index=frame.index)
+                for dim, use in zip(CUBE_DIMENSIONS, used)]
+        sums[used] = frame.groupby(keys, sort=True).agg(
+            count=('funded', 'size'), funded=('funded', 'sum'), invested=('amt', 'sum'),
+            w=('w', 'sum'), wv=('wv', 'sum'), deltaSum=('delta', 'sum'), deltaCount=('delta', 'count'),
+        )
+    return {'count': pitches['count'], 'sums': sums}
+
+def merge_cube_rollups(a, b):
+    sums = dict(a['sums'])
+    for used, grouped in b['sums'].items():
+        sums[used] = grouped if used not in sums else \
+            pd.concat([sums[used], grouped]).groupby(level=list(range(len(CUBE_DIMENSIONS))), sort=True).sum()
+    return {'count': a['count'] + b['count'], 'sums': sums}
+
+def build_cube(pitches, rollup=None):
+    """Every season x industry x shark x dealType rollup, including the cross cells.
+
+    cells maps "season|industry|shark|dealType" ('*' = all values of that dimension)
+    to [count, funded, invested, valuation, avgDeltaVal]. Cells sliced by shark count
+    that shark's pitches and use its own amount/equity from sharkBreakdown; the others
+    use dealAmt/dealEq. valuation is the dealVal average weighted by equity taken.
+    rollup: cube_rollup() partials, already merged across chunks (streaming sync).
+    """
+    if rollup is None:
+        rollup = cube_rollup(pitches)
+    cells = {}
+    for used in itertools.product([True, False], repeat=len(CUBE_DIMENSIONS)):
+        grouped = rollup['sums'].get(used)
+        if grouped is None:
+            continue
+        for key, count, funded, invested, w, wv, delta_sum, delta_count in zip(
+                grouped.index.tolist(), grouped['count'].tolist(), grouped['funded'].tolist(),
+                grouped['invested'].tolist(), grouped['w'].tolist(), grouped['wv'].tolist(),
+                grouped['deltaSum'].tolist(), grouped['deltaCount'].tolist()):
+            cells['|'.join(key)] = [
+                count, funded, round(invested, 2),
+                round(wv / w, 2) if w > 0 else None,
+                round(delta_sum / delta_count, 2) if delta_count else None,
+            ]
+
+    print(f"[OK] Built analytics cube ({len(cells)} cells)")
+    return {
+        'format': CUBE_FORMAT, 'version': CUBE_VERSION, 'count': rollup['count'],
+        'dimensions': CUBE_DIMENSIONS, 'measures': CUBE_MEASURES, 'all': CUBE_ALL, 'cells': cells,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+# Co-investment network - which investors back the same pitches
 # ═══════════════════════════════════════════════════════════════
-def save_raw_csv(df):
+NETWORK_FORMAT       = 'stih-network'
+NETWORK_VERSION      = 1
+NETWORK_FIELDS       = ['a', 'b', 'deals', 'amount']
+NETWORK_TOP_PARTNERS = 5
+
+def incidence(frame, investments):
+    """Pitch x investor incidence matrix in COO form, sorted by pitch.
+
+    Returns (rows, cols, amt, ids, names): cols index ids/names (order of first
+    appearance), amt is the investor's amount in the pitch. An investor named
+    twice on one pitch is one entry with the amounts summed.
+    """
+    cols, ids = pd.factorize(investments['investor'])
+    names = investments['name'].to_numpy(dtype=object)[np.unique(cols, return_index=True)[1]]
+    cells = pd.DataFrame({'row': investments['row'].to_numpy(), 'col': cols,
+                          'amt': np.nan_to_num(investments['amt'].to_numpy(dtype=float), nan=0.0)})
+    cells = cells.groupby(['row', 'col'], sort=True, as_index=False)['amt'].sum()
+    return (cells['row'].to_numpy(dtype=np.int64), cells['col'].to_numpy(dtype=np.int64),
+            cells['amt'].to_numpy(dtype=float), list(ids), list(names))
+
+def co_investments(rows, cols, amt):
+    """Every pair of entries sharing a pitch: the nonzeros of B'B above the diagonal.
+
+    B is the 0/1 incidence matrix; pairs are expanded pitch by pitch (sum of k^2 over
+    pitches with k investors, the work of a sparse product) without a Python loop.
+    Returns (row, a, b, amount) per pair with a < b, amount = both investors' amounts.
+    """
+    idx = np.arange(len(rows))
+    ends = np.searchsorted(rows, rows, side='right')
+    after = ends - idx - 1
+    left = np.repeat(idx, after)
+    right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(after) - after, after)
+    a, b = cols[left], cols[right]
+    return rows[left], np.minimum(a, b), np.maximum(a, b), amt[left] + amt[right]
+
+def pair_totals(keys, amount):
+    """Sum deals/amount per distinct key -> (first index per key, deals, amount)."""
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return first, np.bincount(inverse), np.bincount(inverse, weights=amount)
+
+def pair_list(a, b, deals, amount):
+    """[[a, b, deals, amount]], most deals first (then amount, then a, b)."""
+    order = np.lexsort((b, a, -amount, -deals))
+    return [[int(x), int(y), int(d), round(float(v), 2)] for x, y, d, v in
+            zip(a[order], b[order], deals[order], amount[order])]
+
+def network_rollup(frame, investments):
+    """Mergeable network partials, plus the pitch count.
+
+    ids/names/deals/amount are per investor, in order of first appearance; pairs is
+    (a, b, deals, amount) per investor pair (indexes into ids, a < b) and seasons
+    (season, a, b, deals, amount) per season and pair.
+    """
+    rows, cols, amt, ids, names = incidence(frame, investments)
+    m = len(ids)
+    pair_rows, a, b, amount = co_investments(rows, cols, amt)
+    first, deals, total = pair_totals(a * m + b, amount)
+    season = frame['seasonInt'].to_numpy()[pair_rows]
+    s_first, s_deals, s_total = pair_totals((season * m + a) * m + b, amount)
+    return {
+        'count': len(frame), 'ids': ids, 'names': names,
+        'deals': np.bincount(cols, minlength=m), 'amount': np.bincount(cols, weights=amt, minlength=m),
+        'pairs': (a[first], b[first], deals, total),
+        'seasons': (season[s_first], a[s_first], b[s_first], s_deals, s_total),
+    }
+
+def merge_pair_totals(keys, deals, amount):
+    """Sum deals/amount per distinct key -> (first index per key, deals, amount)."""
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return first, np.bincount(inverse, weights=deals).astype(np.int64), np.bincount(inverse, weights=amount)
+
+def merge_network_rollups(a, b):
+    """b's investors are renumbered into a's, new ones appended in order of appearance."""
+    index = {id_: i for i, id_ in enumerate(a['ids'])}
+    ids, names = list(a['ids']), list(a['names'])
+    for id_, name in zip(b['ids'], b['names']):
+        if id_ not in index:
+            index[id_] = len(ids)
+            ids.append(id_)
+            names.append(name)
+    m = len(ids)
+    remap = np.array([index[id_] for id_ in b['ids']], dtype=np.int64)
+    deals = np.zeros(m, dtype=np.int64)
+    amount = np.zeros(m)
+    deals[:len(a['deals'])] += a['deals']
+    amount[:len(a['amount'])] += a['amount']
+    np.add.at(deals, remap, b['deals'])
+    np.add.at(amount, remap, b['amount'])
+
+    def renumber(x, y):
+        x, y = remap[x], remap[y]
+        return np.minimum(x, y), np.maximum(x, y)
+
+    bx, by = renumber(*b['pairs'][:2])
+    x, y = np.concatenate([a['pairs'][0], bx]), np.concatenate([a['pairs'][1], by])
+    first, pair_deals, total = merge_pair_totals(
+        x * m + y, np.concatenate([a['pairs'][2], b['pairs'][2]]), np.concatenate([a['pairs'][3], b['pairs'][3]]))
+
+    bx, by = renumber(*b['seasons'][1:3])
+    season = np.concatenate([a['seasons'][0], b['seasons'][0]])
+    sx, sy = np.concatenate([a['seasons'][1], bx]), np.concatenate([a['seasons'][2], by])
+    s_first, s_deals, s_total = merge_pair_totals(
+        (season * m + sx) * m + sy,
+        np.concatenate([a['seasons'][3], b['seasons'][3]]), np.concatenate([a['seasons'][4], b['seasons'][4]]))
+    return {
+        'count': a['count'] + b['count'], 'ids': ids, 'names': names, 'deals': deals, 'amount': amount,
+        'pairs': (x[first], y[first], pair_deals, total),
+        'seasons': (season[s_first], sx[s_first], sy[s_first], s_deals, s_total),
+    }
+
+def build_network(frame, investments, rollup=None):
+    """Co-investment network of all investors, from the normalized frame.
+
+    pairs holds [a, b, deals, amount] for every two investors (indexes into
+    investors) that backed the same pitch: deals is the number of such pitches,
+    amount what the two put in together (lakhs). seasons has the same per season,
+    topPartners the NETWORK_TOP_PARTNERS most frequent partners of each investor.
+    rollup: network_rollup() partials, already merged across chunks (streaming sync).
+    """
+    if rollup is None:
+        rollup = network_rollup(frame, investments)
+    ids, names = rollup['ids'], rollup['names']
+    m = len(ids)
+    pa, pb, deals, total = rollup['pairs']
+    pairs = pair_list(pa, pb, deals, total)
+
+    seasons = {}
+    season, sa, sb, s_deals, s_total = rollup['seasons']
+    for s in np.unique(season).tolist():
+        sel = season == s
+        seasons[str(s)] = pair_list(sa[sel], sb[sel], s_deals[sel], s_total[sel])
+
+    # Both directions of every pair, best partners first, cut at NETWORK_TOP_PARTNERS
+    src, dst = np.concatenate([pa, pb]), np.concatenate([pb, pa])
+    both_deals, both_total = np.concatenate([deals, deals]), np.concatenate([total, total])
+    order = np.lexsort((dst, -both_total, -both_deals, src))
+    src, dst, both_deals, both_total = src[order], dst[order], both_deals[order], both_total[order]
+    rank = np.arange(len(src)) - np.searchsorted(src, src)
+    keep = rank < NETWORK_TOP_PARTNERS
+    top = {}
+    for x, y, d, v in zip(src[keep].tolist(), dst[keep].tolist(), both_deals[keep].tolist(), both_total[keep].tolist()):
+        top.setdefault(ids[x], []).append([y, d, round(v, 2)])
+
+    print(f"[OK] Built co-investment network ({m} investors, {len(pairs)} pairs)")
+    return {
+        'format': NETWORK_FORMAT, 'version': NETWORK_VERSION, 'count': rollup['count'],
+        'investors': [{'id': id_, 'name': name, 'deals': int(d), 'amount': round(float(v), 2)}
+                      for id_, name, d, v in zip(ids, names, rollup['deals'], rollup['amount'])],
+        'fields': NETWORK_FIELDS, 'pairs': pairs, 'seasons': seasons, 'topPartners': top,
+    }
+
+def process_network(df, norm=None):
+    return build_network(*(norm if norm is not None else normalize_frame(df)))
+
+
+# ═══════════════════════════════════════════════════════════════
+# Episode time series - cumulative and rolling metrics per season/episode
+# ═══════════════════════════════════════════════════════════════
+TIMESERIES_FORMAT  = 'stih-timeseries'
+TIMESERIES_VERSION = 1
+TIMESERIES_WINDOW  = 5    # episodes in the rolling deal rate
+TIMESERIES_FIELDS  = ['season', 'episode', 'pitches', 'deals', 'invested', 'cumInvested', 'seasonInvested',
+                      'dealRate', 'rollingDealRate']
+TIMESERIES_INVESTOR_FIELDS = ['episode', 'deals', 'runningDeals', 'avgDeltaVal']
+
+def timeseries_rollup(frame, investments):
+    """Mergeable per-episode sums, plus the pitch count.
+
+    episodes has pitches/deals/invested per (seasonInt, episode), investors
+    name/deals/deltaSum/deltaCount per (investor, seasonInt, episode).
+    """
+    placed = (frame['seasonInt'] > 0) & frame['episode'].notna()
+    pitches = frame.loc[placed, ['seasonInt', 'episode', 'pitch', 'funded', 'dealAmt', 'deltaVal']] \
+        .astype({'episode': np.int64}).sort_values(['seasonInt', 'episode', 'pitch'], kind='stable')
+    episodes = pitches.groupby(['seasonInt', 'episode'], sort=True).agg(
+        pitches=('funded', 'size'), deals=('funded', 'sum'), invested=('dealAmt', 'sum'))
+
+    # One row per investment in a funded, placed pitch, like the shark totals count deals
+    rows = investments['row'].to_numpy()
+    deals = investments[(placed & frame['funded']).to_numpy()[rows]]
+    rows = deals['row'].to_numpy()
+    per_episode = pd.DataFrame({
+        'investor': deals['investor'].to_numpy(), 'name': deals['name'].to_numpy(),
+        'seasonInt': frame['seasonInt'].to_numpy()[rows], 'episode': frame['episode'].to_numpy()[rows].astype(np.int64),
+        'delta': frame['deltaVal'].to_numpy()[rows],
+    }).groupby(['investor', 'seasonInt', 'episode'], sort=True).agg(
+        name=('name', 'first'), deals=('delta', 'size'), deltaSum=('delta', 'sum'), deltaCount=('delta', 'count'))
+    return {'count': len(frame), 'episodes': episodes, 'investors': per_episode}
+
+def merge_timeseries_rollups(a, b):
+    episodes = pd.concat([a['episodes'], b['episodes']]).groupby(level=['seasonInt', 'episode'], sort=True).sum()
+    per_episode = pd.concat([a['investors'], b['investors']]) \
+        .groupby(level=['investor', 'seasonInt', 'episode'], sort=True).agg(
+            name=('name', 'first'), deals=('deals', 'sum'), deltaSum=('deltaSum', 'sum'), deltaCount=('deltaCount', 'sum'))
+    return {'count': a['count'] + b['count'], 'episodes': episodes, 'investors': per_episode}
+
+def build_timeseries(frame, investments, window=TIMESERIES_WINDOW, rollup=None):
+    """Per-episode series in season/episode/pitch order, from the normalized frame.
+
+    episodes holds one TIMESERIES_FIELDS row per episode: invested is the episode's
+    dealAmt total, cumInvested its running total over the show and seasonInvested
+    within the season; dealRate is the episode's % of funded pitches, rollingDealRate
+    the same over the last `window` episodes. investors maps each investor to its
+    name and one TIMESERIES_INVESTOR_FIELDS row per episode it closed deals in
+    (episode indexes into episodes): runningDeals and avgDeltaVal (mean deltaVal
+    of its deals so far) are running values. Pitches without a season or episode
+    number are left out.
+    rollup: timeseries_rollup() partials, already merged across chunks (streaming sync).
+    """
+    if rollup is None:
+        rollup = timeseries_rollup(frame, investments)
+    episodes, per_episode = rollup['episodes'], rollup['investors']
+    rolling = episodes[['pitches', 'deals']].rolling(window, min_periods=1).sum()
+    episodes = episodes.assign(
+        cumInvested=episodes['invested'].cumsum(),
+        seasonInvested=episodes.groupby(level='seasonInt')['invested'].cumsum(),
+        dealRate=episodes['deals'] / episodes['pitches'] * 100,
+        rollingDealRate=rolling['deals'] / rolling['pitches'] * 100,
+    )
+
+    running = per_episode.groupby(level='investor')[['deals', 'deltaSum', 'deltaCount']].cumsum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_delta = (running['deltaSum'] / running['deltaCount']).to_numpy()
+    position = episodes.index.get_indexer(per_episode.index.droplevel('investor'))
+
+    series = {}
+    for investor, name, pos, d, total, avg in zip(
+            per_episode.index.get_level_values('investor').tolist(), per_episode['name'].tolist(), position.tolist(),
+            per_episode['deals'].tolist(), running['deals'].tolist(), avg_delta.tolist()):
+        entry = series.setdefault(investor, {'name': name, 'series': []})
+        entry['series'].append([pos, d, total, None if avg != avg else round(avg, 2)])
+
+    rows = [[s, e, n, d, round(inv, 2), round(cum, 2), round(season_cum, 2), round(rate, 1), round(roll, 1)]
+            for (s, e), n, d, inv, cum, season_cum, rate, roll in zip(
+                episodes.index.tolist(), episodes['pitches'].tolist(), episodes['deals'].tolist(),
+                episodes['invested'].tolist(), episodes['cumInvested'].tolist(), episodes['seasonInvested'].tolist(),
+                episodes['dealRate'].tolist(), episodes['rollingDealRate'].tolist())]
+    print(f"[OK] Built episode time series ({len(rows)} episodes, {len(series)} investors)")
+    return {
+        'format': TIMESERIES_FORMAT, 'version': TIMESERIES_VERSION, 'count': rollup['count'], 'window': window,
+        'fields': TIMESERIES_FIELDS, 'episodes': rows,
+        'investorFields': TIMESERIES_INVESTOR_FIELDS, 'investors': series,
+    }
+
+def process_timeseries(df, norm=None):
+    return build_timeseries(*(norm if norm is not None else normalize_frame(df)))
+
+
+# ═══════════════════════════════════════════════════════════════
+# Save raw CSV - into the snapshot store (see raw_snapshots.py)
+# ═══════════════════════════════════════════════════════════════
+SNAPSHOTS_DIR = 'snapshots'   # under RAW_DIR
+
+def save_raw_csv(csv_path):
+    """Snapshot the downloaded CSV, byte for byte, into RAW_DIR/snapshots.
+
+    Plain kaggle_raw_*.csv copies left by earlier syncs are moved into the store first.
+    """
     try:
-        from datetime import datetime
-        data_dir = Path(__file__).parent.parent / 'src' / 'data' / 'raw'
-        data_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime('%d%m%y%H%M%S')
-        filename  = f'kaggle_raw_{timestamp}.csv'
-        df.to_csv(data_dir / filename, index=False, encoding='utf-8')
-        df.to_csv(data_dir / 'kaggle_raw_latest.csv', index=False, encoding='utf-8')
-        print(f"[SUCCESS] Saved raw CSV: {filename} ({len(df)} records, {len(df.columns)} columns)")
-        print(f"[SUCCESS] Updated latest raw CSV snapshot")
-        return True, filename
+        root = RAW_DIR / SNAPSHOTS_DIR
+        imported = raw_snapshots.import_plain_copies(root, RAW_DIR)
+        if imported:
+            print(f"[OK] Moved {imported} plain raw CSV copies into the snapshot store")
+        entry, created = raw_snapshots.save_snapshot(root, Path(csv_path).read_bytes(), source=Path(csv_path).name)
+        if not created:
+            print(f"[SKIP] Raw CSV unchanged, same content as {entry['name']}")
+        else:
+            print(f"[SUCCESS] Saved raw CSV: {entry['name']} ({entry['rows']} rows, {entry['bytes']} -> "
+                  f"{entry['storedBytes']} bytes {entry['storage']}, from {Path(csv_path).name})")
+        return True, entry['name']
     except Exception as e:
         print(f"[ERROR] Failed to save raw CSV: {str(e)}")
         return False, None
@@ -408,74 +1458,1116 @@ def save_raw_csv(df):
 # ═══════════════════════════════════════════════════════════════
 # Save JSON
 # ═══════════════════════════════════════════════════════════════
-def save_json(filename, data):
+COLUMNAR_FORMAT  = 'stih-columnar'
+COLUMNAR_VERSION = 1
+COLUMNAR_DICT_FIELDS = ['industry', 'city', 'state']
+
+def encode_columns(pitches, codes, dict_fields=COLUMNAR_DICT_FIELDS):
+    """Pitch table -> (columns, encodings), one array per field (see encode_columnar).
+
+    codes maps each dictionary (dict_fields and 'sharks') to {value: index}; values
+    not in it yet are appended in place, so the chunks of a streaming sync share it.
+    """
+    def code(name, value):
+        return codes[name].setdefault(value, len(codes[name]))
+
+    columns, encodings = {}, {}
+    for field in pitches['columns']:
+        values = pitch_column(pitches, field)
+        if field in dict_fields:
+            columns[field] = [code(field, v) for v in values]
+            encodings[field] = 'dict'
+        elif field == 'sharks':
+            columns[field] = [[code('sharks', s) for s in v] for v in values]
+            encodings[field] = 'dict-list'
+        elif field == 'sharkBreakdown':
+            columns[field] = [[[code('sharks', s), a, e] + ([] if d is None else [d]) for s, a, e, d in v]
+                              for v in values]
+            encodings[field] = 'breakdown'
+        else:
+            columns[field] = values
+            encodings[field] = 'plain'
+    return columns, encodings
+
+def encode_columnar(pitches, dict_fields=COLUMNAR_DICT_FIELDS):
+    """Pitch table -> one array per field. Strings in dict_fields and shark names become
+    indexes into shared dictionaries; sharkBreakdown becomes [shark, amt, eq(, debt)] rows."""
+    codes = {name: {} for name in dict_fields + ['sharks']}
+    columns, encodings = encode_columns(pitches, codes, dict_fields)
+    return {
+        'format': COLUMNAR_FORMAT, 'version': COLUMNAR_VERSION, 'count': pitches['count'],
+        'fields': list(pitches['columns']), 'encodings': encodings,
+        'dictionaries': {name: list(values) for name, values in codes.items()}, 'columns': columns,
+    }
+
+def write_if_changed(filepath, text):
+    """Write text unless the file already holds exactly that. Returns True if written.
+
+    Writing into a new generation, the same file of the published generation is
+    linked instead when it already holds exactly text.
+    """
+    # Leave unchanged files untouched so their mtime/backups stay meaningful
+    if filepath.exists() and filepath.read_text(encoding='utf-8') == text:
+        return False
+    previous = output_dir() / filepath.name
+    if previous != filepath and previous.exists() and previous.read_text(encoding='utf-8') == text:
+        link_or_copy(previous, filepath)
+        return False
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
+
+def json_text(data, compact=False, pretty=None):
+    """Minified JSON; indented when pretty (default PRETTY_JSON) unless compact (machine-only files)."""
+    return serializer.dumps(data, indent=not compact and (PRETTY_JSON if pretty is None else pretty))
+
+def resolve_pretty(pretty):
+    """--pretty / SYNC_PRETTY_JSON -> whether the human-readable outputs are indented (default no)."""
+    if pretty is None:
+        pretty = (os.getenv('SYNC_PRETTY_JSON') or '').lower() in ('1', 'true', 'yes')
+    return pretty
+
+def write_compressed(filepath, data, unchanged):
+    """Write the precompressed siblings of filepath (<name>.gz, <name>.br) from its bytes.
+
+    unchanged: filepath was left or linked as it was, so siblings already in place
+    (or in the published generation) still match and are kept or linked instead.
+    """
+    for suffix, make in serializer.COMPRESSORS.items():
+        sibling = filepath.with_name(filepath.name + suffix)
+        previous = output_dir() / sibling.name
+        if unchanged and sibling.exists():
+            continue
+        if unchanged and previous != sibling and previous.exists():
+            link_or_copy(previous, sibling)
+            continue
+        feed, finish = make()
+        sibling.write_bytes(feed(data) + finish())
+
+def write_output(name, text, count, out_dir=None):
+    """Write one output file into out_dir (default DATA_DIR); returns the log line.
+
+    Sync outputs (OUTPUT_FILES) also get their .gz/.br siblings for the server.
+    count is logged as the file's records; None logs its size in bytes instead.
+    """
+    filepath = (out_dir or DATA_DIR) / name
+    written = write_if_changed(filepath, text)
+    data = text.encode('utf-8')
+    if name in OUTPUT_FILES:
+        write_compressed(filepath, data, unchanged=not written)
+    size = f'{len(data)} bytes' if count is None else f'{count} records'
+    if written:
+        return f"[SUCCESS] Saved {name} ({size})"
+    return f"[SKIP] {name} unchanged ({size})"
+
+def save_json(filename, data, compact=False, out_dir=None, pretty=None, count=None):
+    """Save data as JSON: minified, indented with pretty (default PRETTY_JSON) unless
+    compact=True (machine-only files).
+    out_dir defaults to DATA_DIR; sync outputs go to a generation (see new_generation).
+    count: records logged for a dict payload (a list logs its length); without one the size is logged."""
+    try:
+        (out_dir or DATA_DIR).mkdir(parents=True, exist_ok=True)
+        if count is None and isinstance(data, list):
+            count = len(data)
+        print(write_output(filename, json_text(data, compact, pretty), count, out_dir))
+        return True
+    except Exception as e:
+        print(f"[ERROR] Failed to save {filename}: {str(e)}")
+        return False
+
+def save_pitches(pitches, text=None, out_dir=None):
+    """Save a pitch table as pitches.json and pitches.columnar.json (see encode_columnar).
+    text: the pitches.json text, when pitches_json() already ran."""
+    try:
+        (out_dir or DATA_DIR).mkdir(parents=True, exist_ok=True)
+        outputs = [('pitches.json', pitches_json(pitches)[0] if text is None else text),
+                   ('pitches.columnar.json', json_text(encode_columnar(pitches), compact=True))]
+        for name, text in outputs:
+            print(write_output(name, text, pitches['count'], out_dir))
+        return True
+    except Exception as e:
+        print(f"[ERROR] Failed to save pitches.json: {str(e)}")
+        return False
+
+
+# ═══════════════════════════════════════════════════════════════
+# Generations - each sync writes a complete directory, then flips current.json
+# ═══════════════════════════════════════════════════════════════
+GENERATIONS_DIR     = 'generations'     # under DATA_DIR
+GENERATION_MANIFEST = 'manifest.json'
+CURRENT_FILE        = 'current.json'    # {generation, path, publishedAt}
+KEEP_GENERATIONS    = 5
+
+def current_generation():
+    """The published pointer, or None while outputs still live directly in DATA_DIR."""
+    try:
+        with open(DATA_DIR / CURRENT_FILE, 'r', encoding='utf-8') as f:
+            pointer = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return pointer if isinstance(pointer, dict) and pointer.get('generation') else None
+
+def output_dir():
+    """Directory holding the outputs the server reads right now."""
+    pointer = current_generation()
+    return DATA_DIR / GENERATIONS_DIR / pointer['generation'] if pointer else DATA_DIR
+
+def list_generations():
+    """Published (manifest-complete) generation ids, oldest first."""
+    root = DATA_DIR / GENERATIONS_DIR
+    if not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if (p / GENERATION_MANIFEST).exists())
+
+def new_generation():
+    """Create the directory for the next generation. It stays invisible to the server until published."""
+    from datetime import datetime
+    root = DATA_DIR / GENERATIONS_DIR
+    root.mkdir(parents=True, exist_ok=True)
+    gen_dir = root / datetime.now().strftime('%Y%m%dT%H%M%S%f')
+    gen_dir.mkdir()
+    return gen_dir
+
+def discard_generation(gen_dir):
+    shutil.rmtree(gen_dir, ignore_errors=True)
+    print(f"[WARN] Discarded unpublished generation {gen_dir.name}")
+
+def link_or_copy(src, dst):
+    """Hard-link an unchanged output into a new generation; copy where links are unsupported."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def write_json_atomic(path, data):
+    """Replace path in one rename, so readers see the old or the new file, never a partial one."""
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def point_to(generation):
+    pointer = {'generation': generation, 'path': f'{GENERATIONS_DIR}/{generation}',
+               'publishedAt': pd.Timestamp.now().isoformat()}
+    write_json_atomic(DATA_DIR / CURRENT_FILE, pointer)
+    return pointer
+
+def publish_generation(gen_dir, records, keep=None):
+    """Write gen_dir's manifest, flip current.json to it and prune old generations.
+
+    records maps each output filename in gen_dir to its record count; the manifest
+    adds the sha256 and size of every file. Returns the generation id, or None
+    when it could not be published (current.json is then left as it was).
+    """
+    try:
+        files = {}
+        for name, count in records.items():
+            # Precompressed siblings are listed, and verified on rollback, along with their file
+            siblings = [name + suffix for suffix in serializer.COMPRESSORS if (gen_dir / (name + suffix)).exists()]
+            for entry in [name] + siblings:
+                path = gen_dir / entry
+                files[entry] = {'sha256': file_sha256(path), 'bytes': path.stat().st_size, 'records': count}
+        manifest = {'generation': gen_dir.name, 'createdAt': pd.Timestamp.now().isoformat(), 'files': files}
+        write_json_atomic(gen_dir / GENERATION_MANIFEST, manifest)
+        point_to(gen_dir.name)
+        print(f"[SUCCESS] Published generation {gen_dir.name} ({len(files)} files)")
+    except Exception as e:
+        print(f"[ERROR] Failed to publish generation {gen_dir.name}: {str(e)}")
+        return None
+    prune_generations(keep)
+    return gen_dir.name
+
+def prune_generations(keep=None):
+    """Keep the newest `keep` published generations (SYNC_KEEP_GENERATIONS, default 5) and the current one."""
+    if keep is None:
+        keep = int(os.getenv('SYNC_KEEP_GENERATIONS') or KEEP_GENERATIONS)
+    current = (current_generation() or {}).get('generation')
+    generations = list_generations()
+    for generation in generations[:-keep] if keep > 0 else generations:
+        if generation != current:
+            shutil.rmtree(DATA_DIR / GENERATIONS_DIR / generation, ignore_errors=True)
+            print(f"[OK] Pruned generation {generation}")
+
+def verify_generation(generation):
+    """Check every file of a generation against its manifest. Returns a list of problems."""
+    gen_dir = DATA_DIR / GENERATIONS_DIR / generation
+    try:
+        with open(gen_dir / GENERATION_MANIFEST, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return [f'{GENERATION_MANIFEST} missing or unreadable']
+    problems = []
+    for name, entry in manifest['files'].items():
+        path = gen_dir / name
+        if not path.exists():
+            problems.append(f'{name} missing')
+        elif path.stat().st_size != entry['bytes'] or file_sha256(path) != entry['sha256']:
+            problems.append(f'{name} does not match its checksum')
+    return problems
+
+def rollback(generation=None):
+    """Point current.json back at a kept generation (default: the one before the current).
+
+    The row manifest and dataset cache describe the newer outputs, so they are
+    removed and the next sync rebuilds from scratch.
+    """
+    generations = list_generations()
+    current = (current_generation() or {}).get('generation')
+    if generation is None:
+        older = [g for g in generations if current is None or g < current]
+        generation = older[-1] if older else None
+    if generation is None or generation not in generations:
+        print(f"[ERROR] No generation to roll back to (kept: {', '.join(generations) or 'none'})")
+        return False
+    problems = verify_generation(generation)
+    if problems:
+        print(f"[ERROR] Generation {generation} failed verification: {'; '.join(problems)}")
+        return False
+    point_to(generation)
+    for stale in (RAW_DIR / MANIFEST_FILE, RAW_DIR / DATASET_CACHE_FILE):
+        if stale.exists():
+            stale.unlink()
+    print(f"[SUCCESS] Rolled back to generation {generation} (was {current or 'none'})")
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════
+# Row fingerprints - kept next to the raw CSV, skip a sync whose rows are unchanged
+# ═══════════════════════════════════════════════════════════════
+MANIFEST_FILE = 'kaggle_manifest.json'
+
+def row_keys(seasons, eps, pitches):
+    """season-episode-pitch key per row, with #n on repeats."""
+    keys = pd.Series(['-'.join('' if v is None else str(v) for v in k) for k in zip(seasons, eps, pitches)], dtype=object)
+    repeat = keys.groupby(keys, sort=False).cumcount().to_numpy()
+    return [k if r == 0 else f'{k}#{r}' for k, r in zip(keys.tolist(), repeat.tolist())]
+
+def fingerprint_rows(df):
+    """Return (keys, hashes) per row. Keys are season-episode-pitch, with #n on repeats.
+
+    Unnamed pitches are named after their position, so their position is hashed too.
+    """
+    df = df.reset_index(drop=True)
+    keys = row_keys(col_int(df, 'season', 1), col_int(df, 'ep'), col_int(df, 'pitch'))
+
+    unnamed = col_str(df, 'name') == ''
+    # Int fields hashed as float64: the same row hashes alike whatever Int width its frame got
+    ints = {name: col_float(df, name) for name in df.columns if pd.api.types.is_integer_dtype(df[name])}
+    salted = df.assign(**ints, _unnamed_pos=np.where(unnamed, np.arange(len(df)), -1))
+    hashes = [format(h, '016x') for h in pd.util.hash_pandas_object(salted, index=False).tolist()]
+    return keys, hashes
+
+def load_manifest():
+    try:
+        with open(RAW_DIR / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_manifest(df, keys, hashes):
     try:
-        data_dir = Path(__file__).parent.parent / 'src' / 'data'
-        data_dir.mkdir(parents=True, exist_ok=True)
-        filepath = data_dir / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"[SUCCESS] Saved {filename} ({len(data)} records)")
+        RAW_DIR.mkdir(parents=True, exist_ok=True)
+        manifest = {'columns': [str(c) for c in df.columns], 'keys': keys, 'hashes': hashes}
+        with open(RAW_DIR / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
         return True
+    except Exception as e:
+        print(f"[ERROR] Failed to save {MANIFEST_FILE}: {str(e)}")
+        return False
+
+def diff_fingerprints(manifest, df, keys, hashes):
+    """Compare against the last manifest. Returns None when there is nothing usable to compare against."""
+    if not manifest or manifest.get('columns') != [str(c) for c in df.columns]:
+        return None
+    if not all((output_dir() / name).exists() for name in OUTPUT_FILES):
+        return None
+    old = dict(zip(manifest['keys'], manifest['hashes']))
+    new = dict(zip(keys, hashes))
+    return {
+        'inserted': [k for k in keys if k not in old],
+        'updated':  [k for k in keys if k in old and old[k] != new[k]],
+        'deleted':  [k for k in manifest['keys'] if k not in new],
+    }
+
+
+
+# ═══════════════════════════════════════════════════════════════
+# Streaming sync - chunked CSV in, every output out, bounded memory
+# ═══════════════════════════════════════════════════════════════
+def read_csv_chunks(csv_path, chunksize):
+    """Iterate the raw CSV chunksize rows at a time, reading only the schema's columns."""
+    return pd.read_csv(csv_path, chunksize=chunksize, **read_options())
+
+def chunk_rollups(norm, pitches, offset, seq_offset):
+    """Mergeable partials of one chunk for every output built from the whole dataset.
+
+    offset is the chunk's first pitch position, seq_offset its first investment's.
+    """
+    frame, investments = norm
+    return {
+        'sharks': investor_rollup(frame, investments, seq_offset),
+        'seasons': season_rollup(frame),
+        'industries': industry_rollup(frame),
+        'facets': facet_rollup(pitches, offset),
+        'search': search_rollup(pitches, offset),
+        'cube': cube_rollup(pitches),
+        'network': network_rollup(frame, investments),
+        'timeseries': timeseries_rollup(frame, investments),
+        'lookup': {field: pitch_column(pitches, field) for field in LOOKUP_FIELDS},
+    }
+
+def merge_rollups(a, b):
+    if a is None:
+        return b
+    for field, values in b['lookup'].items():
+        a['lookup'][field].extend(values)
+    return {
+        'sharks': merge_investor_rollups(a['sharks'], b['sharks']),
+        'seasons': merge_season_rollups(a['seasons'], b['seasons']),
+        'industries': merge_industry_rollups(a['industries'], b['industries']),
+        'facets': merge_facet_rollups(a['facets'], b['facets']),
+        'search': merge_search_rollups(a['search'], b['search']),
+        'cube': merge_cube_rollups(a['cube'], b['cube']),
+        'network': merge_network_rollups(a['network'], b['network']),
+        'timeseries': merge_timeseries_rollups(a['timeseries'], b['timeseries']),
+        'lookup': a['lookup'],
+    }
+
+def spill_columns(pitches, state):
+    """Encode one chunk's columns (see encode_columns) and append each to its file in
+    state['dir'], as JSON array items without the brackets."""
+    if not pitches['count']:
+        return
+    columns, state['encodings'] = encode_columns(pitches, state['codes'])
+    state['fields'] = list(columns)
+    for i, values in enumerate(columns.values()):
+        with open(state['dir'] / f'{i}.json', 'ab') as f:
+            f.write((b',' if state['count'] else b'') + serializer.dumpb(values)[1:-1])
+    state['count'] += pitches['count']
+
+def columnar_parts(state):
+    """pitches.columnar.json as encode_columnar() lays it out, from the spilled columns."""
+    header = serializer.dumpb({
+        'format': COLUMNAR_FORMAT, 'version': COLUMNAR_VERSION, 'count': state['count'],
+        'fields': state['fields'], 'encodings': state['encodings'],
+        'dictionaries': {name: list(values) for name, values in state['codes'].items()}, 'columns': {},
+    })
+    yield header[:-2]    # up to '"columns":{'
+    for i, field in enumerate(state['fields']):
+        yield (b',' if i else b'') + serializer.dumpb(field) + b':['
+        with open(state['dir'] / f'{i}.json', 'rb') as f:
+            yield from iter(lambda: f.read(1 << 20), b'')
+        yield b']'
+    yield b'}}'
+
+def stream_pitches(chunks, totals, spill_dir):
+    """Yield pitch records chunk by chunk.
+
+    Each chunk is coerced and normalized once; its partials for every other output
+    (see chunk_rollups) are merged into totals['rollups'], its encoded columns spilled
+    to spill_dir (totals['columnar'], see spill_columns), its coercion report merged
+    into totals['coercion'], its unregistered investors into totals['unresolved'], its
+    validation report into totals['validation'], and totals['rows'] counts the rows
+    seen, so the other outputs can be built once the generator is exhausted.
+    totals['ids'] keeps pitch IDs unique across chunks.
+    """
+    totals.update(rows=0, investments=0, rollups=None, coercion=None, unresolved={}, validation=None, ids=set(),
+                  columnar={'dir': spill_dir, 'codes': {name: {} for name in COLUMNAR_DICT_FIELDS + ['sharks']},
+                            'fields': [], 'encodings': {}, 'count': 0})
+    for raw in chunks:
+        chunk, report = coerce_frame(raw)
+        totals['coercion'] = merge_reports(totals['coercion'], report)
+        norm = normalize_frame(chunk)
+        for name, count in unresolved_investors(norm[1]).items():
+            totals['unresolved'][name] = totals['unresolved'].get(name, 0) + count
+        totals['validation'] = merge_validation(totals['validation'], validate_frame(chunk, norm[1]))
+        row_numbers = np.arange(totals['rows'] + 1, totals['rows'] + len(chunk) + 1)
+        pitches = process_pitches(chunk, norm, row_numbers, totals['ids'])
+        totals['rollups'] = merge_rollups(totals['rollups'], chunk_rollups(norm, pitches, totals['rows'], totals['investments']))
+        spill_columns(pitches, totals['columnar'])
+        totals['rows'] += len(chunk)
+        totals['investments'] += len(norm[1])
+        yield from iter_pitch_records(pitches)
+
+def write_stream(filename, parts, out_dir=None):
+    """Write an iterable of byte strings to out_dir (default DATA_DIR) / filename.
+
+    Goes through a temp file, compressing the .gz/.br siblings in the same pass; an
+    unchanged result leaves the old files untouched (or links the published ones
+    into a new generation). Returns True if the file was written, False if it was
+    unchanged; on failure the temp files are removed and the error raised.
+    """
+    path = (out_dir or DATA_DIR) / filename
+    previous = output_dir() / filename
+    tmp = path.with_name(path.name + '.tmp')
+    siblings = {suffix: (path.with_name(path.name + suffix + '.tmp'), make())
+                for suffix, make in serializer.COMPRESSORS.items()}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with contextlib.ExitStack() as files:
+            f = files.enter_context(open(tmp, 'wb'))
+            compressed = [(files.enter_context(open(sibling_tmp, 'wb')), feed, finish)
+                          for sibling_tmp, (feed, finish) in siblings.values()]
+            for data in parts:
+                f.write(data)
+                digest.update(data)
+                for out, feed, _ in compressed:
+                    out.write(feed(data))
+            for out, _, finish in compressed:
+                out.write(finish())
+        unchanged = True
+        if path.exists() and file_sha256(path) == digest.hexdigest():
+            tmp.unlink()
+        elif previous != path and previous.exists() and file_sha256(previous) == digest.hexdigest():
+            tmp.unlink()
+            link_or_copy(previous, path)
+        else:
+            os.replace(tmp, path)
+            unchanged = False
+        for suffix, (sibling_tmp, _) in siblings.items():
+            sibling = path.with_name(path.name + suffix)
+            previous_sibling = output_dir() / sibling.name
+            if unchanged and sibling.exists():
+                sibling_tmp.unlink()
+            elif unchanged and previous_sibling != sibling and previous_sibling.exists():
+                sibling_tmp.unlink()
+                link_or_copy(previous_sibling, sibling)
+            else:
+                os.replace(sibling_tmp, sibling)
+        return not unchanged
+    except Exception:
+        for sibling_tmp, _ in siblings.values():
+            if sibling_tmp.exists():
+                sibling_tmp.unlink()
+        if tmp.exists():
+            tmp.unlink()
+        raise
+
+def save_json_stream(filename, records, out_dir=None, lengths=None):
+    """Write an iterable of records one at a time, byte-identical to save_json(filename, list(records)).
+
+    lengths: a list to append each record's byte length to (see build_pitch_lookup).
+    Returns the number of records written, or None on failure.
+    """
+    count = 0
+
+    def parts():
+        nonlocal count
+        head, sep = (b'[\n  ', b',\n  ') if PRETTY_JSON else (b'[', b',')
+        for record in records:
+            data = serializer.dumpb(record, indent=True).replace(b'\n', b'\n  ') if PRETTY_JSON \
+                else serializer.dumpb(record)
+            if lengths is not None:
+                lengths.append(len(data))
+            yield (sep if count else head) + data
+            count += 1
+        yield (b'\n]' if PRETTY_JSON else b']') if count else b'[]'
+
+    try:
+        written = write_stream(filename, parts(), out_dir)
     except Exception as e:
         print(f"[ERROR] Failed to save {filename}: {str(e)}")
+        return None
+    print(f"[SUCCESS] Saved {filename} ({count} records)" if written else f"[SKIP] {filename} unchanged ({count} records)")
+    return count
+
+def save_columnar_stream(state, out_dir=None):
+    """Write pitches.columnar.json from the columns spill_columns() spilled. Returns True on success."""
+    try:
+        written = write_stream('pitches.columnar.json', columnar_parts(state), out_dir)
+    except Exception as e:
+        print(f"[ERROR] Failed to save pitches.columnar.json: {str(e)}")
         return False
+    count = state['count']
+    print(f"[SUCCESS] Saved pitches.columnar.json ({count} records)" if written
+          else f"[SKIP] pitches.columnar.json unchanged ({count} records)")
+    return True
+
+def stream_sync(chunks, out_dir=None):
+    """Streaming counterpart of serial_sync: the same files, from one pass over the chunks.
+
+    pitches.json and the columnar file's columns are written as the chunks arrive;
+    every other output is built from partials merged across chunks (see chunk_rollups),
+    so memory follows the size of the outputs rather than of the CSV.
+    Returns (all_success, records_imported, records per output file, coercion report,
+    unresolved investors, validation report). The row manifest is not built: it is
+    removed so the next regular sync rewrites every output.
+    """
+    totals, lengths = {}, []
+    (out_dir or DATA_DIR).mkdir(parents=True, exist_ok=True)
+    spill_dir = Path(tempfile.mkdtemp(prefix='.columnar-', dir=out_dir or DATA_DIR))
+    try:
+        # Parse, coercion, transforms and the pitches.json write all happen per chunk
+        with stage('stream') as m:
+            count = save_json_stream('pitches.json', stream_pitches(chunks, totals, spill_dir), out_dir, lengths)
+            m['rows'] = totals.get('rows')
+        if count is None:
+            return False, {}, {}, totals.get('coercion'), totals.get('unresolved', {}), totals.get('validation')
+        print(f"[OK] Streamed {totals['rows']} rows")
+
+        rollups = totals['rollups']
+        with stage('aggregate', rows=totals['rows']):
+            sharks     = process_sharks(None, rollup=rollups['sharks'])
+            seasons    = process_seasons(None, rollup=rollups['seasons'])
+            industries = process_industries(None, rollup=rollups['industries'])
+        with stage('timeseries', rows=totals['rows']):
+            timeseries = build_timeseries(None, None, rollup=rollups['timeseries'])
+        with stage('indexes', rows=count):
+            facets = build_facet_index(None, rollup=rollups['facets'])
+            search = build_search_index(None, rollup=rollups['search'])
+            cube   = build_cube(None, rollup=rollups['cube'])
+        with stage('network', rows=totals['rows']):
+            network = build_network(None, None, rollup=rollups['network'])
+
+        all_success = True
+        with stage('write', rows=count) as m:
+            lookup = build_pitch_lookup(pitch_table(rollups['lookup'], count), lengths=np.array(lengths, dtype=np.int64))
+            if not save_columnar_stream(totals['columnar'], out_dir): all_success = False
+            results = {'sharks': sharks, 'seasons': seasons, 'industries': industries, 'facets': facets,
+                       'search': search, 'lookup': lookup, 'cube': cube, 'network': network, 'timeseries': timeseries}
+            outputs = derived_outputs(count, results)
+            for name, data, compact, records in outputs:
+                if not save_json(name, data, compact=compact, out_dir=out_dir, count=records): all_success = False
+            m['outputBytes'] = dir_bytes(out_dir or DATA_DIR)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+    if (RAW_DIR / MANIFEST_FILE).exists():
+        (RAW_DIR / MANIFEST_FILE).unlink()
+        print(f"[OK] Removed {MANIFEST_FILE} (not built by a streaming sync)")
+
+    records = {'pitches.json': count, 'pitches.columnar.json': count}
+    records.update({name: len(data) if n is None else n for name, data, _, n in outputs})
+    imported = {'pitches': count, 'sharks': len(sharks), 'seasons': len(seasons), 'industries': len(industries)}
+    return all_success, imported, records, totals['coercion'], totals['unresolved'], totals['validation']
+
+
+# ═══════════════════════════════════════════════════════════════
+# Serial sync - the stage sequence of main() and benchmark_sync.py
+# ═══════════════════════════════════════════════════════════════
+def normalize_and_validate(df, keys=None):
+    """normalize and validate stages. Returns (norm, unresolved investors, validation report)."""
+    with stage('normalize', rows=len(df)):
+        norm = normalize_frame(df)
+        unresolved = unresolved_investors(norm[1])
+    with stage('validate', rows=len(df)):
+        report = validate_frame(df, norm[1], keys)
+    return norm, unresolved, report
+
+def derived_outputs(count, results):
+    """(filename, data, compact, records) of every output besides pitches.json and the columnar
+    file; count is the number of pitches, records None for a list (save_json logs its length)."""
+    return [('pitches.facets.json', results['facets'], True, count),
+            ('pitches.search.json', results['search'], True, count),
+            ('pitches.lookup.json', results['lookup'], True, count),
+            ('sharks.json', results['sharks'], False, None),
+            ('seasons.json', results['seasons'], False, None),
+            ('industries.json', results['industries'], False, None),
+            ('analytics.cube.json', results['cube'], True, count),
+            ('analytics.network.json', results['network'], True, len(results['network']['pairs'])),
+            ('analytics.timeseries.json', results['timeseries'], True, len(results['timeseries']['episodes']))]
+
+def serial_sync(df, norm, out_dir=None):
+    """Serial counterpart of parallel_sync: every transform, then every write into out_dir, one stage each.
+
+    Returns (results, errors) like parallel_sync; a failed write is in errors, its [ERROR] already printed.
+    """
+    with stage('pitches', rows=len(df)):
+        pitches = process_pitches(df, norm)
+    with stage('aggregate', rows=len(df)):
+        sharks     = process_sharks(df, norm)
+        seasons    = process_seasons(df, norm)
+        industries = process_industries(df, norm)
+    with stage('timeseries', rows=len(df)):
+        timeseries = build_timeseries(*norm)
+    with stage('indexes', rows=pitches['count']):
+        facets, search, cube = build_facet_index(pitches), build_search_index(pitches), build_cube(pitches)
+    with stage('network', rows=len(df)):
+        network = build_network(*norm)
+
+    errors = {}
+    with stage('write', rows=pitches['count']) as m:
+        # pitches.json is serialized once, for the file and the lookup's record lengths
+        text, lengths = pitches_json(pitches)
+        lookup = build_pitch_lookup(pitches, lengths=lengths)
+        if not save_pitches(pitches, text, out_dir=out_dir):
+            errors['pitches.json'] = 'write failed'
+        outputs = derived_outputs(pitches['count'], {
+            'sharks': sharks, 'seasons': seasons, 'industries': industries, 'facets': facets, 'search': search,
+            'lookup': lookup, 'cube': cube, 'network': network, 'timeseries': timeseries})
+        for name, data, compact, count in outputs:
+            if not save_json(name, data, compact=compact, out_dir=out_dir, count=count):
+                errors[name] = 'write failed'
+        m['outputBytes'] = dir_bytes(out_dir or DATA_DIR)
+    results = {'pitches': pitches, 'sharks': sharks, 'seasons': seasons, 'industries': industries,
+               'network': network, 'timeseries': timeseries}
+    return results, errors
+
+
+# ═══════════════════════════════════════════════════════════════
+# Parallel sync - transforms and rendering in processes, writes in threads
+# ═══════════════════════════════════════════════════════════════
+# pitches.json and every file derived from it: (filename, builder, compact)
+PITCH_OUTPUTS = [
+    ('pitches.json', None, False),
+    ('pitches.columnar.json', encode_columnar, True),
+    ('pitches.facets.json', build_facet_index, True),
+    ('pitches.search.json', build_search_index, True),
+    ('pitches.lookup.json', build_pitch_lookup, True),
+    ('analytics.cube.json', build_cube, True),
+]
+STAGE_SHARED = ()
+POOL_START_METHOD = None   # set by the worker, see start_pool_server
+
+def resolve_workers(workers):
+    """--workers / SYNC_WORKERS -> worker count; 0 means one per CPU, default 1 (serial)."""
+    if workers is None:
+        workers = int(os.getenv('SYNC_WORKERS') or 1)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+def pool_start_method():
+    """Start method of the stage pools: 'fork' where it exists, so workers share the inputs.
+
+    A worker job runs with its output-reader thread alive, and a process forked
+    while another thread holds a lock (I/O, logging) can deadlock, so the worker
+    sets another one (see start_pool_server).
+    """
+    if POOL_START_METHOD is not None:
+        return POOL_START_METHOD
+    return 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+
+def call_stage(fn, args):
+    """Pool entry point: returns (result, captured stdout) so logs print in stage order."""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = fn(*STAGE_SHARED, *args)
+    return result, log.getvalue()
+
+def run_stages(stages, shared, workers):
+    """Run {name: (fn, args)} as fn(*shared, *args) in a process pool.
+
+    With the 'fork' start method (see pool_start_method), workers inherit shared from
+    this process instead of unpickling a copy each. Returns ({name: result}, {name: error}).
+    """
+    global STAGE_SHARED
+    method = pool_start_method()
+    fork = method == 'fork'
+    STAGE_SHARED = shared if fork else ()
+    results, errors = {}, {}
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(stages)),
+                                 mp_context=multiprocessing.get_context(method) if method else None) as pool:
+            futures = {name: pool.submit(call_stage, fn, args if fork else tuple(shared) + args)
+                       for name, (fn, args) in stages.items()}
+            for name, future in futures.items():
+                try:
+                    results[name], log = future.result()
+                    print(log, end='')
+                except Exception as e:
+                    errors[name] = f'{type(e).__name__}: {e}'
+                    print(f"[ERROR] Stage {name} failed: {errors[name]}")
+    finally:
+        STAGE_SHARED = ()
+    return results, errors
+
+def render_output(pitches, builder, compact, pretty):
+    global PRETTY_JSON
+    PRETTY_JSON = pretty    # pool workers without fork do not see the parent's setting
+    return json_text(builder(pitches), compact) if builder else pitches_json(pitches)[0]
+
+def write_outputs(texts, counts, workers, out_dir=None):
+    """Write {filename: text} into out_dir from a thread pool. Returns {filename: error}."""
+    (out_dir or DATA_DIR).mkdir(parents=True, exist_ok=True)
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(write_output, name, text, counts[name], out_dir) for name, text in texts.items()}
+        for name, future in futures.items():
+            try:
+                print(future.result())
+            except Exception as e:
+                errors[name] = f'{type(e).__name__}: {e}'
+                print(f"[ERROR] Failed to save {name}: {errors[name]}")
+    return errors
+
+def parallel_sync(df, norm, workers, out_dir=None):
+    """Parallel counterpart of serial_sync.
+
+    The transforms, the network and the time series run in a process pool, the
+    JSON texts are rendered in a second pool that shares the finished pitches, and the files are written into out_dir from a
+    thread pool.
+    Returns (results, errors): results holds pitches/sharks/seasons/industries/network/timeseries
+    for the stages that succeeded, errors maps a stage or file to its message.
+    """
+    stages = {'pitches': (process_pitches, ()), 'sharks': (process_sharks, ()), 'seasons': (process_seasons, ()),
+              'industries': (process_industries, ()), 'network': (process_network, ()),
+              'timeseries': (process_timeseries, ())}
+    results, errors = run_stages(stages, (df, norm), workers)
+
+    texts, counts = {}, {}
+    for name in ('sharks', 'seasons', 'industries'):
+        if name in results:
+            texts[f'{name}.json'], counts[f'{name}.json'] = json_text(results[name]), len(results[name])
+    if 'network' in results:
+        texts['analytics.network.json'] = json_text(results['network'], compact=True)
+        counts['analytics.network.json'] = len(results['network']['pairs'])
+    if 'timeseries' in results:
+        texts['analytics.timeseries.json'] = json_text(results['timeseries'], compact=True)
+        counts['analytics.timeseries.json'] = len(results['timeseries']['episodes'])
+    if 'pitches' in results:
+        rendered, render_errors = run_stages(
+            {name: (render_output, (builder, compact, PRETTY_JSON)) for name, builder, compact in PITCH_OUTPUTS},
+            (results['pitches'],), workers)
+        errors.update(render_errors)
+        texts.update(rendered)
+        counts.update({name: results['pitches']['count'] for name in rendered})
+    errors.update(write_outputs(texts, counts, workers, out_dir))
+    return results, errors
 
 
 # ═══════════════════════════════════════════════════════════════
 # Main
 # ═══════════════════════════════════════════════════════════════
-def main():
+def log_coercion(report):
+    """Warn about absent columns and unparseable values; returns the report for sync-log.json."""
+    for column, entry in report_problems(report or {}).items():
+        if entry.get('missing'):
+            print(f"[WARN] Column '{column}' missing from the CSV")
+        else:
+            print(f"[WARN] Column '{column}': {entry['failed']} values failed to parse, e.g. {entry['samples']}")
+    return report
+
+def save_sync_log(entry, started):
+    """Attach the stage metrics to the sync-log entry and write sync-log.json (always indented)."""
+    entry['metrics'] = log_metrics(time.perf_counter() - started)
+    save_json('sync-log.json', [entry], pretty=True)
+
+def main(full=False, source=None, chunksize=None, workers=None, profile=False, pretty=None):
+    global PROFILE_DIR, PRETTY_JSON
+    started = time.perf_counter()
+    STAGE_METRICS.clear()
+    PRETTY_JSON = resolve_pretty(pretty)
+    PROFILE_DIR = RAW_DIR / 'profiles' / pd.Timestamp.now().strftime('%Y%m%dT%H%M%S') if profile else None
+
     print('=' * 60)
     print('SHARK TANK INDIA - KAGGLE DATA SYNC')
     print('=' * 60)
 
-    if not setup_kaggle_credentials():
+    if not source and not setup_kaggle_credentials():
         print('\nFAILED: Kaggle credentials not configured')
         return False
 
-    df = load_kaggle_data()
+    df, dataset = load_kaggle_data(source, full, chunksize)
+    if df is None and dataset.get('unchanged'):
+        save_sync_log({'lastSyncAt': pd.Timestamp.now().isoformat(), 'status': 'success', 'mode': 'cached',
+                       'changes': {'inserted': 0, 'updated': 0, 'deleted': 0},
+                       'dataset': {k: dataset.get(k) for k in ('source', 'version', 'sha256')}}, started)
+        print('=' * 60)
+        print('[SUCCESS] SYNC DONE: dataset unchanged, nothing downloaded or parsed')
+        return True
     if df is None:
         print('ERROR: Failed to load Kaggle data')
         return False
+    dataset_log = {k: dataset.get(k) for k in ('source', 'version', 'sha256')}
+
+    if chunksize:
+        print('\n' + '=' * 60)
+        print('STREAMING SYNC')
+        print('=' * 60)
+        with stage('raw_snapshot'):
+            save_raw_csv(dataset['path'])
+        gen_dir = new_generation()
+        all_success, imported, records, coercion, unresolved, validation = stream_sync(df, gen_dir)
+        validation, verdict = check_validation(validation)
+        if verdict:
+            all_success = False
+        with stage('publish'):
+            generation = publish_generation(gen_dir, records) if all_success else None
+        if generation is None:
+            all_success = False
+            discard_generation(gen_dir)
+        if all_success: save_dataset_cache(dataset)
+        save_sync_log({'lastSyncAt': pd.Timestamp.now().isoformat(),
+                       'status': verdict or ('success' if all_success else 'partial'),
+                       'mode': 'stream', 'generation': generation,
+                       'changes': {'inserted': imported.get('pitches', 0), 'updated': 0, 'deleted': 0},
+                       'dataset': dataset_log, 'recordsImported': imported, 'coercion': log_coercion(coercion),
+                       'investors': log_investors(unresolved), 'validation': validation}, started)
+        print('=' * 60)
+        if all_success:
+            print(f"[SUCCESS] SYNC DONE (streamed): {imported['pitches']} pitches, {imported['sharks']} sharks, "
+                  f"{imported['seasons']} seasons, {imported['industries']} industries")
+            return True
+        print('[WARN] SYNC COMPLETED WITH ERRORS')
+        return False
+
+    with stage('fingerprint', rows=len(df)):
+        keys, hashes = fingerprint_rows(df)
+        manifest = None if full else load_manifest()
+        changes = diff_fingerprints(manifest, df, keys, hashes)
+    if changes is None:
+        print('[OK] No usable manifest (or --full), rows not compared')
+    else:
+        print(f"[OK] Row changes: {len(changes['inserted'])} inserted, {len(changes['updated'])} updated, {len(changes['deleted'])} deleted")
+
+    if changes is not None and not any(changes.values()):
+        counts = {'inserted': 0, 'updated': 0, 'deleted': 0}
+        save_dataset_cache(dataset)
+        save_sync_log({'lastSyncAt': pd.Timestamp.now().isoformat(), 'status': 'success', 'mode': 'unchanged', 'changes': counts,
+                       'dataset': dataset_log, 'recordsImported': {'pitches': len(keys)},
+                       'coercion': log_coercion(dataset['coercion'])}, started)
+        print('=' * 60)
+        print(f'[SUCCESS] SYNC DONE: upstream unchanged ({len(keys)} pitches), nothing rewritten')
+        return True
 
     print('\n' + '=' * 60)
     print('SAVING RAW DATA')
     print('=' * 60)
-    save_raw_csv(df)
+    with stage('raw_snapshot'):
+        save_raw_csv(dataset['path'])
 
+    workers = resolve_workers(workers)
     print('\n' + '=' * 60)
-    print('PROCESSING AND SAVING DATA')
+    print('PROCESSING AND SAVING DATA' + (f' ({workers} workers)' if workers > 1 else ''))
     print('=' * 60)
-    all_success = True
-
-    pitches = process_pitches(df)
-    if not save_json('pitches.json', pitches): all_success = False
-
-    sharks = process_sharks(df)
-    if not save_json('sharks.json', sharks): all_success = False
+    stage_errors = {}
 
-    seasons = process_seasons(df)
-    if not save_json('seasons.json', seasons): all_success = False
+    norm, unresolved, report = normalize_and_validate(df, keys)
+    # Fail fast: an aborted sync stops here, before anything is transformed or written.
+    # Over a partial threshold the sync runs on, but its generation is not published.
+    validation, verdict = check_validation(report)
+    if verdict == 'aborted':
+        save_sync_log({'lastSyncAt': pd.Timestamp.now().isoformat(), 'status': verdict,
+                       'mode': 'full', 'generation': None,
+                       'dataset': dataset_log, 'coercion': log_coercion(dataset['coercion']),
+                       'investors': log_investors(unresolved), 'validation': validation}, started)
+        print('=' * 60)
+        print('[ERROR] SYNC ABORTED: validation thresholds exceeded, nothing published')
+        return False
+    all_success = verdict is None
+    gen_dir = new_generation()
+    if workers > 1:
+        # Transforms, rendering and writes overlap in the pools: one stage
+        with stage('parallel', rows=len(df)) as m:
+            results, stage_errors = parallel_sync(df, norm, workers, gen_dir)
+            m['outputBytes'] = dir_bytes(gen_dir)
+    else:
+        results, stage_errors = serial_sync(df, norm, gen_dir)
+    sharks, seasons, industries = (results.get(name, []) for name in ('sharks', 'seasons', 'industries'))
+    pitches = results.get('pitches', pitch_table({}, 0))
+    network = results.get('network', {})
+    timeseries = results.get('timeseries', {})
+    all_success = all_success and not stage_errors
 
-    industries = process_industries(df)
-    if not save_json('industries.json', industries): all_success = False
+    # Publish only a complete generation; a failed sync leaves the server on the previous one
+    records = {name: pitches['count'] for name, _, _ in PITCH_OUTPUTS}
+    records.update({'sharks.json': len(sharks), 'seasons.json': len(seasons), 'industries.json': len(industries),
+                    'analytics.network.json': len(network.get('pairs', [])),
+                    'analytics.timeseries.json': len(timeseries.get('episodes', []))})
+    with stage('publish'):
+        generation = publish_generation(gen_dir, records) if all_success else None
+        if generation is None:
+            all_success = False
+            discard_generation(gen_dir)
+        if all_success and not save_manifest(df, keys, hashes): all_success = False
+        if all_success: save_dataset_cache(dataset)
 
-    sync_log = [{'lastSyncAt': pd.Timestamp.now().isoformat(), 'status': 'success' if all_success else 'partial',
-                 'recordsImported': {'pitches': len(pitches), 'sharks': len(sharks), 'seasons': len(seasons), 'industries': len(industries)}}]
-    save_json('sync-log.json', sync_log)
+    counts = {name: len(rows) for name, rows in changes.items()} if changes is not None \
+        else {'inserted': len(keys), 'updated': 0, 'deleted': 0}
+    sync_log = {'lastSyncAt': pd.Timestamp.now().isoformat(), 'status': 'success' if all_success else 'partial',
+                'mode': 'full', 'generation': generation, 'changes': counts, 'dataset': dataset_log,
+                'recordsImported': {'pitches': pitches['count'], 'sharks': len(sharks), 'seasons': len(seasons), 'industries': len(industries)},
+                'coercion': log_coercion(dataset['coercion']), 'investors': log_investors(unresolved),
+                'validation': validation}
+    if stage_errors:
+        sync_log['errors'] = stage_errors
+    save_sync_log(sync_log, started)
 
     print('=' * 60)
     if all_success:
-        print(f'[SUCCESS] SYNC DONE: {len(pitches)} pitches, {len(sharks)} sharks, {len(seasons)} seasons, {len(industries)} industries')
+        print(f'[SUCCESS] SYNC DONE: {pitches["count"]} pitches, {len(sharks)} sharks, {len(seasons)} seasons, {len(industries)} industries')
         return True
     else:
         print('[WARN] SYNC COMPLETED WITH ERRORS')
         return False
 
 
+# ═══════════════════════════════════════════════════════════════
+# Rebuild - full sync from the newest raw snapshot, nothing downloaded
+# ═══════════════════════════════════════════════════════════════
+def rebuild(workers=None, profile=False, pretty=None):
+    """Re-derive every output from the newest snapshot in src/data/raw/snapshots/."""
+    try:
+        data = raw_snapshots.read_snapshot(RAW_DIR / SNAPSHOTS_DIR)
+    except (KeyError, OSError, ValueError) as e:
+        print(f"[ERROR] No usable raw snapshot to rebuild from: {str(e)}")
+        return False
+    with tempfile.TemporaryDirectory(prefix='stih-rebuild-') as tmp:
+        csv_path = Path(tmp) / raw_snapshots.LATEST_NAME
+        csv_path.write_bytes(data)
+        return main(full=True, source=csv_path, workers=workers, profile=profile, pretty=pretty)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Worker - one long-lived process serving the server's jobs
+# ═══════════════════════════════════════════════════════════════
+#   in:   {"id": 1, "command": "sync", "options": {"full": false, "workers": 2}}   one JSON object per line
+#   out:  {"event": "ready", "pid": 4242}                                          when a client connects
+#         {"id": 1, "event": "progress", "line": "[OK] Loaded 702 records, 60 columns"}
+#         {"id": 1, "event": "done", "ok": true}                                  ("error" when it raised)
+#
+# Jobs run one at a time. Modules stay imported between jobs and the last parsed
+# dataset stays in memory (KEEP_WARM), so a repeat sync of the same CSV skips the parse.
+WORKER_COMMANDS = ('test', 'sync', 'rebuild')
+
+def run_job(command, options):
+    if command == 'test':
+        return test_kaggle_connection()
+    if command == 'rebuild':
+        return rebuild(workers=options.get('workers'), profile=bool(options.get('profile')), pretty=options.get('pretty'))
+    return main(full=bool(options.get('full')), source=options.get('source'), chunksize=options.get('chunksize'),
+                workers=options.get('workers'), profile=bool(options.get('profile')), pretty=options.get('pretty'))
+
+def event_writer(out):
+    """emit(event): one JSON line to out. A client that went away is ignored, the job still finishes."""
+    def emit(event):
+        try:
+            out.write(json.dumps(event) + '\n')
+            out.flush()
+        except (OSError, ValueError):
+            pass
+    return emit
+
+def stream_output(read_fd, emit):
+    """Emit every line written to the pipe as a progress event, until all its writers close."""
+    with os.fdopen(read_fd, 'r', encoding='utf-8', errors='replace') as pipe:
+        for line in pipe:
+            emit({'event': 'progress', 'line': line.rstrip('\r\n')})
+
+def serve_job(job, emit):
+    """Run one job with fd 1 piped into progress events, so prints of pool workers are streamed too."""
+    job_id = job.get('id')
+    command = job.get('command')
+    if command not in WORKER_COMMANDS:
+        emit({'id': job_id, 'event': 'done', 'ok': False, 'error': f'Unknown command: {command}'})
+        return
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=stream_output, args=(read_fd, lambda e: emit(dict(e, id=job_id))), daemon=True)
+    reader.start()
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    os.dup2(write_fd, 1)
+    os.close(write_fd)
+    done = {'id': job_id, 'event': 'done', 'ok': False}
+    try:
+        done['ok'] = bool(run_job(command, job.get('options') or {}))
+    except Exception as e:
+        done['error'] = str(e)
+        import traceback
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+        reader.join()
+    emit(done)
+
+def serve_lines(lines, emit):
+    emit({'event': 'ready', 'pid': os.getpid()})
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError:
+            job = None
+        if not isinstance(job, dict):
+            emit({'id': None, 'event': 'done', 'ok': False, 'error': 'Unreadable job'})
+            continue
+        serve_job(job, emit)
+
+def start_pool_server():
+    """Use forkserver (spawn where there is none) for the stage pools of every job.
+
+    Jobs start their pools while serve_job's reader thread runs, and plain fork
+    there can deadlock. The fork server is started right away, between jobs: it
+    keeps the fds it starts with, and a job's output pipe held open by it would
+    never reach EOF for that job's reader.
+    """
+    global POOL_START_METHOD
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        POOL_START_METHOD = 'forkserver'
+        # Imported once in the server rather than in every pool process
+        multiprocessing.forkserver.set_forkserver_preload(['__main__', 'numpy', 'pandas'])
+        multiprocessing.forkserver.ensure_running()
+    else:
+        POOL_START_METHOD = 'spawn'
+
+def worker(socket_path=None):
+    """Serve jobs from stdin until it closes, or from clients of the Unix socket at socket_path."""
+    global KEEP_WARM
+    KEEP_WARM = True
+    sys.stdout.reconfigure(line_buffering=True)
+    if socket_path is None:
+        # Events keep a private copy of stdout; stray output between jobs goes to stderr
+        out = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+        os.dup2(2, 1)
+        start_pool_server()
+        serve_lines(sys.stdin, event_writer(out))
+        return True
+    path = Path(socket_path)
+    if path.exists():
+        path.unlink()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen(1)
+        print(f"[OK] Worker listening on {path}")
+        start_pool_server()
+        try:
+            while True:
+                conn, _ = server.accept()
+                try:
+                    with conn, conn.makefile('r', encoding='utf-8') as lines, conn.makefile('w', encoding='utf-8') as out:
+                        serve_lines(lines, event_writer(out))
+                except OSError as e:
+                    print(f"[WARN] Worker client disconnected: {str(e)}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+    return True
+
 if __name__ == '__main__':
-    if len(sys.argv) > 1 and sys.argv[1] == 'test':
+    parser = argparse.ArgumentParser(description='Fetch & transform Shark Tank India data')
+    parser.add_argument('command', nargs='?', choices=['sync', 'test', 'rollback', 'rebuild', 'worker'], default='sync',
+                        help="'test' only checks that the Kaggle API is reachable; "
+                             "'rollback [GENERATION]' serves a kept generation again (default: the previous one); "
+                             "'rebuild' re-derives every output from the newest raw snapshot; "
+                             "'worker' serves test/sync/rebuild jobs as JSON lines on stdin (or --socket)")
+    parser.add_argument('generation', nargs='?', help=argparse.SUPPRESS)
+    parser.add_argument('--full', action='store_true', help='ignore caches and manifests, rebuild everything')
+    parser.add_argument('--source', metavar='DIR|FILE', help='read a local CSV (or a directory containing one) instead of Kaggle')
+    parser.add_argument('--chunksize', metavar='ROWS', type=int,
+                        help='stream the CSV ROWS rows at a time with bounded memory (large merged datasets); '
+                             'writes pitches/sharks/seasons/industries only')
+    parser.add_argument('--workers', metavar='N', type=int,
+                        help='run the transforms and output writes in parallel with N workers (0 = one per CPU; '
+                             'default: $SYNC_WORKERS or 1, i.e. serial)')
+    parser.add_argument('--profile', action='store_true',
+                        help='run each stage under cProfile; dumps go to src/data/raw/profiles/<timestamp>/')
+    parser.add_argument('--pretty', action='store_true', default=None,
+                        help='indent pitches/sharks/seasons/industries.json for reading (default: $SYNC_PRETTY_JSON or minified)')
+    parser.add_argument('--socket', metavar='PATH', help="worker: listen on a Unix socket instead of stdin")
+    args = parser.parse_args()
+    if args.command == 'test':
         sys.exit(0 if test_kaggle_connection() else 1)
+    elif args.command == 'rollback':
+        sys.exit(0 if rollback(args.generation) else 1)
+    elif args.command == 'rebuild':
+        sys.exit(0 if rebuild(workers=args.workers, profile=args.profile, pretty=args.pretty) else 1)
+    elif args.command == 'worker':
+        sys.exit(0 if worker(args.socket) else 1)
     else:
-        sys.exit(0 if main() else 1)
+        sys.exit(0 if main(full=args.full, source=args.source, chunksize=args.chunksize, workers=args.workers,
+                           profile=args.profile, pretty=args.pretty) else 1)
@@ -0,0 +1,182 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Synthetic Kaggle Dataset - CSVs in the thirumani/shark-tank-india layout
+# For benchmarks and load tests: python scripts/generate_kaggle_data.py --rows 1000000
+# ═══════════════════════════════════════════════════════════════
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from kaggle_schema import COLUMNS, CORE_SHARKS
+
+
+INDUSTRIES = ['Food and Beverage', 'Beauty/Fashion', 'Lifestyle/Home', 'Medical/Health', 'Technology/Software',
+              'Children/Education', 'Agriculture', 'Manufacturing', 'Vehicles/Electrical Vehicles', 'Electronics',
+              'Animal/Pets', 'Business Services', 'Fitness/Sports/Outdoors', 'Entertainment', 'Green/CleanTech',
+              'Hardware', 'Liquor/Alcohol', 'Others']
+INDUSTRY_WEIGHTS = [18, 14, 10, 9, 8, 6, 5, 5, 4, 4, 3, 3, 3, 2, 2, 2, 1, 1]
+PLACES = [('Delhi', 'Delhi'), ('Mumbai', 'Maharashtra'), ('Pune', 'Maharashtra'), ('Bangalore', 'Karnataka'),
+          ('Ahmedabad', 'Gujarat'), ('Surat', 'Gujarat'), ('Hyderabad', 'Telangana'), ('Chennai', 'Tamil Nadu'),
+          ('Kolkata', 'West Bengal'), ('Jaipur', 'Rajasthan'), ('Lucknow', 'Uttar Pradesh'), ('Noida', 'Uttar Pradesh'),
+          ('Gurgaon', 'Haryana'), ('Patiala', 'Punjab'), ('Kochi', 'Kerala'), ('Indore', 'Madhya Pradesh')]
+NAME_PARTS = (['Green', 'Smart', 'Desi', 'Happy', 'Urban', 'Pure', 'Bright', 'Swift', 'Royal', 'Little', 'Bold', 'Kind'],
+              ['Leaf', 'Kart', 'Chai', 'Paws', 'Wear', 'Bites', 'Labs', 'Ride', 'Nest', 'Glow', 'Box', 'Roots'])
+DESCRIPTIONS = ['Healthy snacks', 'Sustainable fashion', 'EV charging', 'Pet food', 'Skin care', 'Ed-tech platform',
+                'Home decor', 'Organic farming', 'Fitness wearables', 'Ayurvedic wellness', 'Kids toys', 'SaaS for SMEs']
+# Guest sharks per season; a few deals name two, comma-joined (sometimes with a trailing comma, as upstream)
+GUESTS = {1: ['Ashneer Grover', 'Ghazal Alagh'], 2: ['Ashneer Grover', 'Vikas D Nahar'],
+          3: ['Azhar Iqubal', 'Radhika Gupta', 'Deepinder Goyal'], 4: ['Kunal Bahl', 'Viraj Bahl'],
+          5: ['Varun Dua', 'Ronnie Screwvala']}
+# Core sharks on the panel per season
+PANEL = {1: CORE_SHARKS[:5], 2: CORE_SHARKS[:5], 3: CORE_SHARKS, 4: CORE_SHARKS, 5: CORE_SHARKS}
+SEASON_DATES = {1: ('20-12-2021', '4-02-2022'), 2: ('2-01-2023', '10-03-2023'), 3: ('22-01-2024', '15-03-2024'),
+                4: ('6-01-2025', '7-03-2025'), 5: ('5-01-2026', '6-03-2026')}
+PITCHES_PER_EPISODE = 3
+
+
+def maybe_nan(rng, values, rate):
+    """Replace a share `rate` of values by NaN (values become float or object)."""
+    out = np.asarray(values, dtype=float if np.issubdtype(np.asarray(values).dtype, np.number) else object).copy()
+    out[rng.random(len(out)) < rate] = np.nan
+    return out
+
+def yes_or_nan(rng, n, rate):
+    """'yes' for a share `rate` of rows, NaN otherwise (the upstream encoding of those flags)."""
+    out = np.full(n, np.nan, dtype=object)
+    out[rng.random(n) < rate] = 'yes'
+    return out
+
+def generate_frame(n, rng, start=0, total=None, seasons=5):
+    """Rows start..start+n-1 of a `total`-row synthetic dataset, with exactly the Kaggle columns.
+
+    Seasons are contiguous blocks of equal size, numbered by episode and pitch like upstream.
+    """
+    total = total or start + n
+    idx = np.arange(start, start + n)
+    season = idx * seasons // total + 1
+    first = -((-(season - 1) * total) // seasons)   # first row of each row's season
+    seq = idx - first
+    episode = seq // PITCHES_PER_EPISODE + 1
+    pitch_no = seq + 1
+
+    names = (pd.Series(rng.choice(NAME_PARTS[0], n)) + ' ' + pd.Series(rng.choice(NAME_PARTS[1], n))
+             + ' ' + pd.Series(idx).astype(str)).to_numpy(dtype=object)
+    names[rng.random(n) < 0.002] = np.nan
+    place = rng.integers(0, len(PLACES), n)
+    presenters = rng.integers(1, 5, n)
+    female = rng.binomial(presenters, 0.35)
+    weights = np.array(INDUSTRY_WEIGHTS, dtype=float) / sum(INDUSTRY_WEIGHTS)
+
+    ask = rng.choice([25, 40, 50, 60, 75, 80, 100, 120, 150, 200, 250, 500], n).astype(float)
+    ask_eq = rng.choice([0.5, 1, 1.5, 2, 2.5, 3, 4, 5, 7.5, 10, 15, 20], n).astype(float)
+    offered = rng.random(n) < 0.65
+    funded = offered & (rng.random(n) < 0.75)
+    royalty = funded & (rng.random(n) < 0.08)
+    has_debt = funded & ~royalty & (rng.random(n) < 0.15)
+    deal = np.where(funded, np.round(ask * rng.uniform(0.5, 1.5, n), 2), np.nan)
+    deal_eq = np.where(funded, np.round(ask_eq * rng.uniform(1, 3, n), 2), np.nan)
+    debt = np.where(has_debt, np.round(deal * rng.uniform(0.2, 0.6, n), 2), np.nan)
+    equity_part = np.where(has_debt, deal - debt, deal)
+
+    # Panel sharks in each deal, plus an optional guest
+    guest = funded & (rng.random(n) < 0.12)
+    panel_size = np.array([len(PANEL[s]) for s in range(1, 6)])[season - 1]
+    in_deal = np.zeros((n, len(CORE_SHARKS)), dtype=bool)
+    picks = rng.random((n, len(CORE_SHARKS)))
+    for j in range(len(CORE_SHARKS)):
+        in_deal[:, j] = funded & (j < panel_size) & (picks[:, j] < 0.35)
+    lone = funded & ~guest & ~in_deal.any(axis=1)
+    in_deal[lone, rng.integers(0, 5, lone.sum())] = True
+    num_sharks = in_deal.sum(axis=1) + guest
+    share = np.where(num_sharks > 0, 1 / np.maximum(num_sharks, 1), 0)
+
+    frame = {
+        'Season Number': season,
+        'Startup Name': names,
+        'Episode Number': episode,
+        'Pitch Number': pitch_no,
+        'Season Start': np.array([SEASON_DATES[s][0] for s in range(1, 6)], dtype=object)[season - 1],
+        'Season End': np.array([SEASON_DATES[s][1] for s in range(1, 6)], dtype=object)[season - 1],
+        'Industry': maybe_nan(rng, rng.choice(INDUSTRIES, n, p=weights), 0.01),
+        'Business Description': rng.choice(DESCRIPTIONS, n),
+        'Company Website': maybe_nan(rng, ('https://www.' + pd.Series(names).fillna('startup').str.lower()
+                                           .str.replace(' ', '', regex=False) + '.com').to_numpy(dtype=object), 0.25),
+        'Started in': maybe_nan(rng, rng.integers(2010, 2025, n), 0.2),
+        'Number of Presenters': presenters,
+        'Male Presenters': maybe_nan(rng, presenters - female, 0.05),
+        'Female Presenters': maybe_nan(rng, female, 0.05),
+        'Couple Presenters': maybe_nan(rng, ((presenters == 2) & (rng.random(n) < 0.3)).astype(int), 0.3),
+        'Pitchers Average Age': maybe_nan(rng, rng.choice(['Young', 'Middle', 'Old'], n, p=[0.5, 0.4, 0.1]), 0.1),
+        'Pitchers City': maybe_nan(rng, np.array([p[0] for p in PLACES], dtype=object)[place], 0.05),
+        'Pitchers State': maybe_nan(rng, np.array([p[1] for p in PLACES], dtype=object)[place], 0.05),
+        'Yearly Revenue': maybe_nan(rng, np.round(rng.lognormal(5, 1.2, n), 1), 0.4),
+        'Gross Margin': maybe_nan(rng, rng.integers(10, 90, n), 0.6),
+        'EBITDA': maybe_nan(rng, rng.integers(-30, 40, n), 0.7),
+        'Cash Burn': yes_or_nan(rng, n, 0.3),
+        'SKUs': maybe_nan(rng, rng.integers(1, 300, n), 0.6),
+        'Has Patents': maybe_nan(rng, (rng.random(n) < 0.1).astype(int), 0.5),
+        'Bootstrapped': yes_or_nan(rng, n, 0.4),
+        'Original Ask Amount': ask,
+        'Original Offered Equity': ask_eq,
+        'Valuation Requested': np.round(ask / ask_eq * 100, 2),
+        'Received Offer': offered.astype(int),
+        'Accepted Offer': np.where(offered, funded.astype(float), np.nan),
+        'Total Deal Amount': deal,
+        'Total Deal Equity': np.where(royalty, np.nan, deal_eq),
+        'Total Deal Debt': debt,
+        'Debt Interest': np.where(has_debt, rng.choice([8, 10, 12], n), np.nan),
+        'Deal Valuation': np.where(funded & ~royalty, np.round(equity_part / np.maximum(deal_eq, 0.01) * 100, 2), np.nan),
+        'Number of Sharks in Deal': np.where(funded, num_sharks, np.nan),
+        'Deal Has Conditions': np.where(funded, (rng.random(n) < 0.2).astype(int), np.nan),
+        'Royalty Percentage': np.where(royalty, rng.choice([1, 2, 3, 5], n), np.nan),
+    }
+    for j, shark in enumerate(CORE_SHARKS):
+        mask = in_deal[:, j]
+        frame[f'{shark} Investment Amount'] = np.where(mask, np.round(equity_part * share, 2), np.nan)
+        frame[f'{shark} Investment Equity'] = np.where(mask & ~royalty, np.round(deal_eq * share, 2), np.nan)
+        frame[f'{shark} Debt Amount'] = np.where(mask & has_debt, np.round(debt * share, 2), np.nan)
+
+    guest_names = np.full(n, np.nan, dtype=object)
+    second_guest = np.zeros(n, dtype=bool)
+    for s, names_s in GUESTS.items():
+        rows = np.flatnonzero(guest & (season == s))
+        first = rng.choice(names_s, len(rows))
+        second = rng.choice(names_s, len(rows))
+        pair = rng.random(len(rows)) < 0.15
+        trailing = rng.random(len(rows)) < 0.1
+        guest_names[rows] = [a + (',' + b if p and b != a else '') + (',' if t else '')
+                             for a, b, p, t in zip(first, second, pair, trailing)]
+        second_guest[rows] = pair & (first != second)
+    # A guest pair splits one guest share, but each name counts as a shark in the deal
+    frame['Number of Sharks in Deal'] = frame['Number of Sharks in Deal'] + second_guest
+    frame['Guest Investment Amount'] = np.where(guest, np.round(equity_part * share, 2), np.nan)
+    frame['Guest Investment Equity'] = np.where(guest & ~royalty, np.round(deal_eq * share, 2), np.nan)
+    frame['Invested Guest Name'] = guest_names
+    return pd.DataFrame(frame, columns=list(COLUMNS))
+
+def write_csv(path, rows, seed=0, seasons=5, chunksize=200_000):
+    """Write `rows` synthetic pitches to path, chunksize rows at a time. Same seed, same bytes."""
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, max(rows, 1), chunksize):
+            frame = generate_frame(min(chunksize, rows - start), rng, start, rows, seasons)
+            frame.to_csv(f, index=False, header=start == 0)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic Shark Tank India CSV in the Kaggle layout')
+    parser.add_argument('--rows', type=int, default=1000, help='number of pitches (default 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed; the same seed gives the same file')
+    parser.add_argument('--seasons', type=int, default=5, choices=range(1, 6), metavar='1-5')
+    parser.add_argument('--out', default='synthetic/shark_tank_india.csv', help='output CSV path')
+    args = parser.parse_args()
+    path = write_csv(args.out, args.rows, args.seed, args.seasons)
+    print(f"[SUCCESS] Wrote {args.rows} rows to {path} ({path.stat().st_size} bytes)")
+    sys.exit(0)
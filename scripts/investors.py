@@ -0,0 +1,83 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Investor Registry - one canonical ID per shark and guest investor
+# Used by fetch_kaggle_data.py to resolve the names in the CSV
+# ═══════════════════════════════════════════════════════════════
+#
+# Every spelling the CSV uses for an investor ('Ashneer', 'Ashneer Grover',
+# 'ashneer  grover') resolves to the same ID through ALIAS_INDEX, a dict built
+# once from the registry. Names not in the registry get an ID of their own,
+# derived from the name, and are reported so they can be added here.
+
+import re
+
+from kaggle_schema import CORE_SHARKS, lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+# name: how the investor appears in the JSON; aliases: other spellings in the CSV.
+# The remaining fields are the shark profile (shark_record() has defaults for guests).
+INVESTORS = {
+    'namita-thapar':    {'name': 'Namita',  'full': 'Namita Thapar',  'title': 'Executive Director, Emcure Pharma', 'emoji': '💊', 'color': '#8B5CF6'},
+    'vineeta-singh':    {'name': 'Vineeta', 'full': 'Vineeta Singh',  'title': 'CEO & Co-founder, SUGAR Cosmetics', 'emoji': '💄', 'color': '#EC4899'},
+    'anupam-mittal':    {'name': 'Anupam',  'full': 'Anupam Mittal',  'title': 'Founder & CEO, Shaadi.com',         'emoji': '💍', 'color': '#3B82F6'},
+    'aman-gupta':       {'name': 'Aman',    'full': 'Aman Gupta',     'title': 'Co-founder & CMO, boAt',            'emoji': '🎧', 'color': '#F97316'},
+    'peyush-bansal':    {'name': 'Peyush',  'full': 'Peyush Bansal',  'title': 'Co-founder & CEO, Lenskart',        'emoji': '👓', 'color': '#10B981',
+                         'aliases': ['Piyush', 'Piyush Bansal']},
+    'ritesh-agarwal':   {'name': 'Ritesh',  'full': 'Ritesh Agarwal', 'title': 'Founder & CEO, OYO Rooms',          'emoji': '🏨', 'color': '#F59E0B'},
+    'amit-jain':        {'name': 'Amit',    'full': 'Amit Jain',      'title': 'Co-founder & CEO, CarDekho',        'emoji': '🚗', 'color': '#6366F1'},
+    'ashneer-grover':   {'name': 'Ashneer Grover', 'full': 'Ashneer Grover', 'title': 'Co-founder, BharatPe (S1-S2)', 'emoji': '💸', 'color': '#EF4444',
+                         'aliases': ['Ashneer']},
+    'kunal-bahl':       {'name': 'Kunal Bahl', 'full': 'Kunal Bahl', 'title': 'Co-founder & CEO, Snapdeal', 'emoji': '🛒', 'color': '#06B6D4'},
+    'ghazal-alagh':     {'name': 'Ghazal Alagh'},
+    'varun-alagh':      {'name': 'Varun Alagh'},
+    'azhar-iqubal':     {'name': 'Azhar Iqubal', 'aliases': ['Azhar Iqbal']},
+    'radhika-gupta':    {'name': 'Radhika Gupta'},
+    'varun-dua':        {'name': 'Varun Dua'},
+    'mohit-yadav':      {'name': 'Mohit Yadav'},
+    'vikas-d-nahar':    {'name': 'Vikas D Nahar', 'aliases': ['Vikas Nahar']},
+    'ronnie-screwvala': {'name': 'Ronnie Screwvala', 'aliases': ['Ronnie Screwwala']},
+    'viraj-bahl':       {'name': 'Viraj Bahl'},
+    'chirag-nakrani':   {'name': 'Chirag Nakrani'},
+    'deepinder-goyal':  {'name': 'Deepinder Goyal'},
+}
+
+def alias_key(name):
+    """Lookup form of a name: case, dots and repeated whitespace do not matter."""
+    return ' '.join(name.replace('.', ' ').split()).casefold()
+
+def investor_id(name):
+    """ID of a name the registry does not know, e.g. 'Mohit  Yadav' -> 'mohit-yadav'."""
+    return re.sub(r'[^\w]+', '-', alias_key(name)).strip('-')
+
+ALIAS_INDEX = {alias_key(alias): id_ for id_, investor in INVESTORS.items()
+               for alias in [investor['name'], investor.get('full', investor['name'])] + investor.get('aliases', [])}
+CORE_IDS = [ALIAS_INDEX[alias_key(shark)] for shark in CORE_SHARKS]   # in CORE_SHARKS order
+
+# Names resolved so far: lookup key -> (id, name). Unregistered names are cached
+# under their first spelling, so every later spelling gets the same name in the JSON.
+RESOLVED = {}
+
+def resolve(name):
+    """Raw CSV name -> (canonical ID, name for the JSON)."""
+    key = alias_key(name)
+    hit = RESOLVED.get(key)
+    if hit is None:
+        id_ = ALIAS_INDEX.get(key)
+        hit = (id_, INVESTORS[id_]['name']) if id_ is not None else (investor_id(name), ' '.join(name.split()))
+        RESOLVED[key] = hit
+    return hit
+
+def resolve_names(names):
+    """Array of raw names -> (ids, names) object arrays; each distinct name is looked up once."""
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object))
+    hits = [resolve(name) for name in uniques]
+    ids = np.array([h[0] for h in hits], dtype=object)
+    display = np.array([h[1] for h in hits], dtype=object)
+    return ids[codes], display[codes]
+
+def profile(id_, name):
+    """Shark profile fields of an investor (empty beyond the name for unregistered ones)."""
+    return INVESTORS.get(id_, {'name': name})
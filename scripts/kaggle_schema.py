@@ -0,0 +1,238 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Kaggle CSV Schema - one declaration per source column
+# Shared by fetch_kaggle_data.py and benchmark_sync.py
+# ═══════════════════════════════════════════════════════════════
+
+import importlib
+import importlib.util
+import math
+import types
+
+
+def lazy_import(name):
+    """Stand-in for module `name` that imports it on first attribute access.
+
+    Raises ImportError right away when it is not installed. Keeps pandas and numpy
+    out of code paths that never touch them, such as `fetch_kaggle_data.py test`.
+    The stand-in stays out of sys.modules (kagglehub walks it via inspect.stack()).
+    """
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f'No module named {name!r}', name=name)
+    proxy = types.ModuleType(name)
+
+    def load(attr):
+        module = importlib.import_module(name)
+        proxy.__dict__.update(module.__dict__)   # later lookups skip this hook
+        return getattr(module, attr)
+    proxy.__getattr__ = load
+    return proxy
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+CORE_SHARKS = ['Namita', 'Vineeta', 'Anupam', 'Aman', 'Peyush', 'Ritesh', 'Amit']
+
+# Extra missing-value spellings, compared lowercased after strip; '' and NaN are always missing.
+# Text columns only treat 'nan' as missing so values like 'N/A' reach the JSON unchanged.
+NUMERIC_NULLS = ('nan', 'na', 'n/a', 'null', 'none', '-')
+TEXT_NULLS    = ('nan',)
+
+# unit -> divisor applied after parsing
+UNITS = {'crore': 100}   # source in lakhs, output in crores
+
+# source column -> spec
+#   dtype     'float', 'int' (truncated), 'bool' (non-zero), 'str' (stripped)
+#   field     name of the coerced column every stage reads
+#   unit      optional key of UNITS
+#   number    optional, str only: a number kept as text, printed as a float ('2019.0'); values
+#             that do not parse are reported as failed and left empty
+#   category  optional, str only: few distinct values, held as a pandas categorical
+COLUMNS = {
+    'Season Number':            {'dtype': 'int',   'field': 'season'},
+    'Startup Name':             {'dtype': 'str',   'field': 'name'},
+    'Episode Number':           {'dtype': 'int',   'field': 'ep'},
+    'Pitch Number':             {'dtype': 'int',   'field': 'pitch'},
+    'Season Start':             {'dtype': 'str',   'field': 'seasonStart', 'category': True},
+    'Season End':               {'dtype': 'str',   'field': 'seasonEnd', 'category': True},
+    'Industry':                 {'dtype': 'str',   'field': 'industry', 'category': True},
+    'Business Description':     {'dtype': 'str',   'field': 'summary'},
+    'Company Website':          {'dtype': 'str',   'field': 'website'},
+    'Started in':               {'dtype': 'str',   'field': 'startedIn', 'number': True, 'category': True},
+    'Number of Presenters':     {'dtype': 'int',   'field': 'numPresenters'},
+    'Male Presenters':          {'dtype': 'int',   'field': 'malePresenters'},
+    'Female Presenters':        {'dtype': 'int',   'field': 'femalePresenters'},
+    'Couple Presenters':        {'dtype': 'bool',  'field': 'couplePresenters'},
+    'Pitchers Average Age':     {'dtype': 'str',   'field': 'pitchersAge', 'category': True},
+    'Pitchers City':            {'dtype': 'str',   'field': 'city', 'category': True},
+    'Pitchers State':           {'dtype': 'str',   'field': 'state', 'category': True},
+    'Yearly Revenue':           {'dtype': 'float', 'field': 'revenue'},
+    'Gross Margin':             {'dtype': 'float', 'field': 'margin'},
+    'EBITDA':                   {'dtype': 'float', 'field': 'ebitda'},
+    'Cash Burn':                {'dtype': 'str',   'field': 'cashBurn', 'category': True},
+    'SKUs':                     {'dtype': 'int',   'field': 'skus'},
+    'Has Patents':              {'dtype': 'bool',  'field': 'hasPatents'},
+    'Bootstrapped':             {'dtype': 'str',   'field': 'bootstrapped', 'category': True},
+    'Original Ask Amount':      {'dtype': 'float', 'field': 'askAmt'},
+    'Original Offered Equity':  {'dtype': 'float', 'field': 'askEq'},
+    'Valuation Requested':      {'dtype': 'float', 'field': 'askVal', 'unit': 'crore'},
+    'Received Offer':           {'dtype': 'bool',  'field': 'receivedOffer'},
+    'Accepted Offer':           {'dtype': 'bool',  'field': 'funded'},
+    'Total Deal Amount':        {'dtype': 'float', 'field': 'dealAmt'},
+    'Total Deal Equity':        {'dtype': 'float', 'field': 'dealEq'},
+    'Total Deal Debt':          {'dtype': 'float', 'field': 'totalDebt'},
+    'Debt Interest':            {'dtype': 'float', 'field': 'debtInterest'},
+    'Deal Valuation':           {'dtype': 'float', 'field': 'dealVal', 'unit': 'crore'},
+    'Number of Sharks in Deal': {'dtype': 'int',   'field': 'numSharks'},
+    'Deal Has Conditions':      {'dtype': 'bool',  'field': 'hasConditions'},
+    'Royalty Percentage':       {'dtype': 'float', 'field': 'royaltyPct'},
+    'Guest Investment Amount':  {'dtype': 'float', 'field': 'guestAmt'},
+    'Guest Investment Equity':  {'dtype': 'float', 'field': 'guestEq'},
+    'Invested Guest Name':      {'dtype': 'str',   'field': 'guestNames', 'category': True},
+}
+
+def shark_fields(shark):
+    """(amount, equity, debt) field names of a core shark's investment columns."""
+    key = shark.lower()
+    return f'{key}Amt', f'{key}Eq', f'{key}Debt'
+
+COLUMNS.update({
+    f'{shark} {suffix}': {'dtype': 'float', 'field': field}
+    for shark in CORE_SHARKS
+    for suffix, field in zip(('Investment Amount', 'Investment Equity', 'Debt Amount'), shark_fields(shark))
+})
+
+FIELDS = {spec['field']: source for source, spec in COLUMNS.items()}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Coercion - every column converted once, with a report
+# ═══════════════════════════════════════════════════════════════
+SAMPLE_LIMIT = 3
+INT_DTYPES   = ('Int8', 'Int16', 'Int32', 'Int64')   # narrowest first
+
+def read_options():
+    """read_csv keyword arguments: only the schema's columns, text kept as text."""
+    dtype = {source: 'str' for source, spec in COLUMNS.items() if spec['dtype'] == 'str'}
+    return {'usecols': lambda c: c in COLUMNS, 'dtype': dtype}
+
+def safe_float(val, default=None):
+    try:
+        if val is None or (isinstance(val, float) and math.isnan(val)):
+            return default
+        return float(val)
+    except (TypeError, ValueError):
+        return default
+
+def coerce_number(col):
+    """Series -> (float array, null count, failed mask). Non-numeric cells go through safe_float."""
+    if pd.api.types.is_numeric_dtype(col) or pd.api.types.is_bool_dtype(col):
+        vals = col.to_numpy(dtype=float, na_value=np.nan)
+        return vals, int(np.isnan(vals).sum()), np.zeros(len(col), dtype=bool)
+    uniques = pd.unique(col.dropna())
+    parsed = dict(zip(uniques, (safe_float(v) for v in uniques)))
+    vals = col.map(parsed).to_numpy(dtype=float, na_value=np.nan)
+    missing = col.isna().to_numpy()
+    text = col[~missing].astype(str).str.strip().str.lower()
+    token = np.zeros(len(col), dtype=bool)
+    token[~missing] = (text.eq('') | text.isin(NUMERIC_NULLS)).to_numpy()
+    failed = ~missing & ~token & np.isnan(vals)
+    return vals, int((missing | token).sum()), failed
+
+def coerce_text(col):
+    """Series -> (object array, '' where missing, null count)."""
+    out = np.full(len(col), '', dtype=object)
+    mask = col.notna().to_numpy()
+    s = col[mask].astype(str).str.strip()
+    keep = (s.ne('') & ~s.str.lower().isin(TEXT_NULLS)).to_numpy()
+    out[np.flatnonzero(mask)[keep]] = s[keep].to_numpy(dtype=object)
+    return out, int(len(col) - keep.sum())
+
+def number_text(vals):
+    """float array -> object array of the values as float text ('2019.0'), '' where missing."""
+    out = np.full(len(vals), '', dtype=object)
+    present = ~np.isnan(vals)
+    out[present] = [str(v) for v in vals[present].tolist()]
+    return out
+
+def coerce_int(vals):
+    """float array -> the smallest nullable Int array holding its truncated values
+    (<NA> when missing); float64 when no Int dtype does."""
+    ints = np.trunc(vals)
+    present = ints[~np.isnan(ints)]
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype.lower())
+        if not len(present) or (info.min <= present.min() and present.max() <= info.max):
+            return pd.array(ints, dtype=dtype)
+    return ints
+
+def coerce_frame(df):
+    """Raw CSV frame -> (typed frame keyed by field, report).
+
+    float fields are float64 (NaN when missing), int fields nullable Int8..Int64
+    (<NA> when missing), bool fields are bool, str fields are object with '' when
+    missing, or categorical for the 'category' ones ('number' ones parsed as a float
+    first, see number_text); units are applied. Columns
+    absent from df are all-missing. report maps each source column to {nulls, failed}
+    (plus up to SAMPLE_LIMIT failed raw values, or missing=True when the column is absent).
+    """
+    df = pd.DataFrame() if df is None else df.reset_index(drop=True)
+    n = len(df)
+    columns, report = {}, {}
+    for source, spec in COLUMNS.items():
+        entry = {'nulls': n, 'failed': 0}
+        if spec['dtype'] == 'str' and not spec.get('number'):
+            vals = np.full(n, '', dtype=object)
+            if source in df.columns:
+                vals, entry['nulls'] = coerce_text(df[source])
+        else:
+            vals = np.full(n, np.nan)
+            if source in df.columns:
+                vals, entry['nulls'], failed = coerce_number(df[source])
+                entry['failed'] = int(failed.sum())
+                if entry['failed']:
+                    entry['samples'] = [str(v) for v in pd.unique(df[source][failed])[:SAMPLE_LIMIT]]
+            if 'unit' in spec:
+                vals = vals / UNITS[spec['unit']]
+            if spec['dtype'] == 'bool':
+                vals = (vals != 0) & ~np.isnan(vals)
+            elif spec['dtype'] == 'int':
+                vals = coerce_int(vals)
+            elif spec['dtype'] == 'str':
+                vals = number_text(vals)
+        if source not in df.columns:
+            entry['missing'] = True
+        columns[spec['field']] = vals
+        report[source] = entry
+
+    typed = pd.DataFrame(columns, index=pd.RangeIndex(n))
+    for field in columns:
+        spec = COLUMNS[FIELDS[field]]
+        if spec['dtype'] == 'str':
+            typed[field] = typed[field].astype('category' if spec.get('category') else object)
+    return typed, report
+
+def merge_reports(a, b):
+    """Combine the reports of two chunks of the same file."""
+    if a is None:
+        return b
+    merged = {}
+    for source, x in a.items():
+        y = b[source]
+        entry = {'nulls': x['nulls'] + y['nulls'], 'failed': x['failed'] + y['failed']}
+        samples = list(dict.fromkeys(x.get('samples', []) + y.get('samples', [])))[:SAMPLE_LIMIT]
+        if samples:
+            entry['samples'] = samples
+        if x.get('missing'):
+            entry['missing'] = True
+        merged[source] = entry
+    return merged
+
+def report_problems(report):
+    """Columns that are absent or had values that failed to parse."""
+    return {source: entry for source, entry in report.items() if entry['failed'] or entry.get('missing')}
+
+def load_csv(path, **kwargs):
+    """read_csv with read_options(), then coerce_frame(). Returns (typed, report)."""
+    return coerce_frame(pd.read_csv(path, **read_options(), **kwargs))
@@ -0,0 +1,237 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Raw CSV Snapshot Store - content-addressed, gzip-compressed
+# Used by fetch_kaggle_data.py (writes, and reads for `rebuild`)
+# ═══════════════════════════════════════════════════════════════
+#
+#   <root>/index.json                   every snapshot's metadata, read once to list
+#   <root>/objects/<sha256>.csv.gz      a full snapshot
+#   <root>/objects/<sha256>.delta.gz    a snapshot stored as line ops against its base
+#
+# Literal lines in a delta are text in the entry's 'literals' encoding (latin-1),
+# so any bytes, not only UTF-8, come back exactly.
+#
+# Snapshots are named kaggle_raw_<ddmmyyHHMMSS>.csv like the plain copies they
+# replace; 'kaggle_raw_latest.csv' resolves to the newest one.
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+INDEX_FILE      = 'index.json'
+INDEX_FORMAT    = 'stih-raw-snapshots'
+INDEX_VERSION   = 1
+LATEST_NAME     = 'kaggle_raw_latest.csv'
+KEEP_SNAPSHOTS  = 10    # RAW_SNAPSHOT_KEEP
+DELTA_MAX_DEPTH = 8     # deltas of deltas before the next one is stored in full
+LITERAL_ENCODING = 'latin-1'    # one char per byte, read back the same way by rawSnapshots.js
+
+
+# ═══════════════════════════════════════════════════════════════
+# Index
+# ═══════════════════════════════════════════════════════════════
+def empty_index():
+    return {'format': INDEX_FORMAT, 'version': INDEX_VERSION, 'latest': None, 'snapshots': {}, 'hashes': {}}
+
+def load_index(root):
+    try:
+        with open(Path(root) / INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return empty_index()
+    if index.get('format') != INDEX_FORMAT or index.get('version') != INDEX_VERSION:
+        return empty_index()
+    return index
+
+def write_atomic(path, data):
+    """Replace path in one rename so a reader never sees a partial file."""
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def save_index(root, index):
+    write_atomic(Path(root) / INDEX_FILE, json.dumps(index, indent=2, ensure_ascii=False).encode('utf-8'))
+
+
+# ═══════════════════════════════════════════════════════════════
+# Row deltas - CSV lines copied from the base snapshot or stored literally
+# ═══════════════════════════════════════════════════════════════
+def split_lines(data):
+    """bytes -> lines with their endings, so b''.join() gives data back exactly."""
+    return data.splitlines(keepends=True)
+
+def make_delta(base, lines):
+    """Ops rebuilding lines from base: [start, count] copies base[start:start+count], a str is a literal line."""
+    first = {}
+    for i, line in enumerate(base):
+        first.setdefault(line, i)
+    ops = []
+    for line in lines:
+        last = ops[-1] if ops else None
+        if isinstance(last, list) and last[0] + last[1] < len(base) and base[last[0] + last[1]] == line:
+            last[1] += 1
+        elif line in first:
+            ops.append([first[line], 1])
+        else:
+            ops.append(line.decode(LITERAL_ENCODING))
+    return ops
+
+def apply_delta(base, ops, encoding=LITERAL_ENCODING):
+    """Inverse of make_delta; encoding is the delta entry's 'literals'."""
+    out = []
+    for op in ops:
+        if isinstance(op, list):
+            out.extend(base[op[0]:op[0] + op[1]])
+        else:
+            out.append(op.encode(encoding))
+    return b''.join(out)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Read / write
+# ═══════════════════════════════════════════════════════════════
+def resolve(index, name=None):
+    """Snapshot name (None or LATEST_NAME for the newest) -> its index entry, or None."""
+    if name in (None, LATEST_NAME):
+        name = index['latest']
+    return index['snapshots'].get(name)
+
+def read_snapshot(root, name=None, index=None):
+    """Exact bytes of a snapshot, following delta bases. Raises KeyError for unknown names."""
+    index = index or load_index(root)
+    entry = resolve(index, name)
+    if entry is None:
+        raise KeyError(f'No raw snapshot {name or LATEST_NAME}')
+    with gzip.open(Path(root) / entry['object'], 'rb') as f:
+        payload = f.read()
+    if entry['storage'] == 'delta':
+        base = read_snapshot(root, entry['base'], index)
+        payload = apply_delta(split_lines(base), json.loads(payload), entry['literals'])
+    if hashlib.sha256(payload).hexdigest() != entry['sha256']:
+        raise ValueError(f"Raw snapshot {entry['name']} does not match its checksum")
+    return payload
+
+def count_rows(data):
+    """CSV records after the header (quoted newlines do not start a record)."""
+    return max(sum(1 for _ in csv.reader(io.StringIO(data.decode('utf-8', 'replace')))) - 1, 0)
+
+def snapshot_name(index, when):
+    name = f"kaggle_raw_{when.strftime('%d%m%y%H%M%S')}.csv"
+    n = 1
+    while name in index['snapshots']:
+        name = f"kaggle_raw_{when.strftime('%d%m%y%H%M%S')}_{n}.csv"
+        n += 1
+    return name
+
+def store_object(root, sha, data, base_entry=None, base_data=None):
+    """Compress data as a full object, or as a delta against base_data when that is smaller.
+
+    Returns the storage fields of the index entry.
+    """
+    objects = Path(root) / 'objects'
+    objects.mkdir(parents=True, exist_ok=True)
+    full = gzip.compress(data, mtime=0)
+    stored = {'storage': 'gzip', 'object': f'objects/{sha}.csv.gz', 'base': None, 'depth': 0, 'storedBytes': len(full),
+              'literals': None}
+    payload = full
+    if base_entry is not None and base_entry['depth'] < DELTA_MAX_DEPTH:
+        ops = make_delta(split_lines(base_data), split_lines(data))
+        delta = gzip.compress(json.dumps(ops, separators=(',', ':')).encode('utf-8'), mtime=0)
+        if len(delta) < len(full):
+            stored = {'storage': 'delta', 'object': f'objects/{sha}.delta.gz', 'base': base_entry['name'],
+                      'depth': base_entry['depth'] + 1, 'storedBytes': len(delta), 'literals': LITERAL_ENCODING}
+            payload = delta
+    write_atomic(Path(root) / stored['object'], payload)
+    return stored
+
+def save_snapshot(root, data, source=None, deltas=None, keep=None, when=None, name=None):
+    """Add data (bytes of a raw CSV) to the store.
+
+    Content already in the store adds nothing: the existing snapshot becomes the
+    latest again. deltas (default $RAW_SNAPSHOT_DELTAS) stores the snapshot as row
+    ops against the latest one when that is smaller. keep is the retention, see
+    prune_snapshots. name defaults to kaggle_raw_<when>.csv. Returns (entry, created).
+    """
+    if deltas is None:
+        deltas = (os.getenv('RAW_SNAPSHOT_DELTAS') or '').lower() in ('1', 'true', 'yes')
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    index = load_index(root)
+    sha = hashlib.sha256(data).hexdigest()
+
+    if sha in index['hashes']:
+        entry = index['snapshots'][index['hashes'][sha]]
+        entry['lastSeenAt'] = datetime.now().isoformat()
+        index['latest'] = entry['name']
+        save_index(root, index)
+        return entry, False
+
+    when = when or datetime.now()
+    base_entry = resolve(index) if deltas else None
+    base_data = read_snapshot(root, base_entry['name'], index) if base_entry else None
+    if name is None or name == LATEST_NAME or name in index['snapshots']:
+        name = snapshot_name(index, when)
+    entry = {'name': name, 'sha256': sha, 'savedAt': when.isoformat(),
+             'source': source, 'bytes': len(data), 'rows': count_rows(data)}
+    entry.update(store_object(root, sha, data, base_entry, base_data))
+    index['snapshots'][entry['name']] = entry
+    index['hashes'][sha] = entry['name']
+    index['latest'] = entry['name']
+    prune_snapshots(root, index, keep)
+    save_index(root, index)
+    return entry, True
+
+def prune_snapshots(root, index, keep=None):
+    """Drop all but the newest keep snapshots (default $RAW_SNAPSHOT_KEEP or 10; 0 keeps all).
+
+    The latest snapshot is always kept, and a kept delta whose base is dropped is
+    rewritten in full first. Updates index in place; returns the dropped names.
+    """
+    if keep is None:
+        keep = int(os.getenv('RAW_SNAPSHOT_KEEP') or KEEP_SNAPSHOTS)
+    names = list(index['snapshots'])
+    if keep <= 0 or len(names) <= keep:
+        return []
+    dropped = [name for name in names[:-keep] if name != index['latest']]
+    for name, entry in index['snapshots'].items():
+        if name not in dropped and entry['base'] in dropped:
+            data = read_snapshot(root, name, index)
+            entry.update(store_object(root, entry['sha256'], data))
+    for name in dropped:
+        entry = index['snapshots'].pop(name)
+        del index['hashes'][entry['sha256']]
+        path = Path(root) / entry['object']
+        if path.exists():
+            path.unlink()
+    # A delta rewritten in full leaves its old object behind
+    live = {entry['object'] for entry in index['snapshots'].values()}
+    for path in (Path(root) / 'objects').iterdir():
+        if f'objects/{path.name}' not in live and not path.name.endswith('.tmp'):
+            path.unlink()
+    return dropped
+
+def import_plain_copies(root, raw_dir):
+    """Move kaggle_raw_*.csv copies written before the store existed into it, oldest first.
+
+    Each file is removed only once the store gives back the same bytes. Returns the
+    number of files imported.
+    """
+    # The latest copy goes last so its content ends up as the store's latest
+    plain = sorted((p for p in Path(raw_dir).glob('kaggle_raw_*.csv') if p.is_file()),
+                   key=lambda p: (p.name == LATEST_NAME, p.stat().st_mtime))
+    for path in plain:
+        data = path.read_bytes()
+        entry, _ = save_snapshot(root, data, source=path.name, keep=0, name=path.name,
+                                 when=datetime.fromtimestamp(path.stat().st_mtime))
+        if read_snapshot(root, entry['name']) == data:
+            path.unlink()
+    return len(plain)
@@ -0,0 +1,64 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# JSON Serializer - orjson when installed, stdlib json otherwise
+# Used by fetch_kaggle_data.py for the output files and their .gz/.br siblings
+# ═══════════════════════════════════════════════════════════════
+#
+# Both encoders keep non-ASCII characters as is and write either minified JSON
+# or JSON indented by 2 spaces. They give the same text for strings, integers,
+# booleans, null and the floats json prints without an exponent (magnitude
+# 1e-4 up to 1e16; see test_serializer.py). They differ on the rest: orjson
+# writes NaN/Infinity as null, and exponents in its own, version-dependent form
+# (1e16 for 1e+16, 0.000015 for 1.5e-05), so installing, upgrading or removing
+# orjson can change the bytes of files holding such values.
+#
+# The precompressed siblings let the server send a file with a Content-Encoding
+# instead of compressing it per request; .br is only written when the brotli
+# package is installed.
+
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+ENCODER        = 'orjson' if orjson else 'json'
+GZIP_LEVEL     = 6    # 9 takes twice as long for files ~6% smaller
+BROTLI_QUALITY = 5    # already smaller than gzip -9; 9 and up are 3x+ slower
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+def dumpb(data, indent=False):
+    """data -> UTF-8 JSON bytes, minified or indented by 2 spaces."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:
+            pass    # e.g. ints wider than 64 bits, which only the stdlib encoder handles
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def dumps(data, indent=False):
+    """data -> JSON text, minified or indented by 2 spaces."""
+    return dumpb(data, indent).decode('utf-8')
+
+def gzip_compressor():
+    # wbits 31: gzip container with mtime 0, so the same input gives the same bytes
+    z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return z.compress, z.flush
+
+def brotli_compressor():
+    c = brotli.Compressor(quality=BROTLI_QUALITY)
+    return c.process, c.finish
+
+# suffix -> factory of (feed(bytes) -> bytes, finish() -> bytes), for streamed writes
+COMPRESSORS = {'.gz': gzip_compressor}
+if brotli is not None:
+    COMPRESSORS['.br'] = brotli_compressor
@@ -0,0 +1,177 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Tests for fetch_kaggle_data.py - run with: python -m pytest scripts
+# Frames come from generate_kaggle_data.py, parsed and coerced as a sync does
+# ═══════════════════════════════════════════════════════════════
+
+import itertools
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fetch_kaggle_data as fk
+import generate_kaggle_data
+
+
+def load_frame(path):
+    """A CSV through the sync's own parse and coercion."""
+    df, _ = fk.coerce_frame(pd.read_csv(path, **fk.read_options()))
+    return df
+
+@pytest.fixture(scope='module')
+def synthetic_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('kaggle') / 'synthetic.csv'
+    generate_kaggle_data.write_csv(path, 3000, seed=11)
+    return path
+
+
+# ═══════════════════════════════════════════════════════════════
+# Validation
+# ═══════════════════════════════════════════════════════════════
+def test_validate_frame_passes_generated_data(synthetic_csv):
+    df = load_frame(synthetic_csv)
+    report = fk.validate_frame(df, fk.build_investments(df))
+    assert report['rows'] == 3000
+    assert {rule: entry['violations'] for rule, entry in report['rules'].items()} == dict.fromkeys(fk.VALIDATION_RULES, 0)
+
+def test_validate_frame_accepts_debt_in_or_out_of_deal_amount(synthetic_csv):
+    df = load_frame(synthetic_csv)
+    debt = np.flatnonzero(np.nan_to_num(fk.col_float(df, 'totalDebt')) > 0)
+    assert len(debt)
+    # Kaggle's own layout: Total Deal Amount is the equity part only
+    df.loc[debt, 'dealAmt'] = df.loc[debt, 'dealAmt'] - df.loc[debt, 'totalDebt']
+    report = fk.validate_frame(df, fk.build_investments(df))
+    assert report['rules']['dealAmountSum']['violations'] == 0
+
+def test_validate_frame_flags_mismatched_deal_amount(synthetic_csv):
+    df = load_frame(synthetic_csv)
+    row = int(np.flatnonzero(fk.col_bool(df, 'funded') & (fk.col_float(df, 'dealAmt') > 0))[0])
+    df.loc[row, 'dealAmt'] = df.loc[row, 'dealAmt'] * 3
+    keys, _ = fk.fingerprint_rows(df)
+    result = fk.validate_frame(df, fk.build_investments(df), keys)['rules']['dealAmountSum']
+    assert result == {'violations': 1, 'samples': [keys[row]]}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Pitch IDs
+# ═══════════════════════════════════════════════════════════════
+def test_pitch_ids_unique_and_bare_slug_first():
+    ids = fk.pitch_ids(['Green Leaf', 'Smart Kart', 'green-leaf', 'Green Leaf', 'Green Leaf'],
+                       [1, 1, 2, 2, 2], [3, 4, 1, 5, 5])
+    assert ids.tolist() == ['greenleaf', 'smartkart', 'greenleaf-s2e1', 'greenleaf-s2e5', 'greenleaf-s2e5-2']
+
+def test_pitch_ids_stable_when_rows_are_appended(synthetic_csv):
+    df = load_frame(synthetic_csv)
+    names, seasons, eps = fk.pitch_names(df), fk.col_int(df, 'season', 1), fk.col_int(df, 'ep')
+    ids = fk.pitch_ids(names, seasons, eps)
+    assert len(set(ids)) == len(ids)
+    head = 2000
+    assert fk.pitch_ids(names[:head], seasons[:head], eps[:head]).tolist() == ids[:head].tolist()
+
+def test_pitch_ids_same_across_chunks(synthetic_csv):
+    df = load_frame(synthetic_csv)
+    names, seasons, eps = fk.pitch_names(df), fk.col_int(df, 'season', 1), fk.col_int(df, 'ep')
+    taken = set()
+    chunked = [id_ for start in range(0, len(df), 700)
+               for id_ in fk.pitch_ids(names[start:start + 700], seasons[start:start + 700], eps[start:start + 700], taken)]
+    assert chunked == fk.pitch_ids(names, seasons, eps).tolist()
+
+
+# ═══════════════════════════════════════════════════════════════
+# Co-investment network
+# ═══════════════════════════════════════════════════════════════
+def test_build_network_matches_pairwise_count(synthetic_csv):
+    df = load_frame(synthetic_csv)
+    frame, investments = fk.normalize_frame(df)
+    network = fk.build_network(frame, investments)
+    ids = [entry['id'] for entry in network['investors']]
+
+    # Every two investors of a pitch, counted one pitch at a time
+    seasons = frame['seasonInt'].to_numpy()
+    expected = {}
+    for row, group in investments.groupby('row', sort=True):
+        amounts = group.groupby('investor', sort=False)['amt'].sum()
+        for (a, x), (b, y) in itertools.combinations(amounts.items(), 2):
+            for key in ('all', str(seasons[row])):
+                deals, amount = expected.get((key, frozenset((a, b))), (0, 0.0))
+                expected[(key, frozenset((a, b)))] = (deals + 1, amount + x + y)
+
+    found = {}
+    for key, pairs in [('all', network['pairs'])] + list(network['seasons'].items()):
+        for a, b, deals, amount in pairs:
+            found[(key, frozenset((ids[a], ids[b])))] = (deals, amount)
+    assert found.keys() == expected.keys()
+    for key, (deals, amount) in expected.items():
+        assert found[key][0] == deals
+        assert found[key][1] == pytest.approx(amount, abs=0.01)
+
+    deals = [pair[2] for pair in network['pairs']]
+    assert deals == sorted(deals, reverse=True)
+    for partners in network['topPartners'].values():
+        assert len(partners) <= fk.NETWORK_TOP_PARTNERS
+        assert [p[1] for p in partners] == sorted((p[1] for p in partners), reverse=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Sync runs - main() into a temporary DATA_DIR
+# ═══════════════════════════════════════════════════════════════
+def run_sync(monkeypatch, data_dir, csv_path, full=False, chunksize=None):
+    monkeypatch.setattr(fk, 'DATA_DIR', Path(data_dir))
+    monkeypatch.setattr(fk, 'RAW_DIR', Path(data_dir) / 'raw')
+    assert fk.main(full=full, source=str(csv_path), chunksize=chunksize, workers=1)
+    with open(Path(data_dir) / 'sync-log.json', 'r', encoding='utf-8') as f:
+        return json.load(f)[0]
+
+def published(data_dir):
+    """{filename: bytes} of the current generation."""
+    with open(Path(data_dir) / fk.CURRENT_FILE, 'r', encoding='utf-8') as f:
+        gen_dir = Path(data_dir) / json.load(f)['path']
+    return {p.name: p.read_bytes() for p in sorted(gen_dir.iterdir()) if p.name != fk.GENERATION_MANIFEST}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Sync against a previous manifest
+# ═══════════════════════════════════════════════════════════════
+def test_sync_after_changed_rows_matches_full_rebuild(monkeypatch, tmp_path, synthetic_csv):
+    df = pd.read_csv(synthetic_csv)
+    df.loc[3, 'Original Ask Amount'] = df.loc[3, 'Original Ask Amount'] + 5
+    df = pd.concat([df.drop(index=10), df.iloc[[20]].assign(**{'Pitch Number': 9999})], ignore_index=True)
+    changed = tmp_path / 'changed.csv'
+    df.to_csv(changed, index=False)
+
+    run_sync(monkeypatch, tmp_path / 'synced', synthetic_csv)
+    entry = run_sync(monkeypatch, tmp_path / 'synced', changed)
+    # Unnamed pitches after the dropped row moved, so they count as updated too
+    assert (entry['changes']['inserted'], entry['changes']['deleted']) == (1, 1)
+    assert entry['changes']['updated'] >= 1
+    run_sync(monkeypatch, tmp_path / 'full', changed, full=True)
+    assert published(tmp_path / 'synced') == published(tmp_path / 'full')
+
+def test_sync_with_unchanged_rows_rewrites_nothing(monkeypatch, tmp_path, synthetic_csv):
+    # Same rows, different bytes: the dataset cache misses, the row manifest does not
+    resaved = tmp_path / 'resaved.csv'
+    resaved.write_bytes(synthetic_csv.read_bytes().replace(b'\n', b'\r\n'))
+
+    run_sync(monkeypatch, tmp_path / 'data', synthetic_csv)
+    before = (tmp_path / 'data' / fk.CURRENT_FILE).read_bytes()
+    entry = run_sync(monkeypatch, tmp_path / 'data', resaved)
+    assert entry['mode'] == 'unchanged'
+    assert (tmp_path / 'data' / fk.CURRENT_FILE).read_bytes() == before
+
+
+# ═══════════════════════════════════════════════════════════════
+# Streaming sync
+# ═══════════════════════════════════════════════════════════════
+def test_streamed_sync_publishes_every_output(monkeypatch, tmp_path, synthetic_csv):
+    entry = run_sync(monkeypatch, tmp_path / 'streamed', synthetic_csv, chunksize=700)
+    assert entry['mode'] == 'stream'
+    run_sync(monkeypatch, tmp_path / 'full', synthetic_csv, full=True)
+    streamed, full = published(tmp_path / 'streamed'), published(tmp_path / 'full')
+    assert sorted(streamed) == sorted(full)
+    # Cube and network amounts are summed chunk by chunk, so they may differ in the last cent
+    for name in ['pitches.json', 'pitches.columnar.json', 'pitches.facets.json', 'pitches.search.json',
+                 'pitches.lookup.json', 'sharks.json', 'seasons.json', 'industries.json']:
+        assert streamed[name] == full[name], name
@@ -0,0 +1,31 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Tests for kaggle_schema.py - run with: python -m pytest scripts
+# ═══════════════════════════════════════════════════════════════
+
+import pandas as pd
+
+import generate_kaggle_data
+from kaggle_schema import coerce_frame, load_csv, read_options
+
+
+def test_bad_started_in_is_reported_not_raised(tmp_path):
+    path = tmp_path / 'synthetic.csv'
+    generate_kaggle_data.write_csv(path, 50, seed=2)
+    raw = pd.read_csv(path, dtype=str)
+    raw.loc[[4, 9], 'Started in'] = ['2019-20', '2018']
+    raw.to_csv(path, index=False)
+
+    typed, report = load_csv(path)
+    assert report['Started in']['failed'] == 1
+    assert report['Started in']['samples'] == ['2019-20']
+    assert typed['startedIn'][4] == ''
+    assert typed['startedIn'][9] == '2018.0'
+
+def test_started_in_same_in_every_chunk(tmp_path):
+    path = tmp_path / 'synthetic.csv'
+    generate_kaggle_data.write_csv(path, 400, seed=3)
+    whole, _ = load_csv(path)
+    chunks = [coerce_frame(chunk)[0] for chunk in pd.read_csv(path, chunksize=37, **read_options())]
+    assert pd.concat([c['startedIn'].astype(object) for c in chunks], ignore_index=True).tolist() \
+        == whole['startedIn'].astype(object).tolist()
@@ -0,0 +1,25 @@
+﻿#!/usr/bin/env python3
+# ═══════════════════════════════════════════════════════════════
+# Tests for serializer.py - run with: python -m pytest scripts
+# The encoder comparison needs orjson and is skipped without it
+# ═══════════════════════════════════════════════════════════════
+
+import pytest
+
+import serializer
+
+
+# Shaped like the sync outputs: nested records, empty containers, non-ASCII text
+RECORDS = [
+    {'id': 'chai-point', 'name': 'Chai Point – चाय', 'season': 3, 'funded': True, 'dealEq': None,
+     'amounts': [0.0, 0.0001, 0.1, 2.5, 33.33, 100.0, 123456789.125, 9999999999999998.0, -4.75],
+     'sharks': [], 'sharkBreakdown': {}, 'cells': {'1|*|Aman|equity': [27, 27, 1529.51, 19.29, None]}},
+    {'id': 'smart-kart', 'name': 'Smart Kart', 'season': 1, 'funded': False, 'ids': [0, 10 ** 18]},
+]
+
+@pytest.mark.skipif(serializer.orjson is None, reason='orjson is not installed')
+@pytest.mark.parametrize('indent', [False, True])
+def test_orjson_and_json_give_the_same_text(monkeypatch, indent):
+    fast = serializer.dumps(RECORDS, indent)
+    monkeypatch.setattr(serializer, 'orjson', None)
+    assert serializer.dumps(RECORDS, indent) == fast
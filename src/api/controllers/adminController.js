@@ -3,13 +3,13 @@
 // ═══════════════════════════════════════════════════════════════
 
 const fs = require('fs').promises;
-const fsSync = require('fs');
 const path = require('path');
 const bcrypt = require('bcryptjs');
 const { parse: csvParse } = require('csv-parse/sync');
 const adminAuth = require('../middleware/adminAuth');
 const dataService = require('../../services/dataService');
 const kaggleSync = require('../../services/kaggleSync');
+const rawSnapshots = require('../../services/rawSnapshots');
 const logger = require('../../utils/logger');
 
 const ADMIN_SETTINGS_PATH = path.join(__dirname, '../../config/admin-settings.json');
@@ -54,6 +54,7 @@ class AdminController {
   }
 
   async reloadData(req, res, next) {
+    let previousSyncAt;
     try {
       if (kaggleSync.isSyncing()) {
         return res.status(409).json({ message: 'Sync already in progress' });
@@ -61,19 +62,24 @@ class AdminController {
 
       logger.info('Starting Kaggle data sync...');
 
+      // The entry fetch_kaggle_data.py writes is told apart from an older one by its lastSyncAt
+      const previousLog = await dataService.getSyncLog();
+      previousSyncAt = previousLog ? previousLog.lastSyncAt : null;
+
       // Execute sync
       const result = await kaggleSync.syncData();
 
       // Save backups after successful sync
       try {
 
-        const dataDir = path.join(__dirname, '../../data');       
-        
+        // Read from the generation the sync just published
+        dataService.clearCache();
+
         const dataFiles = ['pitches.json', 'sharks.json', 'seasons.json', 'industries.json'];
         const backupFilenames = [];
 
         for (const filename of dataFiles) {
-          const filepath = path.join(dataDir, filename);
+          const filepath = await dataService.dataPath(filename);
           const data = await fs.readFile(filepath, 'utf-8');
           const parsedData = JSON.parse(data);
           const backupName = await kaggleSync.saveBackup(filename, parsedData);
@@ -86,16 +92,14 @@ class AdminController {
         // Don't reject the whole response, just log the backup error
       }
 
-      // Update sync log
+      // Update sync log: the script's entry (status, counts, validation...) plus the message
+      const entry = await this.loadSyncEntry(previousSyncAt);
       const syncLog = {
         lastSyncAt: new Date().toISOString(),
         status: 'success',
-        recordsImported: {
-          pitches: 702,
-          sharks: 8,
-          seasons: 5,
-        },
+        ...entry,
         message: result.message,
+        metrics: (entry && entry.metrics) || result.metrics,
       };
 
       await dataService.saveSyncLog(syncLog);
@@ -106,22 +110,39 @@ class AdminController {
     } catch (error) {
       logger.error('Sync error:', error.message);
 
-      // Save error log
+      // Save error log, keeping the script's entry (a partial or aborted sync) when it wrote one
+      const entry = await this.loadSyncEntry(previousSyncAt);
       const syncLog = {
         lastSyncAt: new Date().toISOString(),
         status: 'error',
+        ...entry,
         error: error.message,
+        metrics: (entry && entry.metrics) || error.metrics || null,
       };
 
       await dataService.saveSyncLog(syncLog);
 
       res.status(500).json({
         message: 'Sync failed',
+        status: syncLog.status,
         error: error.message,
       });
     }
   }
 
+  /**
+   * The sync-log entry fetch_kaggle_data.py wrote for this sync, or null when it
+   * exited before writing one (the file still holds the entry from previousSyncAt).
+   */
+  async loadSyncEntry(previousSyncAt) {
+    dataService.clearCache();
+    const entry = await dataService.getSyncLog();
+    if (!entry || entry.lastSyncAt === previousSyncAt) {
+      return null;
+    }
+    return entry;
+  }
+
   async getStatus(req, res, next) {
     try {
       const syncLog = await dataService.getSyncLog();
@@ -138,49 +159,29 @@ class AdminController {
   }
 
   async testKaggleConnection() {
-    return new Promise((resolve) => {
-      const { spawn } = require('child_process');
-      const pythonProcess = spawn('python', ['scripts/fetch_kaggle_data.py', 'test'], {
-        cwd: path.join(__dirname, '../../..'),
-        env: process.env,  // Pass environment variables to Python subprocess
-      });
-
-      let output = '';
-      let errorOutput = '';
-
-      pythonProcess.stdout.on('data', (data) => {
-        const text = data.toString();
-        output += text;
-        logger.debug(`[Python] ${text.trim()}`);
-      });
+    let result;
+    try {
+      result = await kaggleSync.testConnection();
+    } catch (error) {
+      logger.warn('Kaggle API test failed:', error.message);
+      result = { online: false, exitCode: null, output: '', errorOutput: error.message };
+    }
+    logger.info(`Python test job exited with code ${result.exitCode}`);
+    logger.debug(`Output: ${result.output}`);
 
-      pythonProcess.stderr.on('data', (data) => {
-        const text = data.toString();
-        errorOutput += text;
-        logger.warn(`[Python Error] ${text.trim()}`);
-      });
+    if (!result.online) {
+      logger.warn(`Kaggle API test failed. Output: ${result.output} | Errors: ${result.errorOutput}`);
+    }
 
-      pythonProcess.on('close', (code) => {
-        logger.info(`Python test process exited with code ${code}`);
-        logger.debug(`Output: ${output}`);
-        
-        const isOnline = code === 0 && (output.includes('[OK]') && output.includes('ONLINE'));
-        
-        if (!isOnline) {
-          logger.warn(`Kaggle API test failed. Output: ${output} | Errors: ${errorOutput}`);
-        }
-        
-        resolve({
-          status: isOnline ? 'online' : 'offline',
-          message: isOnline ? 'Kaggle API is accessible' : 'Kaggle API is not accessible or credentials missing',
-          debug: {
-            exitCode: code,
-            outputLength: output.length,
-            hasError: errorOutput.length > 0
-          }
-        });
-      });
-    });
+    return {
+      status: result.online ? 'online' : 'offline',
+      message: result.online ? 'Kaggle API is accessible' : 'Kaggle API is not accessible or credentials missing',
+      debug: {
+        exitCode: result.exitCode,
+        outputLength: result.output.length,
+        hasError: result.errorOutput.length > 0
+      }
+    };
   }
 
   async loadAdminSettings() {
@@ -275,9 +276,26 @@ class AdminController {
         }
       }
 
-      // Filter and sort CSV files
-      const csvFiles = files
+      // Snapshot store: metadata straight from its index, newest first
+      const { latest, snapshots } = await rawSnapshots.list();
+      const describe = (entry, name) => ({
+        name,
+        timestamp: this.extractTimestampCsv(name),
+        isLatest: name === 'kaggle_raw_latest.csv',
+        rows: entry.rows,
+        bytes: entry.bytes,
+        storedBytes: entry.storedBytes,
+        storage: entry.storage,
+      });
+      const stored = snapshots.map(entry => describe(entry, entry.name));
+      if (latest) {
+        stored.unshift(describe(snapshots.find(entry => entry.name === latest), 'kaggle_raw_latest.csv'));
+      }
+
+      // Plain copies written before the store, until the next sync moves them in
+      const plain = files
         .filter(file => file.startsWith('kaggle_raw_') && file.endsWith('.csv'))
+        .filter(file => !stored.some(entry => entry.name === file))
         .map(file => ({
           name: file,
           timestamp: this.extractTimestampCsv(file),
@@ -288,6 +306,7 @@ class AdminController {
           if (b.isLatest) return 1;
           return b.timestamp.localeCompare(a.timestamp);
         });
+      const csvFiles = stored.concat(plain);
 
       res.json({
         files: csvFiles,
@@ -311,9 +330,7 @@ class AdminController {
         return res.status(400).json({ message: 'Invalid CSV file' });
       }
 
-      const csvPath = path.join(__dirname, '../../data/raw', filename);
-
-      const fileContent = fsSync.readFileSync(csvPath, 'utf-8');
+      const fileContent = (await rawSnapshots.read(filename)).toString('utf-8');
       const records = csvParse(fileContent, {
         columns: true,
         skip_empty_lines: true,
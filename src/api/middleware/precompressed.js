@@ -0,0 +1,41 @@
+// ═══════════════════════════════════════════════════════════════
+// Precompressed Data Middleware
+// ═══════════════════════════════════════════════════════════════
+
+const fs = require('fs').promises;
+const dataService = require('../../services/dataService');
+
+// Content-Encoding -> suffix of the sibling the sync writes, preferred first
+const ENCODINGS = [
+  ['br', '.br'],
+  ['gzip', '.gz'],
+];
+
+/**
+ * Send a data file's precompressed sibling (<file>.br / <file>.gz, written by
+ * the sync) as is when the client accepts that encoding. Without one, the
+ * request falls through to the route handler.
+ */
+const precompressed = (filename) => async (req, res, next) => {
+  res.vary('Accept-Encoding');
+  try {
+    for (const [encoding, suffix] of ENCODINGS) {
+      if (req.acceptsEncodings(encoding) !== encoding) continue;
+
+      const filePath = await dataService.dataPath(filename + suffix);
+      const stat = await fs.stat(filePath).catch(() => null);
+      if (!stat) continue;
+
+      res.set({
+        'Content-Type': 'application/json; charset=utf-8',
+        'Content-Encoding': encoding,
+      });
+      return res.sendFile(filePath, { lastModified: true }, error => error && next(error));
+    }
+    next();
+  } catch (error) {
+    next(error);
+  }
+};
+
+module.exports = precompressed;
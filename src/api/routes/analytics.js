@@ -16,4 +16,46 @@ router.get('/', async (req, res, next) => {
   }
 });
 
+// GET /api/analytics/rollup?season=&industry=&shark=&dealType=
+router.get('/rollup', async (req, res, next) => {
+  try {
+    const { season, industry, shark, dealType } = req.query;
+    const rollup = await dataService.getRollup({ season, industry, shark, dealType });
+    if (!rollup) {
+      return res.status(503).json({ message: 'Analytics cube not available, run a data sync' });
+    }
+    res.json(rollup);
+  } catch (error) {
+    next(error);
+  }
+});
+
+// GET /api/analytics/network?season=&investor=
+router.get('/network', async (req, res, next) => {
+  try {
+    const { season, investor } = req.query;
+    const network = await dataService.getNetwork({ season, investor });
+    if (!network) {
+      return res.status(503).json({ message: 'Co-investment network not available, run a data sync' });
+    }
+    res.json(network);
+  } catch (error) {
+    next(error);
+  }
+});
+
+// GET /api/analytics/timeseries?season=&investor=
+router.get('/timeseries', async (req, res, next) => {
+  try {
+    const { season, investor } = req.query;
+    const timeseries = await dataService.getTimeseries({ season, investor });
+    if (!timeseries) {
+      return res.status(503).json({ message: 'Episode time series not available, run a data sync' });
+    }
+    res.json(timeseries);
+  } catch (error) {
+    next(error);
+  }
+});
+
 module.exports = router;
@@ -13,6 +13,9 @@ router.get('/', async (req, res, next) => {
       season: req.query.season,
       industry: req.query.industry,
       status: req.query.status,
+      state: req.query.state,
+      dealType: req.query.dealType,
+      shark: req.query.shark,
       search: req.query.search,
     };
 
@@ -5,9 +5,10 @@
 const express = require('express');
 const router = express.Router();
 const dataService = require('../../services/dataService');
+const precompressed = require('../middleware/precompressed');
 
 // GET /api/seasons
-router.get('/', async (req, res, next) => {
+router.get('/', precompressed('seasons.json'), async (req, res, next) => {
   try {
     const seasons = await dataService.getSeasons();
     res.json(seasons);
@@ -5,9 +5,10 @@
 const express = require('express');
 const router = express.Router();
 const dataService = require('../../services/dataService');
+const precompressed = require('../middleware/precompressed');
 
 // GET /api/sharks
-router.get('/', async (req, res, next) => {
+router.get('/', precompressed('sharks.json'), async (req, res, next) => {
   try {
     const sharks = await dataService.getSharks();
     res.json(sharks);
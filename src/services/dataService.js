@@ -7,25 +7,99 @@ const path = require('path');
 const logger = require('../utils/logger');
 
 const DATA_DIR = path.join(__dirname, '../data');
+const COLUMNAR_PITCHES = 'pitches.columnar.json';
+const COLUMNAR_FORMAT = 'stih-columnar';
+const COLUMNAR_VERSION = 1;
+const FACETS_FILE = 'pitches.facets.json';
+const FACETS_FORMAT = 'stih-facets';
+const FACETS_VERSION = 1;
+const SEARCH_FILE = 'pitches.search.json';
+const SEARCH_FORMAT = 'stih-search';
+const SEARCH_VERSION = 1;
+const CUBE_FILE = 'analytics.cube.json';
+const CUBE_FORMAT = 'stih-cube';
+const CUBE_VERSION = 1;
+const LOOKUP_FILE = 'pitches.lookup.json';
+const LOOKUP_FORMAT = 'stih-lookup';
+const LOOKUP_VERSION = 1;
+const NETWORK_FILE = 'analytics.network.json';
+const NETWORK_FORMAT = 'stih-network';
+const NETWORK_VERSION = 1;
+const TIMESERIES_FILE = 'analytics.timeseries.json';
+const TIMESERIES_FORMAT = 'stih-timeseries';
+const TIMESERIES_VERSION = 1;
+const GENERATION_POINTER = 'current.json';
+const GENERATION_CHECK_MS = 1000;
+const SYNC_LOG_FILE = 'sync-log.json';
 
 class DataService {
   constructor() {
-    this.cache = {};
+    // The generation served: its id, directory and parsed files
+    this.view = { generation: null, dir: DATA_DIR, cache: {} };
+    this.generationCheckedAt = 0;
   }
 
-  async loadJSON(filename) {
+  /**
+   * Follow current.json, the pointer the sync flips once a new generation
+   * directory is complete. Read at most once per GENERATION_CHECK_MS; when it
+   * moves, later requests get a new view with an empty cache. Returns the view
+   * to read from. A request resolves it once and passes it to every load, so
+   * it reads one generation throughout, and a read still in flight at a flip
+   * fills the old view's cache, not the new one.
+   * Without a pointer, files are read from src/data directly.
+   */
+  async _currentView() {
+    const now = Date.now();
+    if (now - this.generationCheckedAt < GENERATION_CHECK_MS) {
+      return this.view;
+    }
+    this.generationCheckedAt = now;
+
+    let pointer = null;
     try {
+      pointer = JSON.parse(await fs.readFile(path.join(DATA_DIR, GENERATION_POINTER), 'utf-8'));
+    } catch (error) {
+      if (error.code !== 'ENOENT') {
+        // Keep serving the generation we have
+        logger.warn(`Error loading ${GENERATION_POINTER}:`, error.message);
+        return this.view;
+      }
+    }
+
+    const generation = (pointer && pointer.generation) || null;
+    if (generation !== this.view.generation) {
+      this.view = { generation, dir: generation ? path.join(DATA_DIR, pointer.path) : DATA_DIR, cache: {} };
+      logger.info(`Serving data generation ${generation || '(src/data)'}`);
+    }
+    return this.view;
+  }
+
+  /**
+   * Path of a data file in the generation currently served (or in `view`).
+   * The sync log is shared by all generations and stays in src/data.
+   */
+  async dataPath(filename, view) {
+    if (filename === SYNC_LOG_FILE) {
+      return path.join(DATA_DIR, filename);
+    }
+    return path.join((view || (await this._currentView())).dir, filename);
+  }
+
+  async loadJSON(filename, view) {
+    try {
+      view = view || (await this._currentView());
+      const filePath = await this.dataPath(filename, view);
+
       // Return cached data if available
-      if (this.cache[filename]) {
-        return this.cache[filename];
+      if (view.cache[filename]) {
+        return view.cache[filename];
       }
 
-      const filePath = path.join(DATA_DIR, filename);
       const data = await fs.readFile(filePath, 'utf-8');
       const parsed = JSON.parse(data);
 
       // Cache the data
-      this.cache[filename] = parsed;
+      view.cache[filename] = parsed;
       return parsed;
     } catch (error) {
       logger.error(`Error loading ${filename}:`, error.message);
@@ -33,11 +107,379 @@ class DataService {
     }
   }
 
+  /**
+   * Load pitches, preferring the compact columnar file written by the sync
+   * (pitches.columnar.json). Falls back to pitches.json when it is missing
+   * or in a format version this server doesn't know.
+   */
+  async loadPitches(view) {
+    view = view || (await this._currentView());
+    const columnarPath = await this.dataPath(COLUMNAR_PITCHES, view);
+    if (view.cache['pitches.json']) {
+      return view.cache['pitches.json'];
+    }
+
+    try {
+      const data = await fs.readFile(columnarPath, 'utf-8');
+      const pitches = this._decodeColumnar(JSON.parse(data));
+      if (pitches) {
+        view.cache['pitches.json'] = pitches;
+        return pitches;
+      }
+      logger.warn(`Unsupported ${COLUMNAR_PITCHES} format, falling back to pitches.json`);
+    } catch (error) {
+      if (error.code !== 'ENOENT') {
+        logger.warn(`Error loading ${COLUMNAR_PITCHES}:`, error.message);
+      }
+    }
+
+    return this.loadJSON('pitches.json', view);
+  }
+
+  /**
+   * Rebuild row objects from the columnar layout: one array per field,
+   * dictionary-encoded strings and [shark, amt, eq, debt?] breakdown rows.
+   */
+  _decodeColumnar(doc) {
+    if (!doc || doc.format !== COLUMNAR_FORMAT || doc.version !== COLUMNAR_VERSION) {
+      return null;
+    }
+
+    const { fields, encodings, dictionaries, columns } = doc;
+    const names = dictionaries.sharks;
+    const decoded = fields.map(field => {
+      const column = columns[field];
+      switch (encodings[field]) {
+        case 'dict':
+          return column.map(code => dictionaries[field][code]);
+        case 'dict-list':
+          return column.map(codes => codes.map(code => names[code]));
+        case 'breakdown':
+          return column.map(rows => Object.fromEntries(rows.map(([code, amt, eq, debt]) => [
+            names[code],
+            debt === undefined ? { amt, eq } : { amt, eq, debt },
+          ])));
+        default:
+          return column;
+      }
+    });
+
+    const pitches = new Array(doc.count);
+    for (let i = 0; i < doc.count; i++) {
+      const pitch = {};
+      fields.forEach((field, j) => {
+        pitch[field] = decoded[j][i];
+      });
+      pitches[i] = pitch;
+    }
+    return pitches;
+  }
+
+  /**
+   * Load an index file written next to the pitches by the sync. Returns null
+   * when it is missing, in an unknown format, or doesn't match the loaded
+   * pitches (`count`, when given), so callers fall back to scanning.
+   */
+  async _loadIndex(filename, format, version, count, view) {
+    view = view || (await this._currentView());
+    const filePath = await this.dataPath(filename, view);
+    if (!Object.prototype.hasOwnProperty.call(view.cache, filename)) {
+      let index = null;
+      try {
+        index = JSON.parse(await fs.readFile(filePath, 'utf-8'));
+      } catch (error) {
+        if (error.code !== 'ENOENT') {
+          logger.warn(`Error loading ${filename}:`, error.message);
+        }
+      }
+      view.cache[filename] = index;
+    }
+
+    const index = view.cache[filename];
+    if (!index || index.format !== format || index.version !== version || (count !== undefined && index.count !== count)) {
+      return null;
+    }
+    return index;
+  }
+
+  /**
+   * Facet index: facet -> value -> sorted pitch positions.
+   */
+  async loadFacetIndex(count, view) {
+    return this._loadIndex(FACETS_FILE, FACETS_FORMAT, FACETS_VERSION, count, view);
+  }
+
+  /**
+   * Search index: sorted vocabulary, per-term [position, tf, ...] postings
+   * and a trigram -> term ids map for substring lookups.
+   */
+  async loadSearchIndex(count, view) {
+    return this._loadIndex(SEARCH_FILE, SEARCH_FORMAT, SEARCH_VERSION, count, view);
+  }
+
+  /**
+   * Pitch lookup: id and "season-ep-pitch" key -> position, plus the byte span
+   * of every record in pitches.json. Checked once per generation against the
+   * size of pitches.json, so a single pitch can be read without loading them all.
+   * Returns { lookup, file } or null.
+   */
+  async loadPitchLookup(view) {
+    view = view || (await this._currentView());
+    const key = `${LOOKUP_FILE}#checked`;
+    const file = await this.dataPath('pitches.json', view);
+    if (!Object.prototype.hasOwnProperty.call(view.cache, key)) {
+      const lookup = await this._loadIndex(LOOKUP_FILE, LOOKUP_FORMAT, LOOKUP_VERSION, undefined, view);
+      const stat = lookup && (await fs.stat(file).catch(() => null));
+      view.cache[key] = stat && stat.size === lookup.bytes ? { lookup, file } : null;
+    }
+    return view.cache[key];
+  }
+
+  /**
+   * Read record `position` of pitches.json through its byte span.
+   */
+  async _readPitchAt({ lookup, file }, position) {
+    const length = lookup.lengths[position];
+    const buffer = Buffer.alloc(length);
+    const handle = await fs.open(file, 'r');
+    try {
+      await handle.read(buffer, 0, length, lookup.offsets[position]);
+    } finally {
+      await handle.close();
+    }
+    return JSON.parse(buffer.toString('utf-8'));
+  }
+
+  /**
+   * Analytics cube: "season|industry|shark|dealType" -> rollup measures.
+   */
+  async loadCube(count, view) {
+    return this._loadIndex(CUBE_FILE, CUBE_FORMAT, CUBE_VERSION, count, view);
+  }
+
+  /**
+   * Look up one slice of the analytics cube. Dimensions left out of `slice`
+   * are rolled up. Returns null when there is no usable cube.
+   */
+  async getRollup(slice = {}) {
+    const view = await this._currentView();
+    const cube = await this.loadCube((await this.loadPitches(view)).length, view);
+    if (!cube) return null;
+
+    const key = cube.dimensions
+      .map(dim => (slice[dim] === undefined || slice[dim] === '' ? cube.all : String(slice[dim])))
+      .join('|');
+    const values = cube.cells[key] || [0, 0, 0, null, null];
+    return Object.fromEntries(cube.measures.map((measure, i) => [measure, values[i]]));
+  }
+
+  /**
+   * Co-investment network: investors, [a, b, deals, amount] pairs overall and
+   * per season, and each investor's top partners.
+   */
+  async loadNetwork(count, view) {
+    return this._loadIndex(NETWORK_FILE, NETWORK_FORMAT, NETWORK_VERSION, count, view);
+  }
+
+  /**
+   * Investor pairs that backed the same pitches, most shared deals first.
+   * `season` narrows to one season; `investor` (ID or name) to that investor's
+   * pairs, and adds their top partners (over all seasons). Returns null when
+   * there is no network.
+   */
+  async getNetwork({ season, investor } = {}) {
+    const view = await this._currentView();
+    const network = await this.loadNetwork((await this.loadPitches(view)).length, view);
+    if (!network) return null;
+
+    const ids = network.investors.map(entry => entry.id);
+    let pairs = season === undefined || season === '' ? network.pairs : network.seasons[String(season)] || [];
+    let topPartners;
+    if (investor !== undefined && investor !== '') {
+      const wanted = String(investor).toLowerCase();
+      const focus = network.investors.findIndex(entry => entry.id === wanted || entry.name.toLowerCase() === wanted);
+      pairs = pairs.filter(([a, b]) => a === focus || b === focus);
+      topPartners = (focus === -1 ? [] : network.topPartners[ids[focus]] || [])
+        .map(([partner, deals, amount]) => ({ investor: ids[partner], deals, amount }));
+    }
+
+    return {
+      investors: network.investors,
+      pairs: pairs.map(row => Object.fromEntries(
+        network.fields.map((field, i) => [field, field === 'a' || field === 'b' ? ids[row[i]] : row[i]])
+      )),
+      ...(topPartners && { topPartners })
+    };
+  }
+
+  /**
+   * Episode time series: per-episode rows in broadcast order and each
+   * investor's running series.
+   */
+  async loadTimeseries(count, view) {
+    return this._loadIndex(TIMESERIES_FILE, TIMESERIES_FORMAT, TIMESERIES_VERSION, count, view);
+  }
+
+  /**
+   * Per-episode metrics (cumulative invested, deal rate, rolling deal rate)
+   * in season/episode order. `season` narrows to one season; running values
+   * still count from the first season. `investor` (ID or name) adds that
+   * investor's running deal count and average deltaVal for every episode they
+   * closed deals in. Returns null when there is no time series.
+   */
+  async getTimeseries({ season, investor } = {}) {
+    const view = await this._currentView();
+    const timeseries = await this.loadTimeseries((await this.loadPitches(view)).length, view);
+    if (!timeseries) return null;
+
+    const toObject = (fields, row) => Object.fromEntries(fields.map((field, i) => [field, row[i]]));
+    const episodes = timeseries.episodes.map(row => toObject(timeseries.fields, row));
+    const inSeason = entry => season === undefined || season === '' || String(entry.season) === String(season);
+
+    let focus;
+    if (investor !== undefined && investor !== '') {
+      const wanted = String(investor).toLowerCase();
+      const id = Object.keys(timeseries.investors)
+        .find(key => key === wanted || timeseries.investors[key].name.toLowerCase() === wanted);
+      const entry = id ? timeseries.investors[id] : { name: null, series: [] };
+      focus = {
+        id: id || null,
+        name: entry.name,
+        series: entry.series
+          .map(row => toObject(timeseries.investorFields, row))
+          .map(({ episode, ...values }) => ({ season: episodes[episode].season, episode: episodes[episode].episode, ...values }))
+          .filter(inSeason),
+      };
+    }
+
+    return {
+      window: timeseries.window,
+      episodes: episodes.filter(inSeason),
+      ...(focus && { investor: focus })
+    };
+  }
+
+  /**
+   * Split text into lowercase word tokens, same rule as the sync's tokenizer.
+   */
+  _tokenize(text) {
+    return String(text).toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+  }
+
+  /**
+   * Ids of vocabulary terms containing token. Tokens of at least `gram`
+   * characters narrow the candidates through the trigram map first.
+   */
+  _matchingTermIds(index, token) {
+    const { terms, grams, gram } = index;
+    if (token.length < gram) {
+      const ids = [];
+      for (let id = 0; id < terms.length; id++) {
+        if (terms[id].includes(token)) ids.push(id);
+      }
+      return ids;
+    }
+
+    const lists = [];
+    for (let i = 0; i + gram <= token.length; i++) {
+      const ids = grams[token.slice(i, i + gram)];
+      if (!ids) return [];
+      lists.push(ids);
+    }
+    return this._intersectSorted(lists).filter(id => terms[id].includes(token));
+  }
+
+  /**
+   * Rank pitch positions for a free-text query. Every query token must occur
+   * (as a substring of some indexed word); pitches are ordered by summed term
+   * frequency, then by position. Returns null for a query without tokens.
+   */
+  _rankSearch(index, query) {
+    const tokens = [...new Set(this._tokenize(query))];
+    if (!tokens.length) return null;
+
+    let scores = null;
+    for (const token of tokens) {
+      const tokenScores = new Map();
+      for (const id of this._matchingTermIds(index, token)) {
+        const postings = index.postings[id];
+        for (let i = 0; i < postings.length; i += 2) {
+          tokenScores.set(postings[i], (tokenScores.get(postings[i]) || 0) + postings[i + 1]);
+        }
+      }
+
+      if (scores) {
+        for (const [pos, score] of scores) {
+          if (tokenScores.has(pos)) scores.set(pos, score + tokenScores.get(pos));
+          else scores.delete(pos);
+        }
+      } else {
+        scores = tokenScores;
+      }
+      if (!scores.size) return [];
+    }
+
+    return [...scores].sort((a, b) => b[1] - a[1] || a[0] - b[0]).map(([pos]) => pos);
+  }
+
+  /**
+   * Intersect ascending position lists, smallest first.
+   */
+  _intersectSorted(lists) {
+    const [first, ...rest] = [...lists].sort((a, b) => a.length - b.length);
+    return rest.reduce((acc, list) => {
+      const out = [];
+      let j = 0;
+      for (const pos of acc) {
+        while (j < list.length && list[j] < pos) j++;
+        if (j === list.length) break;
+        if (list[j] === pos) out.push(pos);
+      }
+      return out;
+    }, first || []);
+  }
+
+  /**
+   * Translate request filters into [facet, value] terms of the facet index.
+   */
+  _facetTerms(filters) {
+    const terms = [];
+    if (filters.season) terms.push(['season', String(parseInt(filters.season))]);
+    if (filters.industry) terms.push(['industry', filters.industry]);
+    if (filters.state) terms.push(['state', filters.state]);
+    if (filters.dealType) terms.push(['dealType', filters.dealType]);
+    if (filters.shark) terms.push(['shark', filters.shark]);
+
+    // Support both 'funded'/'unfunded' and legacy 'DEAL'/'NO_DEAL'
+    if (filters.status === 'funded' || filters.status === 'DEAL') {
+      terms.push(['funded', 'true']);
+    } else if (filters.status === 'unfunded' || filters.status === 'NO_DEAL') {
+      terms.push(['funded', 'false']);
+    }
+    return terms;
+  }
+
+  _matchesTerm(pitch, [facet, value]) {
+    switch (facet) {
+      case 'season':
+        return String(pitch.season) === value;
+      case 'funded':
+        return pitch.funded === (value === 'true');
+      case 'shark':
+        return (pitch.sharks || []).includes(value);
+      default:
+        return pitch[facet] === value;
+    }
+  }
+
   clearCache(filename) {
     if (filename) {
-      delete this.cache[filename];
+      delete this.view.cache[filename];
     } else {
-      this.cache = {};
+      // A fresh view, so requests still reading the old one cannot fill it
+      this.view = { ...this.view, cache: {} };
+      // Re-read current.json on the next load
+      this.generationCheckedAt = 0;
     }
   }
 
@@ -64,26 +506,28 @@ class DataService {
   }
 
   async getPitches(filters = {}) {
-    let pitches = this._normalizeSharks(await this.loadJSON('pitches.json'));
+    const view = await this._currentView();
+    const all = await this.loadPitches(view);
+    const terms = this._facetTerms(filters);
+    const index = terms.length ? await this.loadFacetIndex(all.length, view) : null;
+    const searchIndex = filters.search ? await this.loadSearchIndex(all.length, view) : null;
+    const ranked = searchIndex ? this._rankSearch(searchIndex, filters.search) : null;
 
-    if (filters.season) {
-      pitches = pitches.filter(p => p.season === parseInt(filters.season));
+    let positions = null;
+    if (index) {
+      positions = this._intersectSorted(terms.map(([facet, value]) => (index.facets[facet] || {})[value] || []));
     }
-
-    if (filters.industry) {
-      pitches = pitches.filter(p => p.industry === filters.industry);
+    if (ranked) {
+      const allowed = positions && new Set(positions);
+      positions = allowed ? ranked.filter(i => allowed.has(i)) : ranked;
     }
 
-    // Support both 'funded'/'unfunded' and legacy 'DEAL'/'NO_DEAL'
-    if (filters.status) {
-      if (filters.status === 'funded' || filters.status === 'DEAL') {
-        pitches = pitches.filter(p => p.funded === true);
-      } else if (filters.status === 'unfunded' || filters.status === 'NO_DEAL') {
-        pitches = pitches.filter(p => p.funded === false);
-      }
+    let pitches = this._normalizeSharks(positions ? positions.map(i => all[i]) : all);
+    if (!index) {
+      pitches = pitches.filter(p => terms.every(term => this._matchesTerm(p, term)));
     }
 
-    if (filters.search) {
+    if (filters.search && !ranked) {
       const query = filters.search.toLowerCase();
       pitches = pitches.filter(p =>
         (p.name || '').toLowerCase().includes(query) ||
@@ -96,7 +540,24 @@ class DataService {
   }
 
   async getPitch(id) {
-    const pitches = this._normalizeSharks(await this.loadJSON('pitches.json'));
+    const view = await this._currentView();
+    const found = await this.loadPitchLookup(view);
+    if (found) {
+      const { ids, keys, count } = found.lookup;
+      const has = (map, key) => Object.prototype.hasOwnProperty.call(map, key);
+      const position = has(ids, id) ? ids[id] : has(keys, id) ? keys[id] : undefined;
+      if (position !== undefined) {
+        const loaded = view.cache['pitches.json'];
+        try {
+          const pitch = loaded && loaded.length === count ? loaded[position] : await this._readPitchAt(found, position);
+          return this._normalizeSharks([pitch])[0];
+        } catch (error) {
+          logger.warn(`Error reading pitch ${id} through ${LOOKUP_FILE}:`, error.message);
+        }
+      }
+    }
+
+    const pitches = this._normalizeSharks(await this.loadPitches(view));
     // id is a string slug like 'bluepinefoods', fallback to numeric index
     return pitches.find(p => p.id === id) || pitches.find(p => String(p.pitch) === String(id));
   }
@@ -115,9 +576,10 @@ class DataService {
   }
 
   async getAnalytics() {
-    const pitches = this._normalizeSharks(await this.loadJSON('pitches.json'));
-    const industries = await this.loadJSON('industries.json');
-    const seasons = await this.loadJSON('seasons.json');
+    const view = await this._currentView();
+    const pitches = this._normalizeSharks(await this.loadPitches(view));
+    const industries = await this.loadJSON('industries.json', view);
+    const seasons = await this.loadJSON('seasons.json', view);
 
     const totalPitches = pitches.length;
     const fundedPitches = pitches.filter(p => p.funded === true);
@@ -129,9 +591,17 @@ class DataService {
     const avgDealLakhs = totalDeals > 0 ? totalInvestedLakhs / totalDeals : 0;
 
     // Deal type breakdown
-    const equity  = pitches.filter(p => p.funded && p.dealType === 'equity').length;
-    const mixed   = pitches.filter(p => p.funded && p.dealType === 'mixed').length;
-    const royalty = pitches.filter(p => p.funded && p.dealType === 'royalty').length;
+    const cube = await this.loadCube(pitches.length, view);
+    const index = cube ? null : await this.loadFacetIndex(pitches.length, view);
+    const fundedOfType = type => {
+      if (cube) return (cube.cells[`*|*|*|${type}`] || [0, 0])[1];
+      return index
+        ? this._intersectSorted([index.facets.funded.true || [], index.facets.dealType[type] || []]).length
+        : pitches.filter(p => p.funded && p.dealType === type).length;
+    };
+    const equity  = fundedOfType('equity');
+    const mixed   = fundedOfType('mixed');
+    const royalty = fundedOfType('royalty');
 
     return {
       stats: {
@@ -176,7 +646,7 @@ class DataService {
             });
             return acc;
           }, {});
-          const coreOrder = ['Aman','Namita','Anupam','Peyush','Vineeta','Ritesh','Amit','Kunal Bahl','Ashneer','Ashneer Grover'];
+          const coreOrder = ['Aman','Namita','Anupam','Peyush','Vineeta','Ritesh','Amit','Kunal Bahl','Ashneer Grover'];
           const sorted = Object.entries(sharkData)
             .filter(([name]) => coreOrder.includes(name))
             .sort((a, b) => b[1] - a[1]);
@@ -191,9 +661,14 @@ class DataService {
     };
   }
 
+  /**
+   * The last sync's log entry. fetch_kaggle_data.py writes it as a one-entry
+   * array, the admin API as the entry itself; either way the entry is returned.
+   */
   async getSyncLog() {
     try {
-      return await this.loadJSON('sync-log.json');
+      const log = await this.loadJSON(SYNC_LOG_FILE);
+      return Array.isArray(log) ? log[log.length - 1] || null : log;
     } catch (error) {
       return null;
     }
@@ -201,9 +676,9 @@ class DataService {
 
   async saveSyncLog(data) {
     try {
-      const filePath = path.join(DATA_DIR, 'sync-log.json');
+      const filePath = path.join(DATA_DIR, SYNC_LOG_FILE);
       await fs.writeFile(filePath, JSON.stringify(data, null, 2), 'utf-8');
-      this.clearCache('sync-log.json');
+      this.clearCache(SYNC_LOG_FILE);
       return true;
     } catch (error) {
       logger.error('Error saving sync log:', error.message);
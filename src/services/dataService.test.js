@@ -0,0 +1,206 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const dataService = require('./dataService');
+
+// Three pitches and the files fetch_kaggle_data.py derives from them
+const PITCHES = [
+  {
+    id: 'greenleaf', name: 'Green Leaf', summary: 'Tea', season: 1, ep: 1, pitch: 1,
+    industry: 'Food and Beverage', state: 'Delhi', funded: true, sharks: ['Aman', 'Namita'],
+    sharkBreakdown: { Aman: { amt: 25, eq: 2.5 }, Namita: { amt: 25, eq: 2.5, debt: 10 } },
+  },
+  {
+    id: 'smartkart', name: 'Smart Kart', summary: '', season: 1, ep: 1, pitch: 2,
+    industry: 'Technology/Software', state: 'Karnataka', funded: false, sharks: [], sharkBreakdown: {},
+  },
+  {
+    id: 'greenleaf-s2e4', name: 'Green Leaf', summary: 'Green snacks', season: 2, ep: 4, pitch: 1,
+    industry: 'Food and Beverage', state: 'Delhi', funded: true, sharks: ['Aman'],
+    sharkBreakdown: { Aman: { amt: 50, eq: 5 } },
+  },
+];
+
+// Minified pitches.json: '[' + records joined by ',' + ']'
+const PITCHES_TEXT = JSON.stringify(PITCHES);
+
+const FIELDS = Object.keys(PITCHES[0]);
+
+const COLUMNAR = {
+  format: 'stih-columnar', version: 1, count: 3, fields: FIELDS,
+  encodings: {
+    ...Object.fromEntries(FIELDS.map(field => [field, 'plain'])),
+    industry: 'dict', state: 'dict', sharks: 'dict-list', sharkBreakdown: 'breakdown',
+  },
+  dictionaries: {
+    industry: ['Food and Beverage', 'Technology/Software'],
+    state: ['Delhi', 'Karnataka'],
+    sharks: ['Aman', 'Namita'],
+  },
+  columns: {
+    ...Object.fromEntries(FIELDS.map(field => [field, PITCHES.map(p => p[field])])),
+    industry: [0, 1, 0],
+    state: [0, 1, 0],
+    sharks: [[0, 1], [], [0]],
+    sharkBreakdown: [[[0, 25, 2.5], [1, 25, 2.5, 10]], [], [[0, 50, 5]]],
+  },
+};
+
+const FACETS = {
+  format: 'stih-facets', version: 1, count: 3,
+  facets: {
+    season: { 1: [0, 1], 2: [2] },
+    industry: { 'Food and Beverage': [0, 2], 'Technology/Software': [1] },
+    state: { Delhi: [0, 2], Karnataka: [1] },
+    funded: { false: [1], true: [0, 2] },
+    shark: { Aman: [0, 2], Namita: [0] },
+  },
+};
+
+// Over name and summary: terms sorted, postings [position, tf, ...], trigram -> term ids
+const SEARCH = {
+  format: 'stih-search', version: 1, count: 3, fields: ['name', 'summary'], gram: 3,
+  terms: ['green', 'kart', 'leaf', 'smart', 'snacks', 'tea'],
+  postings: [[0, 1, 2, 2], [1, 1], [0, 1, 2, 1], [1, 1], [2, 1], [0, 1]],
+  grams: {
+    gre: [0], ree: [0], een: [0], kar: [1], art: [1, 3], lea: [2], eaf: [2], sma: [3], mar: [3],
+    sna: [4], nac: [4], ack: [4], cks: [4], tea: [5],
+  },
+};
+
+// Record i of PITCHES_TEXT is bytes offsets[i] .. offsets[i] + lengths[i]
+const LENGTHS = PITCHES.map(p => Buffer.byteLength(JSON.stringify(p)));
+const LOOKUP = {
+  format: 'stih-lookup', version: 1, count: 3, bytes: Buffer.byteLength(PITCHES_TEXT),
+  ids: { greenleaf: 0, smartkart: 1, 'greenleaf-s2e4': 2 },
+  keys: { '1-1-1': 0, '1-1-2': 1, '2-4-1': 2 },
+  offsets: LENGTHS.map((_, i) => 1 + LENGTHS.slice(0, i).reduce((sum, n) => sum + n + 1, 0)),
+  lengths: LENGTHS,
+};
+
+function writeGeneration(dir, files) {
+  fs.mkdirSync(dir, { recursive: true });
+  for (const [name, data] of Object.entries(files)) {
+    fs.writeFileSync(path.join(dir, name), typeof data === 'string' ? data : JSON.stringify(data));
+  }
+  return dir;
+}
+
+describe('DataService decoders', () => {
+  let root;
+  let view;
+
+  // Serve `dir` as the current generation
+  const serve = (dir) => {
+    view = { generation: path.basename(dir), dir, cache: {} };
+    jest.spyOn(dataService, '_currentView').mockImplementation(async () => view);
+  };
+
+  beforeAll(() => {
+    root = fs.mkdtempSync(path.join(os.tmpdir(), 'stih-data-'));
+    writeGeneration(path.join(root, 'full'), {
+      'pitches.json': PITCHES_TEXT,
+      'pitches.columnar.json': COLUMNAR,
+      'pitches.facets.json': FACETS,
+      'pitches.search.json': SEARCH,
+      'pitches.lookup.json': LOOKUP,
+    });
+    writeGeneration(path.join(root, 'plain'), { 'pitches.json': PITCHES_TEXT });
+  });
+
+  afterAll(() => {
+    fs.rmSync(root, { recursive: true, force: true });
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  describe('columnar pitches', () => {
+    test('should decode back to the pitches.json records', () => {
+      expect(dataService._decodeColumnar(COLUMNAR)).toEqual(PITCHES);
+    });
+
+    test('should reject an unknown format version', () => {
+      expect(dataService._decodeColumnar({ ...COLUMNAR, version: 2 })).toBeNull();
+    });
+
+    test('should load the columnar file in place of pitches.json', async () => {
+      serve(path.join(root, 'full'));
+      expect(await dataService.loadPitches()).toEqual(PITCHES);
+      expect(view.cache['pitches.json']).toEqual(PITCHES);
+    });
+  });
+
+  describe('facet index', () => {
+    test('should intersect posting lists for the filters', async () => {
+      serve(path.join(root, 'full'));
+      const ids = async (filters) => (await dataService.getPitches(filters)).map(p => p.id);
+      expect(await ids({ season: '1' })).toEqual(['greenleaf', 'smartkart']);
+      expect(await ids({ shark: 'Aman', status: 'funded' })).toEqual(['greenleaf', 'greenleaf-s2e4']);
+      expect(await ids({ industry: 'Food and Beverage', season: '2' })).toEqual(['greenleaf-s2e4']);
+      expect(await ids({ shark: 'Namita', season: '2' })).toEqual([]);
+    });
+
+    test('should match a scan of the pitches', async () => {
+      const filters = [{ season: '1' }, { state: 'Delhi', status: 'unfunded' }, { shark: 'Aman', dealType: undefined }];
+      for (const filter of filters) {
+        serve(path.join(root, 'full'));
+        const indexed = await dataService.getPitches(filter);
+        jest.restoreAllMocks();
+        serve(path.join(root, 'plain'));
+        expect(indexed).toEqual(await dataService.getPitches(filter));
+        jest.restoreAllMocks();
+      }
+    });
+
+    test('should be ignored when built for other pitches', async () => {
+      serve(path.join(root, 'full'));
+      expect(await dataService.loadFacetIndex(4)).toBeNull();
+      expect(await dataService.loadFacetIndex(3)).toEqual(FACETS);
+    });
+  });
+
+  describe('search index', () => {
+    test('should rank by summed term frequency, then position', () => {
+      expect(dataService._rankSearch(SEARCH, 'green')).toEqual([2, 0]);
+      expect(dataService._rankSearch(SEARCH, 'Green LEAF')).toEqual([2, 0]);
+      expect(dataService._rankSearch(SEARCH, 'leaf kart')).toEqual([]);
+      expect(dataService._rankSearch(SEARCH, '!!')).toBeNull();
+    });
+
+    test('should match tokens inside terms', () => {
+      expect(dataService._matchingTermIds(SEARCH, 'eaf')).toEqual([2]);
+      expect(dataService._matchingTermIds(SEARCH, 'art')).toEqual([1, 3]);
+      expect(dataService._matchingTermIds(SEARCH, 'ar')).toEqual([1, 3]);
+      expect(dataService._matchingTermIds(SEARCH, 'xyz')).toEqual([]);
+      expect(dataService._rankSearch(SEARCH, 'sna')).toEqual([2]);
+    });
+
+    test('should serve free-text search from the index', async () => {
+      serve(path.join(root, 'full'));
+      expect((await dataService.getPitches({ search: 'snacks' })).map(p => p.id)).toEqual(['greenleaf-s2e4']);
+      expect((await dataService.getPitches({ search: 'green', season: '1' })).map(p => p.id)).toEqual(['greenleaf']);
+    });
+  });
+
+  describe('pitch lookup', () => {
+    test('should read one record by id or key without loading every pitch', async () => {
+      serve(path.join(root, 'full'));
+      expect(await dataService.getPitch('smartkart')).toEqual(PITCHES[1]);
+      expect(await dataService.getPitch('greenleaf-s2e4')).toEqual(PITCHES[2]);
+      expect(await dataService.getPitch('2-4-1')).toEqual(PITCHES[2]);
+      expect(view.cache['pitches.json']).toBeUndefined();
+    });
+
+    test('should fall back to the pitches when pitches.json changed size', async () => {
+      const dir = writeGeneration(path.join(root, 'stale'), {
+        'pitches.json': `${PITCHES_TEXT}\n`,
+        'pitches.lookup.json': LOOKUP,
+      });
+      serve(dir);
+      expect(await dataService.loadPitchLookup()).toBeNull();
+      expect(await dataService.getPitch('greenleaf-s2e4')).toEqual(PITCHES[2]);
+    });
+  });
+});
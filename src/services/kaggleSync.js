@@ -4,12 +4,26 @@
 
 const { spawn } = require('child_process');
 const path = require('path');
+const readline = require('readline');
 const fs = require('fs').promises;
 const logger = require('../utils/logger');
 
+const SCRIPT_PATH = path.join(__dirname, '../../scripts/fetch_kaggle_data.py');
+const PROJECT_ROOT = path.join(__dirname, '../../');
+
+// Prefix of the stdout line carrying the sync's per-stage metrics as JSON
+const METRICS_MARKER = 'SYNC_METRICS ';
+
+// Jobs go to one long-lived `fetch_kaggle_data.py worker` process; SYNC_WORKER=0
+// starts a fresh Python process per job instead
+const USE_WORKER = !['0', 'false', 'no'].includes(String(process.env.SYNC_WORKER || '').toLowerCase());
+
 class KaggleSyncService {
   constructor() {
     this.isRunning = false;
+    this.worker = null;
+    this.jobs = new Map();  // job id -> { resolve, reject, onProgress, log, output, errorOutput }
+    this.nextJobId = 1;
   }
 
   getTimestamp() {
@@ -41,59 +55,214 @@ class KaggleSyncService {
     }
   }
 
-  async syncData() {
+  /**
+   * Run a sync. options: { full, workers, onProgress(line) }.
+   * Resolves { success, message, output, metrics }; rejects with error.metrics set.
+   */
+  async syncData(options = {}) {
+    return this._runSync('sync', options, 'Data synchronized successfully from Kaggle');
+  }
+
+  /**
+   * Re-derive every output from the newest raw snapshot, without downloading.
+   */
+  async rebuildData(options = {}) {
+    return this._runSync('rebuild', options, 'Data rebuilt from the latest raw snapshot');
+  }
+
+  async _runSync(command, options, message) {
     if (this.isRunning) {
       throw new Error('Sync already in progress');
     }
 
     this.isRunning = true;
+    try {
+      const result = await this.runJob(command, options);
+      const metrics = this.parseMetrics(result.output);
+      if (result.ok) {
+        logger.info('Python script completed successfully');
+        return { success: true, message, output: result.output, metrics };
+      }
+      logger.error(`Python script failed with code ${result.exitCode}`);
+      const error = new Error(`Python script failed: ${result.errorOutput || 'Unknown error'}`);
+      error.metrics = metrics;
+      throw error;
+    } finally {
+      this.isRunning = false;
+    }
+  }
 
+  /**
+   * Check that the Kaggle API is reachable ('test' imports neither pandas nor
+   * the transforms). Runs in a one-off process while the worker is busy.
+   * Resolves { online, exitCode, output, errorOutput }.
+   */
+  async testConnection() {
+    const result = await this.runJob('test', {}, { busyFallback: true });
+    const online = result.ok && result.output.includes('[OK]') && result.output.includes('ONLINE');
+    return { online, exitCode: result.exitCode, output: result.output, errorOutput: result.errorOutput };
+  }
+
+  /**
+   * Run a 'test', 'sync' or 'rebuild' job. Resolves { ok, exitCode, output, errorOutput };
+   * rejects only when Python cannot be started or the worker dies mid-job.
+   */
+  async runJob(command, options = {}, { busyFallback = false } = {}) {
+    const { onProgress, ...jobOptions } = options;
+    const log = command === 'test' ? logger.debug : logger.info;
+    if (!USE_WORKER || (busyFallback && this.jobs.size > 0)) {
+      return this._runOnce(command, jobOptions, onProgress, log);
+    }
+    if (!this.worker) {
+      this._startWorker();
+    }
+    const id = this.nextJobId++;
     return new Promise((resolve, reject) => {
-      const scriptPath = path.join(__dirname, '../../scripts/fetch_kaggle_data.py');
-      const python = spawn('python', [scriptPath], {
-        cwd: path.join(__dirname, '../../'),
+      this.jobs.set(id, { resolve, reject, onProgress, log, output: '', errorOutput: '' });
+      this.worker.stdin.write(JSON.stringify({ id, command, options: jobOptions }) + '\n');
+    });
+  }
+
+  _startWorker() {
+    const worker = spawn('python', [SCRIPT_PATH, 'worker'], {
+      cwd: PROJECT_ROOT,
+      env: process.env,  // Pass environment variables to Python
+    });
+    this.worker = worker;
+
+    readline.createInterface({ input: worker.stdout }).on('line', (line) => this._onWorkerEvent(line));
+
+    // Jobs run one at a time, so stderr belongs to the oldest pending job
+    worker.stderr.on('data', (data) => {
+      const message = data.toString();
+      logger.error('Python stderr:', message);
+      const [job] = this.jobs.values();
+      if (job) {
+        job.errorOutput += message;
+      }
+    });
+
+    worker.on('exit', (code, signal) => {
+      logger.warn(`Sync worker exited (${signal || code})`);
+      this._dropWorker(worker, new Error(`Sync worker exited (${signal || code})`));
+    });
+
+    worker.on('error', (err) => {
+      logger.error('Failed to spawn Python process:', err.message);
+      this._dropWorker(worker, new Error(`Failed to execute sync: ${err.message}`));
+    });
+  }
+
+  _dropWorker(worker, error) {
+    if (this.worker !== worker) {
+      return;
+    }
+    this.worker = null;
+    for (const job of this.jobs.values()) {
+      job.reject(error);
+    }
+    this.jobs.clear();
+  }
+
+  _onWorkerEvent(line) {
+    let event;
+    try {
+      event = JSON.parse(line);
+    } catch (error) {
+      logger.info('Python stdout:', line);
+      return;
+    }
+    if (event.event === 'ready') {
+      logger.info(`Sync worker ready (pid ${event.pid})`);
+      return;
+    }
+    const job = this.jobs.get(event.id);
+    if (!job) {
+      return;
+    }
+    if (event.event === 'progress') {
+      job.output += event.line + '\n';
+      job.log('Python stdout:', event.line);
+      if (job.onProgress) {
+        job.onProgress(event.line);
+      }
+    } else if (event.event === 'done') {
+      this.jobs.delete(event.id);
+      job.resolve({
+        ok: event.ok,
+        exitCode: event.ok ? 0 : 1,
+        output: job.output,
+        errorOutput: job.errorOutput || event.error || '',
+      });
+    }
+  }
+
+  /**
+   * Stop the worker once its queued jobs are done (it exits when stdin closes).
+   */
+  stopWorker() {
+    if (this.worker) {
+      this.worker.stdin.end();
+    }
+  }
+
+  _runOnce(command, options, onProgress, log) {
+    const args = [SCRIPT_PATH, command];
+    if (options.full) args.push('--full');
+    if (options.workers !== undefined) args.push('--workers', String(options.workers));
+
+    return new Promise((resolve, reject) => {
+      const python = spawn('python', args, {
+        cwd: PROJECT_ROOT,
         env: process.env,  // Pass environment variables to Python
       });
 
-      let stdout = '';
-      let stderr = '';
+      let output = '';
+      let errorOutput = '';
 
-      python.stdout.on('data', (data) => {
-        const message = data.toString();
-        stdout += message;
-        logger.info('Python stdout:', message);
+      readline.createInterface({ input: python.stdout }).on('line', (line) => {
+        output += line + '\n';
+        log('Python stdout:', line);
+        if (onProgress) {
+          onProgress(line);
+        }
       });
 
       python.stderr.on('data', (data) => {
         const message = data.toString();
-        stderr += message;
+        errorOutput += message;
         logger.error('Python stderr:', message);
       });
 
       python.on('close', (code) => {
-        this.isRunning = false;
-
-        if (code === 0) {
-          logger.info('Python script completed successfully');
-          resolve({
-            success: true,
-            message: 'Data synchronized successfully from Kaggle',
-            output: stdout,
-          });
-        } else {
-          logger.error(`Python script failed with code ${code}`);
-          reject(new Error(`Python script failed: ${stderr || 'Unknown error'}`));
-        }
+        resolve({ ok: code === 0, exitCode: code, output, errorOutput });
       });
 
       python.on('error', (err) => {
-        this.isRunning = false;
         logger.error('Failed to spawn Python process:', err.message);
         reject(new Error(`Failed to execute sync: ${err.message}`));
       });
     });
   }
 
+  /**
+   * Per-stage metrics printed by fetch_kaggle_data.py:
+   * { totalMs, stages: [{ stage, wallMs, cpuMs, rows, rowsPerSec, peakRssMb, outputBytes }] }.
+   * Returns null when the script exited before printing them.
+   */
+  parseMetrics(stdout) {
+    const line = stdout.split(/\r?\n/).reverse().find(l => l.startsWith(METRICS_MARKER));
+    if (!line) {
+      return null;
+    }
+    try {
+      return JSON.parse(line.slice(METRICS_MARKER.length));
+    } catch (error) {
+      logger.warn('Unreadable sync metrics:', error.message);
+      return null;
+    }
+  }
+
   isSyncing() {
     return this.isRunning;
   }
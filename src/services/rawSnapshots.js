@@ -0,0 +1,128 @@
+// ═══════════════════════════════════════════════════════════════
+// Raw Snapshot Store - Read the compressed raw CSV snapshots
+// written by scripts/raw_snapshots.py
+// ═══════════════════════════════════════════════════════════════
+
+const fs = require('fs').promises;
+const path = require('path');
+const crypto = require('crypto');
+const zlib = require('zlib');
+const { promisify } = require('util');
+const logger = require('../utils/logger');
+
+const gunzip = promisify(zlib.gunzip);
+
+const RAW_DIR = path.join(__dirname, '../data/raw');
+const SNAPSHOT_DIR = path.join(RAW_DIR, 'snapshots');
+const INDEX_FILE = 'index.json';
+const INDEX_FORMAT = 'stih-raw-snapshots';
+const INDEX_VERSION = 1;
+const LATEST_NAME = 'kaggle_raw_latest.csv';
+// Delta entry 'literals' -> Buffer encoding of its literal lines
+const LITERAL_ENCODINGS = { 'latin-1': 'latin1' };
+
+class RawSnapshotStore {
+  /**
+   * The store's index: name -> {sha256, savedAt, bytes, rows, storage, ...}.
+   * Returns null when there is no store yet or it is in an unknown format.
+   */
+  async loadIndex() {
+    try {
+      const index = JSON.parse(await fs.readFile(path.join(SNAPSHOT_DIR, INDEX_FILE), 'utf-8'));
+      if (index.format === INDEX_FORMAT && index.version === INDEX_VERSION) {
+        return index;
+      }
+      logger.warn(`Unsupported raw snapshot index format in ${INDEX_FILE}`);
+    } catch (error) {
+      if (error.code !== 'ENOENT') {
+        logger.warn(`Error loading raw snapshot ${INDEX_FILE}:`, error.message);
+      }
+    }
+    return null;
+  }
+
+  /**
+   * Snapshot metadata, newest first, straight from the index.
+   */
+  async list() {
+    const index = await this.loadIndex();
+    if (!index) {
+      return { latest: null, snapshots: [] };
+    }
+    return { latest: index.latest, snapshots: Object.values(index.snapshots).reverse() };
+  }
+
+  /**
+   * Exact CSV bytes of a snapshot ('kaggle_raw_latest.csv' is the newest).
+   * Plain kaggle_raw_*.csv copies from before the store are read as they are.
+   * Unknown names throw an error with code ENOENT.
+   */
+  async read(name) {
+    const index = await this.loadIndex();
+    if (index) {
+      const key = name === LATEST_NAME ? index.latest : name;
+      if (index.snapshots[key]) {
+        return this._readEntry(index, key);
+      }
+    }
+    return fs.readFile(path.join(RAW_DIR, name));
+  }
+
+  async _readEntry(index, name) {
+    const entry = index.snapshots[name];
+    let data = await gunzip(await fs.readFile(path.join(SNAPSHOT_DIR, entry.object)));
+    if (entry.storage === 'delta') {
+      const base = this._splitLines(await this._readEntry(index, entry.base));
+      const encoding = LITERAL_ENCODINGS[entry.literals];
+      if (!encoding) {
+        throw new Error(`Raw snapshot ${name} has unsupported literals: ${entry.literals}`);
+      }
+      data = this._applyDelta(base, JSON.parse(data.toString('utf-8')), encoding);
+    }
+    if (crypto.createHash('sha256').update(data).digest('hex') !== entry.sha256) {
+      throw new Error(`Raw snapshot ${name} does not match its checksum`);
+    }
+    return data;
+  }
+
+  /**
+   * Split into lines that keep their \n, \r\n or \r ending, like Python's
+   * bytes.splitlines(keepends=True), so the delta line numbers agree.
+   */
+  _splitLines(buffer) {
+    const lines = [];
+    let start = 0;
+    for (let i = 0; i < buffer.length; i++) {
+      const byte = buffer[i];
+      if (byte === 0x0a || byte === 0x0d) {
+        if (byte === 0x0d && buffer[i + 1] === 0x0a) i++;
+        lines.push(buffer.subarray(start, i + 1));
+        start = i + 1;
+      }
+    }
+    if (start < buffer.length) {
+      lines.push(buffer.subarray(start));
+    }
+    return lines;
+  }
+
+  /**
+   * Rebuild a snapshot from its base lines: [start, count] copies base
+   * lines, a string is a literal line in the given encoding.
+   */
+  _applyDelta(base, ops, encoding) {
+    const parts = [];
+    for (const op of ops) {
+      if (Array.isArray(op)) {
+        for (let i = op[0]; i < op[0] + op[1]; i++) {
+          parts.push(base[i]);
+        }
+      } else {
+        parts.push(Buffer.from(op, encoding));
+      }
+    }
+    return Buffer.concat(parts);
+  }
+}
+
+module.exports = new RawSnapshotStore();